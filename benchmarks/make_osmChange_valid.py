@@ -0,0 +1,34 @@
+"""Measures time of `OsmChange._make_osmChange_valid()` for growing number of created nodes. In linear implementation 4 times more nodes takes about 4 times longer.
+
+Run from repository root: python benchmarks/make_osmChange_valid.py
+"""
+import gc
+import time
+
+from osm_easy_api.data_classes import Node, Way, Relation, OsmChange, Action
+from osm_easy_api.data_classes.relation import Member
+
+def make_valid_time(nodes_count: int, runs: int = 3) -> float:
+    """Best time of a few runs, so single slow run does not change the result."""
+    times = []
+    for _ in range(runs):
+        osmChange = OsmChange("0.1", "benchmark", "123")
+        nodes = [Node(latitude="1", longitude="2") for _ in range(nodes_count)]
+        for i in range(0, len(nodes), 10): osmChange.add(Way(nodes=nodes[i:i + 10]), Action.CREATE)
+        for i in range(0, len(nodes), 100): osmChange.add(Relation(members=[Member(nodes[i], "")]), Action.MODIFY)
+        # Garbage collector pauses depend on number of all objects, not only on the algorithm.
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            OsmChange._make_osmChange_valid(osmChange)
+            times.append(time.perf_counter() - start)
+        finally: gc.enable()
+    return min(times)
+
+if __name__ == "__main__":
+    previous = None
+    for nodes_count in (10_000, 40_000, 160_000, 1_000_000):
+        seconds = make_valid_time(nodes_count)
+        ratio = f" ({seconds / previous:.1f}x)" if previous else ""
+        print(f"{nodes_count:>9} nodes: {seconds:.3f} s{ratio}")
+        previous = seconds
@@ -10,6 +10,7 @@ if TYPE_CHECKING:
 from ._URLs import URLs
 from .endpoints import Misc_Container, Changeset_Container, Elements_Container, Gpx_Container, User_Container, Notes_Container
 from .exceptions import STATUS_CODE_EXCEPTIONS
+from ..diff.parser_backends import ParserBackend, _import_lxml_etree
 
 class Api():
     """Class used to communicate with API."""
@@ -22,8 +23,16 @@ class Api():
         def __str__(self):
             return self.name
 
-    def __init__(self, url: str = "https://master.apis.dev.openstreetmap.org", access_token: str | None = None, user_agent: str | None = None):
+    def __init__(self, url: str = "https://master.apis.dev.openstreetmap.org", access_token: str | None = None, user_agent: str | None = None, parser_backend: ParserBackend = ParserBackend.ETREE):
+        """
+        Args:
+            url (str, optional): API url. Defaults to "https://master.apis.dev.openstreetmap.org".
+            access_token (str | None, optional): OAuth 2.0 access token. Defaults to None.
+            user_agent (str | None, optional): User agent used during requests. Defaults to None.
+            parser_backend (ParserBackend, optional): XML parser used to parse responses. `ParserBackend.EXPAT` is used only for `changeset.download()` and `misc.get_map_in_bbox()`, other endpoints use `ParserBackend.ETREE` then. Defaults to ParserBackend.ETREE.
+        """
         self._url = URLs(url)
+        self._parser_backend = parser_backend
         self.misc = Misc_Container(self)
         self.changeset = Changeset_Container(self)
         self.elements = Elements_Container(self)
@@ -72,12 +81,15 @@ class Api():
         raise exception
     
     @staticmethod
-    def _raw_stream_parser(xml_raw_stream: "HTTPResponse") -> Generator[ElementTree.Element, None, None]:
-            iterator = ElementTree.iterparse(xml_raw_stream, events=['end'])
+    def _raw_stream_parser(xml_raw_stream: "HTTPResponse", backend: ParserBackend = ParserBackend.ETREE) -> Generator[ElementTree.Element, None, None]:
+            if backend == ParserBackend.LXML:
+                iterator = _import_lxml_etree().iterparse(xml_raw_stream, events=['end'])
+            else:
+                iterator = ElementTree.iterparse(xml_raw_stream, events=['end'])
             for event, element in iterator:
                 yield element
 
     def _request_generator(self, method: _RequestMethods, url: str, custom_status_code_exceptions: dict = {int: Exception}) -> Generator[ElementTree.Element, None, None]:
         response = self._request(method=method, url=url, stream=True, custom_status_code_exceptions=custom_status_code_exceptions)
         response.raw.decode_content = True
-        return self._raw_stream_parser(response.raw)
\ No newline at end of file
+        return self._raw_stream_parser(response.raw, self._parser_backend)
\ No newline at end of file
@@ -5,9 +5,11 @@ if TYPE_CHECKING:
     from xml.etree import ElementTree
     from ...api import Api
     from ...data_classes import Node, Way, Relation
+    from ...diff import TagFilter
 
 from ...utils import join_url
 from ...data_classes import Changeset, OsmChange, Tags, Action
+from ...data_classes.tags import intern_string
 from ...api import exceptions
 from ...diff.diff_parser import _OsmChange_parser_generator
 
@@ -35,7 +37,7 @@ class Changeset_Container:
         discussion = []
         for element in generator:
                 if element.tag == "tag":
-                    tags.update({element.attrib["k"]: element.attrib["v"]})
+                    tags.update({intern_string(element.attrib["k"]): intern_string(element.attrib["v"])})
                 elif include_discussion and element.tag == "discussion":
                     for comment in element:
                         discussion.append({"date": comment.attrib["date"], "user_id": comment.attrib["uid"], "text": comment[0].text})
@@ -198,7 +200,7 @@ class Changeset_Container:
             self.outer._url.changeset["update"].format(id=id), body=xml_str, stream=True, custom_status_code_exceptions={409: exceptions.ChangesetAlreadyClosedOrUserIsNotAnAuthor("{TEXT}")})
 
         response.raw.decode_content = True
-        return self._xml_to_changesets_list(self.outer._raw_stream_parser(response.raw), True)[0]
+        return self._xml_to_changesets_list(self.outer._raw_stream_parser(response.raw, self.outer._parser_backend), True)[0]
 
     def close(self, id: int) -> None:
         """Close changeset by ID.
@@ -211,11 +213,12 @@ class Changeset_Container:
         """
         self.outer._request(self.outer._RequestMethods.PUT, self.outer._url.changeset["close"].format(id = id), custom_status_code_exceptions={409: exceptions.ChangesetAlreadyClosedOrUserIsNotAnAuthor("{TEXT}")})
 
-    def download(self, id: int) -> Generator[Tuple['Action', 'Node | Way | Relation'], None, None]:
+    def download(self, id: int, tags: "TagFilter | Tags | str" = Tags()) -> Generator[Tuple['Action', 'Node | Way | Relation'], None, None]:
         """Download changes made in changeset. Like in 'diff' module.
 
         Args:
             id (int): Changeset ID.
+            tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
 
         Yields:
             Generator: Diff generator like in 'diff' module.
@@ -224,7 +227,7 @@ class Changeset_Container:
 
         stream.raw.decode_content = True
         def generator() -> Generator[tuple['Action', 'Node | Way | Relation'], None, None]:   
-            gen = _OsmChange_parser_generator(stream.raw, None)
+            gen = _OsmChange_parser_generator(stream.raw, None, tags, self.outer._parser_backend)
             next(gen) # for meta data
             for action, element in gen: # type: ignore
                 action = cast('Action', action)
@@ -239,7 +239,7 @@ class Elements_Container:
             id (int): Element id.
 
         Returns:
-            Way_Relation: Way or Relation with complete data.
+            Way_Relation: Way or Relation with complete data. Way nodes are resolved from downloaded nodes on access (see `NodeRefs`), so ways sharing a node return the same object.
         """
         element_name = element_type.__name__.lower()
         url = self.outer._url.elements["full"].format(element_type = element_name, id=id)
@@ -262,12 +262,10 @@ class Elements_Container:
                 assert relation.id, f"[ERROR::API::ENDPOINTS::ELEMENTS::full] No id for {node}" # pragma: no cover
                 relations_dict.update({relation.id: relation})
         
+        # Way nodes are taken from nodes_dict when they are accessed.
+        resolver = nodes_dict.get
         for way in ways_dict.values():
-            for i in range(len(way.nodes)):
-                node_id = way.nodes[i].id
-                assert node_id, f"[ERROR::API::ENDPOINTS::ELEMENTS::full] No id for {node}" # pragma: no cover
-                node = nodes_dict[node_id]
-                way.nodes[i] = deepcopy(node)
+            way.nodes.resolver = resolver
 
         if element_name == "relation":
             for relation in relations_dict.values():
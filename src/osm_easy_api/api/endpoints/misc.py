@@ -3,8 +3,10 @@ if TYPE_CHECKING:
     from xml.etree import ElementTree
     from ...data_classes import Node, Way, Relation
     from ...api import Api
+    from ...diff import TagFilter
 
 from ...api import exceptions
+from ...data_classes import Tags
 # TODO: Update OsmChange_parser_generator to have more general usage
 from ...diff.diff_parser import _OsmChange_parser_generator
 
@@ -68,7 +70,7 @@ class Misc_Container:
 
             return return_dict
 
-        def get_map_in_bbox(self, left: float, bottom: float, right: float, top: float) -> Generator["Node | Way | Relation", None, None]:
+        def get_map_in_bbox(self, left: float, bottom: float, right: float, top: float, tags: "TagFilter | Tags | str" = Tags()) -> Generator["Node | Way | Relation", None, None]:
             """Returns generator of map data in border box. See https://wiki.openstreetmap.org/wiki/API_v0.6#Retrieving_map_data_by_bounding_box:_GET_/api/0.6/map for more info. 
 
             Args:
@@ -76,6 +78,7 @@ class Misc_Container:
                 bottom (float)
                 right (float)
                 top (float)
+                tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
 
             Yields:
                 Node | Way | Relation
@@ -91,7 +94,7 @@ class Misc_Container:
 
             response.raw.decode_content = True
             def generator():
-                gen = _OsmChange_parser_generator(response.raw, None)
+                gen = _OsmChange_parser_generator(response.raw, None, tags, self.outer._parser_backend)
                 next(gen) # for meta data
                 for action, element in gen: # type: ignore
                     yield cast("Node | Way | Relation", element)
@@ -1,12 +1,15 @@
 from enum import Enum
-from xml.dom import minidom
+from io import TextIOBase
 from collections import namedtuple
-from typing import NamedTuple
+from typing import IO, Generator, NamedTuple
 from copy import deepcopy
 
 from ..data_classes.node import Node
 from ..data_classes.way import Way
+from ..data_classes.node_refs import NodeRefs
 from ..data_classes.relation import Relation
+from ..data_classes.compact import _FULL_TYPES
+from ..data_classes.osmchange_writer import _osmChange_xml
 
 Meta = NamedTuple("Meta", [("version", str), ("generator", str), ("sequence_number", str)])
 Meta.__doc__ = """\
@@ -22,7 +25,7 @@ class Action(Enum):
 
 class OsmChange():
     meta: Meta
-    elements: dict
+    elements: dict[type[Node | Way | Relation], dict[Action, list[Node | Way | Relation]]]
 
     @property
     def _current_negative_id(self):
@@ -39,6 +42,9 @@ class OsmChange():
             Node: {Action.CREATE: [], Action.MODIFY: [], Action.DELETE: [], Action.NONE: []},
             Way: {Action.CREATE: [], Action.MODIFY: [], Action.DELETE: [], Action.NONE: []},
             Relation: {Action.CREATE: [], Action.MODIFY: [], Action.DELETE: [], Action.NONE: []}}
+        # Index of every list in elements: element id -> the last element with this id in the list.
+        self._ids: dict[type[Node | Way | Relation], dict[Action, dict[int | None, Node | Way | Relation]]] = {
+            element_type: {action: {} for action in Action} for element_type in (Node, Way, Relation)}
         self._current_negative_id = 0
 
     def __str__(self):
@@ -61,49 +67,63 @@ class OsmChange():
     
     @staticmethod
     def _make_osmChange_valid(osmChange: 'OsmChange'):
+        """Gives negative ids to created elements without id and adds way nodes and relation members without id to created elements. Every element gets new id only once, so it takes linear time."""
+        # id() of elements which got new id (objects are kept alive by osmChange)
+        fixed: set[int] = set()
+
         def fix_negative_or_none_version_and_id(type):
-            for element in osmChange.get(type, Action.CREATE):
+            elements = osmChange.get(type, Action.CREATE)
+            for element in elements:
                 if element.id is None or element.id < 0:
                     if element.version is None:
                         element.version = 1
                     element.id = osmChange._current_negative_id
+                    fixed.add(id(element))
+            osmChange._rebuild_index(type, Action.CREATE)
 
         fix_negative_or_none_version_and_id(Node)
         fix_negative_or_none_version_and_id(Way)
         fix_negative_or_none_version_and_id(Relation)
 
+        def add_created(element: Node | Way | Relation):
+            # Created elements with negative id were fixed above, so not fixed element isn't in the create list yet.
+            if id(element) in fixed: return
+            element.id = osmChange._current_negative_id
+            fixed.add(id(element))
+            osmChange.add(element, Action.CREATE)
+
         def add_relation_members_with_negative_ids(action: Action):
-            for relation in osmChange.get(Relation, action):
+            relations = osmChange.get(Relation, action)
+            i = 0
+            while i < len(relations): # member relations can be appended to the list
+                relation = relations[i]
+                i += 1
                 for member in relation.members:
                     member_id = member.element.id
-                    if member_id is None or member_id < 0:
-                        member.element.id = osmChange._current_negative_id
-                        elements = osmChange.get(type(member.element), Action.CREATE)
-                        for element in elements:
-                            if element == member:
-                                elements.remove(element)
-                                break
-                        osmChange.add(member.element, Action.CREATE)
+                    if member_id is None or member_id < 0: add_created(member.element)
 
         add_relation_members_with_negative_ids(Action.CREATE)
         add_relation_members_with_negative_ids(Action.MODIFY)
 
         def add_way_nodes_with_negative_ids(action: Action):
             for way in osmChange.get(Way, action):
-                for node in way.nodes:
+                nodes = way.nodes
+                if isinstance(nodes, NodeRefs):
+                    for i in nodes._positions_without_id(): add_created(nodes[i])
+                    continue
+                for node in nodes:
                     node_id = node.id
-                    if node_id is None or node_id < 0:
-                        node.id = osmChange._current_negative_id
-                        elements = osmChange.get(Node, Action.CREATE)
-                        for element in elements:
-                            if element == node:
-                                elements.remove(element)
-                                break
-                        osmChange.add(node, Action.CREATE)
-        
+                    if node_id is None or node_id < 0: add_created(node)
+
         add_way_nodes_with_negative_ids(Action.CREATE)
         add_way_nodes_with_negative_ids(Action.MODIFY)
 
+    def _prepare_xml(self, make_osmChange_valid: bool, work_on_copy: bool) -> 'OsmChange':
+        osmChange = self
+        if work_on_copy: osmChange = deepcopy(self)
+        if make_osmChange_valid: OsmChange._make_osmChange_valid(osmChange)
+        return osmChange
+
     def to_xml(self, changeset_id: int = -1, make_osmChange_valid: bool = True, work_on_copy: bool = False) -> str:
         """Returns xml string in OsmChange format.
 
@@ -115,41 +135,49 @@ class OsmChange():
         Returns:
             str: xml string.
         """
-        osmChange = self
-        if work_on_copy: osmChange = deepcopy(self)
-        if make_osmChange_valid: OsmChange._make_osmChange_valid(osmChange)
+        return OsmChange._to_xml(self._prepare_xml(make_osmChange_valid, work_on_copy), changeset_id)
 
-        return OsmChange._to_xml(osmChange, changeset_id)
+    def iter_xml(self, changeset_id: int = -1, make_osmChange_valid: bool = True, work_on_copy: bool = False, chunk_size: int = 64 * 1024) -> Generator[bytes, None, None]:
+        """Yields xml in OsmChange format as utf-8 encoded chunks without building the whole document in memory. Joined chunks are equal to encoded `to_xml()`.
 
-    @staticmethod
-    def _to_xml(osmChange: 'OsmChange', changeset_id):
-        root = minidom.Document()
-        xml = root.createElement("osmChange")
-        xml.setAttribute("version", osmChange.meta.version)
-        xml.setAttribute("generator", osmChange.meta.generator)
-        root.appendChild(xml)
-
-        def append_elements_to_master_element(master_name, elements):
-            if not elements: return
-            master = root.createElement(master_name)
-            for element in elements:
-                master.appendChild(element._to_xml(changeset_id))
-            xml.appendChild(master)
-            
-        append_elements_to_master_element("create", osmChange.get(Node, Action.CREATE))
-        append_elements_to_master_element("modify", osmChange.get(Node, Action.MODIFY))
-        append_elements_to_master_element("delete", osmChange.get(Node, Action.DELETE))
+        Args:
+            changeset_id (int): See `to_xml()`. Defaults to -1.
+            make_osmChange_valid (bool, optional): See `to_xml()`. Defaults to True.
+            work_on_copy (bool, optional): See `to_xml()`. Defaults to False.
+            chunk_size (int, optional): Approximate size of chunks in characters. Defaults to 64 KiB.
 
-        append_elements_to_master_element("create", osmChange.get(Way, Action.CREATE))
-        append_elements_to_master_element("modify", osmChange.get(Way, Action.MODIFY))
-        append_elements_to_master_element("delete", osmChange.get(Way, Action.DELETE))
+        Yields:
+            bytes: Part of xml.
+        """
+        osmChange = self._prepare_xml(make_osmChange_valid, work_on_copy)
+        parts: list[str] = []
+        size = 0
+        for part in _osmChange_xml(osmChange, changeset_id):
+            parts.append(part)
+            size += len(part)
+            if size >= chunk_size:
+                yield "".join(parts).encode("utf-8")
+                parts, size = [], 0
+        if parts: yield "".join(parts).encode("utf-8")
 
-        append_elements_to_master_element("create", osmChange.get(Relation, Action.CREATE))
-        append_elements_to_master_element("modify", osmChange.get(Relation, Action.MODIFY))
-        append_elements_to_master_element("delete", osmChange.get(Relation, Action.DELETE))
+    def write_xml(self, file: IO, changeset_id: int = -1, make_osmChange_valid: bool = True, work_on_copy: bool = False) -> None:
+        """Writes xml in OsmChange format to a file-like object without building the whole document in memory.
 
-        xml_str = root.toprettyxml(indent="\t")
-        return xml_str
+        Args:
+            file (IO): Binary file (utf-8 encoded bytes are written) or text file (`io.TextIOBase`).
+            changeset_id (int): See `to_xml()`. Defaults to -1.
+            make_osmChange_valid (bool, optional): See `to_xml()`. Defaults to True.
+            work_on_copy (bool, optional): See `to_xml()`. Defaults to False.
+        """
+        if isinstance(file, TextIOBase):
+            osmChange = self._prepare_xml(make_osmChange_valid, work_on_copy)
+            for part in _osmChange_xml(osmChange, changeset_id): file.write(part)
+            return
+        for chunk in self.iter_xml(changeset_id, make_osmChange_valid, work_on_copy): file.write(chunk)
+
+    @staticmethod
+    def _to_xml(osmChange: 'OsmChange', changeset_id) -> str:
+        return "".join(_osmChange_xml(osmChange, changeset_id))
 
     def get(self, type: type[Node | Way | Relation], action: Action = Action.NONE) -> list[Node | Way | Relation]:
         """Gets list of elements with provided type and action.
@@ -159,12 +187,78 @@ class OsmChange():
             action (Action, optional): Defaults to Action.NONE.
 
         Returns:
-            list[Node | Way | Relation]: List of elements.
+            list[Node | Way | Relation]: List of elements. Compact elements (see `osm_easy_api.data_classes.compact`) are stored together with normal ones. Use `add()`, `remove()` and `replace()` to change it, elements added to the list directly are not found by `find()`.
         """
-        return self.elements[type][action]
+        return self.elements[_FULL_TYPES.get(type, type)][action]
 
     def add(self, object: Node | Way | Relation, action: Action = Action.NONE):
-        self.elements[type(object)][action].append(object)
+        element_type = _FULL_TYPES.get(type(object), type(object))
+        self.elements[element_type][action].append(object)
+        self._ids[element_type][action][object.id] = object
 
     def remove(self, object: Node | Way | Relation, action: Action = Action.NONE):
-        self.elements[type(object)][action].remove(object)
\ No newline at end of file
+        element_type = _FULL_TYPES.get(type(object), type(object))
+        self.elements[element_type][action].remove(object)
+        self._reindex(element_type, action, object.id)
+
+    def _reindex(self, type: type[Node | Way | Relation], action: Action, id: int | None) -> Node | Way | Relation | None:
+        """Finds the last element with given id in the list and updates the index. Takes linear time, used only after the list changed."""
+        ids = self._ids[type][action]
+        for element in reversed(self.elements[type][action]):
+            if element.id == id:
+                ids[id] = element
+                return element
+        ids.pop(id, None)
+        return None
+
+    def _rebuild_index(self, type: type[Node | Way | Relation], action: Action) -> None:
+        """Indexes the list again, used after ids of many elements were changed."""
+        self._ids[type][action] = {element.id: element for element in self.elements[type][action]}
+
+    def find(self, type: type[Node | Way | Relation], id: int, action: Action | None = None) -> Node | Way | Relation | None:
+        """Finds element by type and id in constant time.
+
+        Args:
+            type (type[Node | Way | Relation]): Element type.
+            id (int): Element id.
+            action (Action | None, optional): Action of the element. Defaults to None (any action, if the id is in many actions, delete is returned before modify, create and none).
+
+        Returns:
+            Node | Way | Relation | None: The last added element with given id or None.
+        """
+        element_type = _FULL_TYPES.get(type, type)
+        for element_action in (action,) if action is not None else (Action.DELETE, Action.MODIFY, Action.CREATE, Action.NONE):
+            element = self._ids[element_type][element_action].get(id)
+            # Id of the element was changed after it was added.
+            if element is not None and element.id != id: element = self._reindex(element_type, element_action, id)
+            if element is not None: return element
+        return None
+
+    def contains(self, type: type[Node | Way | Relation], id: int, action: Action | None = None) -> bool:
+        """Checks in constant time if the OsmChange contains element with given type and id (and action, if provided)."""
+        return self.find(type, id, action) is not None
+
+    def replace(self, old: Node | Way | Relation, new: Node | Way | Relation, action: Action | None = None):
+        """Replaces element, the new element takes position of the old one. Use `replace(element, element)` after changing id of the element.
+
+        Args:
+            old (Node | Way | Relation): Element in the OsmChange.
+            new (Node | Way | Relation): New element of the same type.
+            action (Action | None, optional): Action of the old element. Defaults to None (any action).
+
+        Raises:
+            ValueError: Old element is not in the OsmChange or new element has different type.
+        """
+        element_type = _FULL_TYPES.get(type(old), type(old))
+        if _FULL_TYPES.get(type(new), type(new)) is not element_type: raise ValueError("[ERROR::OSM_CHANGE::REPLACE] New element has different type.")
+        for element_action in (action,) if action is not None else tuple(Action):
+            elements = self.elements[element_type][element_action]
+            try:
+                position = elements.index(old)
+            except ValueError: continue
+            old_id = elements[position].id
+            elements[position] = new
+            self._reindex(element_type, element_action, old_id)
+            self._reindex(element_type, element_action, new.id)
+            return
+        raise ValueError("[ERROR::OSM_CHANGE::REPLACE] Element is not in the OsmChange.")
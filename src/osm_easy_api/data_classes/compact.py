@@ -0,0 +1,112 @@
+"""Memory-compact variants of Node, Way and Relation.
+
+They use `__slots__` instead of per-instance `__dict__` and elements without tags share one immutable `EMPTY_TAGS` object. Public attributes are the same as in `Node`, `Way` and `Relation`. `OsmChange` stores them together with the full classes (`osmChange.get(Node)` returns both). Use `to_full()` to get normal object.
+"""
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, Iterable
+
+from .tags import Tags
+from .node import Node
+from .way import Way
+from .relation import Relation, Member
+from .node_refs import NodeRefs
+
+class _EmptyTags(Tags):
+    """Immutable empty Tags."""
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("EMPTY_TAGS can not be modified. Assign new Tags object to element.tags instead.")
+
+    __setitem__ = __delitem__ = add = set = remove = update = pop = popitem = clear = setdefault = __ior__ = _immutable # type: ignore
+
+    def __copy__(self): return self
+    def __deepcopy__(self, memo): return self
+    def __reduce__(self): return (_empty_tags, ())
+
+EMPTY_TAGS = _EmptyTags()
+"""Tags shared by all compact elements without tags."""
+
+def _empty_tags() -> Tags:
+    return EMPTY_TAGS
+
+def _tags_from_pairs(tags: Iterable[tuple[str, str]]) -> Tags:
+    tags = list(tags)
+    return Tags(tags) if tags else EMPTY_TAGS
+
+@dataclass(slots=True)
+class _CompactPrimitive():
+    _FULL: ClassVar[type]
+    id: int | None = None
+    visible: bool | None = None
+    version: int | None = None
+    changeset_id: int | None = None
+    timestamp: str | None = None
+    user_id: int | None = None
+    tags: Tags = field(default_factory=_empty_tags)
+
+    @staticmethod
+    def _common_from_attrib(attrib: dict[str, str]) -> dict:
+        visible = None
+        if attrib.get("visible"):
+            visible = True if attrib["visible"] == "true" else False
+        return {"id": int(attrib["id"]), "visible": visible, "version": int(attrib["version"]), "changeset_id": int(attrib["changeset"]), "timestamp": str(attrib["timestamp"]), "user_id": int(attrib.get("uid", -1))}
+
+    def _full_kwargs(self) -> dict:
+        kwargs = {f.name: getattr(self, f.name) for f in fields(self)}
+        kwargs["tags"] = Tags(self.tags)
+        return kwargs
+
+    def to_full(self) -> Node | Way | Relation:
+        """Returns normal (not compact) object with the same data. Tags are copied."""
+        return self._FULL(**self._full_kwargs())
+
+    def to_dict(self) -> dict:
+        """The same as `to_dict()` of the normal object."""
+        return self.to_full().to_dict()
+
+    def _to_xml(self, changeset_id, *args, **kwargs):
+        return self.to_full()._to_xml(changeset_id, *args, **kwargs)
+
+@dataclass(slots=True)
+class CompactNode(_CompactPrimitive):
+    _FULL: ClassVar[type] = Node
+    latitude: str | None = None
+    longitude: str | None = None
+
+    @classmethod
+    def _from_attrib(cls, attrib: dict[str, str], tags: Iterable[tuple[str, str]] = ()) -> "CompactNode":
+        return cls(**cls._common_from_attrib(attrib), tags=_tags_from_pairs(tags), latitude=str(attrib.get("lat")), longitude=str(attrib.get("lon")))
+
+@dataclass(slots=True)
+class CompactWay(_CompactPrimitive):
+    _FULL: ClassVar[type] = Way
+    nodes: NodeRefs | list[CompactNode] = field(default_factory=NodeRefs)
+
+    @classmethod
+    def _from_attrib(cls, attrib: dict[str, str], tags: Iterable[tuple[str, str]] = (), refs: Iterable[str] = ()) -> "CompactWay":
+        return cls(**cls._common_from_attrib(attrib), tags=_tags_from_pairs(tags), nodes=NodeRefs.from_ids(refs))
+
+    def _full_kwargs(self) -> dict:
+        kwargs = _CompactPrimitive._full_kwargs(self)
+        if isinstance(self.nodes, NodeRefs): kwargs["nodes"] = self.nodes.copy()
+        else: kwargs["nodes"] = [node.to_full() if isinstance(node, _CompactPrimitive) else node for node in self.nodes]
+        return kwargs
+
+_MEMBER_TYPES: dict[str, type] = {"node": CompactNode, "way": CompactWay}
+
+@dataclass(slots=True)
+class CompactRelation(_CompactPrimitive):
+    _FULL: ClassVar[type] = Relation
+    members: list[Member] = field(default_factory=list)
+
+    @classmethod
+    def _from_attrib(cls, attrib: dict[str, str], tags: Iterable[tuple[str, str]] = (), members: Iterable[tuple[str, str, str]] = ()) -> "CompactRelation":
+        """members: (type, ref, role) tuples."""
+        return cls(**cls._common_from_attrib(attrib), tags=_tags_from_pairs(tags), members=[Member(_MEMBER_TYPES.get(member_type, CompactRelation)(id=int(ref)), role) for member_type, ref, role in members])
+
+    def _full_kwargs(self) -> dict:
+        kwargs = _CompactPrimitive._full_kwargs(self)
+        kwargs["members"] = [Member(member.element.to_full() if isinstance(member.element, _CompactPrimitive) else member.element, member.role) for member in self.members]
+        return kwargs
+
+_FULL_TYPES: dict[type, type] = {CompactNode: Node, CompactWay: Way, CompactRelation: Relation}
+"""Compact type -> normal type. Used by OsmChange to store compact elements together with normal ones."""
@@ -0,0 +1,30 @@
+def coordinate_to_fixed(coordinate: str, precision: int = 7) -> int:
+    """Converts decimal coordinate to integer scaled by 10**precision without floating point rounding errors (`"50.1234567"` -> `501234567`). Digits after precision are rounded.
+
+    Args:
+        coordinate (str): Decimal coordinate (for example lat attribute).
+        precision (int, optional): Number of decimal digits. Defaults to 7 (osm precision).
+
+    Returns:
+        int: Scaled coordinate.
+    """
+    integer, _, fraction = coordinate.lstrip("+-").partition(".")
+    value = int(integer or "0") * 10 ** precision + int(fraction[:precision].ljust(precision, "0"))
+    if len(fraction) > precision and fraction[precision] >= "5": value += 1
+    return -value if coordinate.startswith("-") else value
+
+def fixed_to_coordinate(value: int, precision: int = 7) -> str:
+    """Converts integer created by `coordinate_to_fixed()` back to decimal coordinate. Trailing zeros are removed (`501234500` -> `"50.12345"`).
+
+    Args:
+        value (int): Scaled coordinate.
+        precision (int, optional): Number of decimal digits. Defaults to 7 (osm precision).
+
+    Returns:
+        str: Decimal coordinate.
+    """
+    integer, fraction = divmod(abs(value), 10 ** precision)
+    coordinate = str(integer)
+    fraction_str = str(fraction).rjust(precision, "0").rstrip("0")
+    if fraction_str: coordinate += "." + fraction_str
+    return "-" + coordinate if value < 0 else coordinate
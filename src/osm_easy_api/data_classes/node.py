@@ -1,16 +1,77 @@
 from dataclasses import dataclass
 from xml.dom import minidom
+import re
 
-from typing import TYPE_CHECKING
-if TYPE_CHECKING:
-    from xml.etree import ElementTree
+from typing import Iterable
 
-from ..data_classes.osm_object_primitive import osm_object_primitive
+from ..data_classes.osm_object_primitive import osm_object_primitive, _lazy_fields
+from ..data_classes.fixed_point import coordinate_to_fixed, fixed_to_coordinate
 
+_COORDINATE_PATTERN = re.compile(r"-?(?:0|[1-9][0-9]{0,2})(?:\.[0-9]{1,7})?")
+
+def _pack_coordinate(coordinate):
+    """Packs decimal coordinate string to int: `coordinate_to_fixed()` value shifted left by 3 bits plus number of decimal digits (0-7), so the same string can be restored. Other values (None, not canonical strings) are returned unchanged."""
+    if type(coordinate) is int: coordinate = str(coordinate)
+    if type(coordinate) is not str or not _COORDINATE_PATTERN.fullmatch(coordinate): return coordinate
+    value = coordinate_to_fixed(coordinate)
+    if value == 0 and coordinate[0] == "-": return coordinate # "-0.0" can't be restored
+    return value << 3 | len(coordinate.partition(".")[2])
+
+_SCALES = tuple(10 ** (7 - digits) for digits in range(8))
+
+def _pack_parsed_coordinate(coordinate: str):
+    """Faster `_pack_coordinate()` for lat and lon attributes read by parsers. Osm writes canonical decimal strings, so they are not validated. Values which can't be packed (missing attribute, more than 7 decimal digits, "-0.0") are returned unchanged."""
+    integer, _, fraction = coordinate.partition(".")
+    digits = len(fraction)
+    if digits > 7: return coordinate
+    try: value = int(integer + fraction)
+    except ValueError: return coordinate
+    if value == 0 and coordinate[0] == "-": return coordinate
+    return value * _SCALES[digits] << 3 | digits
+
+def _unpack_coordinate(packed):
+    if type(packed) is not int: return packed
+    digits = packed & 7
+    coordinate = fixed_to_coordinate(packed >> 3)
+    if not digits: return coordinate
+    integer, _, fraction = coordinate.partition(".")
+    return integer + "." + fraction.ljust(digits, "0") # restores trailing zeros
+
+class _Coordinate():
+    """Data descriptor of node coordinate. Value is kept in `_<name>` attribute, canonical decimal strings as packed fixed point int (see `_pack_coordinate()`). The getter always returns the original string."""
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.storage_name = "_" + name
+
+    def _packed(self, obj):
+        try: return getattr(obj, self.storage_name)
+        except AttributeError:
+            raw = obj.__dict__.get("_raw") # lazy object
+            if raw is None: raise
+            packed = obj._decode(self.name, *raw)
+            setattr(obj, self.storage_name, packed)
+            return packed
+
+    def __get__(self, obj, owner=None):
+        if obj is None: return None # dataclass default
+        return _unpack_coordinate(self._packed(obj))
+
+    def __set__(self, obj, value):
+        setattr(obj, self.storage_name, _pack_coordinate(value))
+
+    def fixed(self, obj) -> int | None:
+        """Returns `coordinate_to_fixed()` of the coordinate or None if it isn't a decimal number."""
+        packed = self._packed(obj)
+        if type(packed) is int: return packed >> 3
+        if type(packed) is not str: return None
+        try: return coordinate_to_fixed(packed)
+        except ValueError: return None
+
+@_lazy_fields
 @dataclass
 class Node(osm_object_primitive):
-    latitude: str | None = None   # str to prevent rounding values
-    longitude: str | None = None
+    latitude: str | None = _Coordinate()   # type: ignore  # str to prevent rounding values, stored as fixed point int
+    longitude: str | None = _Coordinate()  # type: ignore
 
     def __post_init__(self):
         super().__init__(self.id, self.visible, self.version, self.changeset_id, self.timestamp, self.user_id, self.tags)
@@ -32,9 +93,33 @@ class Node(osm_object_primitive):
                 element.appendChild(tag)
             return element
         
-    @classmethod    
-    def _from_xml(cls, element: 'ElementTree.Element'):
-        node: Node = super()._from_xml(element)
-        node.latitude = str(element.attrib.get("lat"))
-        node.longitude = str(element.attrib.get("lon"))
-        return node
\ No newline at end of file
+    @classmethod
+    def _from_attrib(cls, attrib: dict[str, str], tags: Iterable[tuple[str, str]] = ()):
+        node: Node = super()._from_attrib(attrib, tags)
+        node._latitude = _pack_parsed_coordinate(str(attrib.get("lat")))
+        node._longitude = _pack_parsed_coordinate(str(attrib.get("lon")))
+        return node
+
+    def _decode(self, name: str, attrib: dict[str, str], tags: list[tuple[str, str]]):
+        match name:
+            case "latitude":    return _pack_parsed_coordinate(str(attrib.get("lat")))
+            case "longitude":   return _pack_parsed_coordinate(str(attrib.get("lon")))
+            case _:             return super()._decode(name, attrib, tags)
+
+    @property
+    def latitude_e7(self) -> int | None:
+        """Latitude as integer scaled by 10**7 (osm fixed point), the same as `coordinate_to_fixed(latitude)`. None if latitude isn't a decimal number. Set value is returned by `latitude` with 7 decimal digits."""
+        return Node.__dict__["latitude"].fixed(self)
+
+    @latitude_e7.setter
+    def latitude_e7(self, value: int) -> None:
+        self._latitude = value << 3 | 7
+
+    @property
+    def longitude_e7(self) -> int | None:
+        """Longitude as integer scaled by 10**7 (osm fixed point), the same as `coordinate_to_fixed(longitude)`. None if longitude isn't a decimal number. Set value is returned by `longitude` with 7 decimal digits."""
+        return Node.__dict__["longitude"].fixed(self)
+
+    @longitude_e7.setter
+    def longitude_e7(self, value: int) -> None:
+        self._longitude = value << 3 | 7
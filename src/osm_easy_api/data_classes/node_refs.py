@@ -0,0 +1,142 @@
+from array import array
+from collections.abc import MutableSequence
+
+from typing import Callable, Iterable, Iterator, overload
+
+from ..data_classes.node import Node
+
+class NodeRefs(MutableSequence):
+    """List of way nodes which keeps node ids in `array('q')` and creates `Node` objects only when they are accessed.
+
+    Without resolver, accessed id is replaced with `Node(id=id)` object (so it can be modified like list item). With resolver (for example `dict.get` of node lookup), accessed node is returned by the resolver and is not stored in the way. If resolver returns `None`, `Node(id=id)` is used.
+    Nodes added by the user are stored as they are.
+    """
+    __slots__ = ("_ids", "_nodes", "resolver")
+
+    def __init__(self, nodes: Iterable[Node] = (), resolver: Callable[[int], Node | None] | None = None):
+        """
+        Args:
+            nodes (Iterable[Node], optional): Nodes. Defaults to ().
+            resolver (Callable[[int], Node | None] | None, optional): Function returning node with given id. Defaults to None.
+        """
+        self._ids = array("q")
+        # None or list with stored node (or None for not yet accessed id) for every position.
+        self._nodes: list[Node | None] | None = None
+        self.resolver = resolver
+        for node in nodes: self.append(node)
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int | str], resolver: Callable[[int], Node | None] | None = None) -> "NodeRefs":
+        """Creates node refs from node ids (ints or strings) without creating `Node` objects."""
+        refs = cls(resolver=resolver)
+        refs._ids = array("q", map(int, ids))
+        return refs
+
+    @property
+    def ids(self) -> array:
+        """Ids of all nodes (new array).
+
+        Raises:
+            ValueError: Some node has no id.
+        """
+        ids = array("q", self._ids)
+        if self._nodes is not None:
+            for i, node in enumerate(self._nodes):
+                if node is None: continue
+                if node.id is None: raise ValueError(f"[ERROR::NODE_REFS::IDS] Node at position {i} has no id.")
+                ids[i] = node.id
+        return ids
+
+    def _node(self, i: int, store: bool) -> Node:
+        if self._nodes is not None:
+            node = self._nodes[i]
+            if node is not None: return node
+        if self.resolver is not None:
+            node = self.resolver(self._ids[i])
+            if node is not None: return node
+        node = Node(id=self._ids[i])
+        if store:
+            if self._nodes is None: self._nodes = [None] * len(self._ids)
+            self._nodes[i] = node
+        return node
+
+    def _iter_nodes(self) -> Iterator[Node]:
+        """Iterates nodes without storing created `Node(id=id)` objects. Used for read-only access."""
+        for i in range(len(self._ids)): yield self._node(i, False)
+
+    def _positions_without_id(self) -> Iterator[int]:
+        """Positions of nodes without id or with negative id (new nodes), found without creating `Node` objects."""
+        nodes = self._nodes
+        for i, id in enumerate(self._ids):
+            node = nodes[i] if nodes is not None else None
+            if node is None:
+                if id < 0: yield i
+            elif node.id is None or node.id < 0: yield i
+
+    @overload
+    def __getitem__(self, index: int) -> Node: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[Node]: ...
+    def __getitem__(self, index):
+        if isinstance(index, slice): return [self._node(i, True) for i in range(len(self._ids))[index]]
+        return self._node(range(len(self._ids))[index], True)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            nodes = list(self)
+            nodes[index] = value
+            self.clear()
+            self.extend(nodes)
+            return
+        index = range(len(self._ids))[index]
+        if self._nodes is None: self._nodes = [None] * len(self._ids)
+        self._nodes[index] = value
+        self._ids[index] = 0
+
+    def __delitem__(self, index):
+        del self._ids[index]
+        if self._nodes is not None: del self._nodes[index]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def insert(self, index: int, value: Node) -> None:
+        if self._nodes is None: self._nodes = [None] * len(self._ids)
+        self._ids.insert(index, 0)
+        self._nodes.insert(index, value)
+
+    def append_id(self, id: int) -> None:
+        """Appends node id without creating `Node` object."""
+        self._ids.append(id)
+        if self._nodes is not None: self._nodes.append(None)
+
+    def clear(self) -> None:
+        self._ids = array("q")
+        self._nodes = None
+
+    def copy(self) -> "NodeRefs":
+        """Shallow copy (stored nodes and resolver are shared)."""
+        refs = NodeRefs(resolver=self.resolver)
+        refs._ids = array("q", self._ids)
+        refs._nodes = None if self._nodes is None else list(self._nodes)
+        return refs
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> "NodeRefs":
+        # Resolver is shared, copying it would copy whole node lookup.
+        from copy import deepcopy
+        refs = self.copy()
+        if refs._nodes is not None: refs._nodes = deepcopy(refs._nodes, memo)
+        return refs
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, NodeRefs) and self._nodes is None and other._nodes is None and self.resolver is None and other.resolver is None:
+            return self._ids == other._ids
+        if not isinstance(other, (NodeRefs, list, tuple)): return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self._iter_nodes(), other._iter_nodes() if isinstance(other, NodeRefs) else other))
+
+    __hash__ = None # type: ignore
+
+    def __repr__(self) -> str:
+        return repr(list(self._iter_nodes()))
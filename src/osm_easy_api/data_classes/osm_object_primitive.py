@@ -1,13 +1,21 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from xml.dom import minidom
 from copy import copy
 
-from typing import TYPE_CHECKING
+from typing import Generator, Iterable, TYPE_CHECKING
 if TYPE_CHECKING:
     from xml.etree.ElementTree import Element
 
 from ..data_classes.tags import Tags
+from ..data_classes.tags import intern_string
 
+def _lazy_fields(cls):
+    """Removes class level defaults of dataclass fields (generated __init__ still uses them), so fields missing in lazy objects are handled by __getattr__. Data descriptors are kept, they have to call __getattr__ themselves."""
+    for name in cls.__dataclass_fields__:
+        if name in cls.__dict__ and not hasattr(cls.__dict__[name], "__set__"): delattr(cls, name)
+    return cls
+
+@_lazy_fields
 @dataclass
 class osm_object_primitive():
     id: int | None = None
@@ -18,10 +26,19 @@ class osm_object_primitive():
     user_id: int | None = None
     tags: Tags = field(default_factory=Tags)
 
+    def __getattr__(self, name: str):
+        # Called only for attributes missing in __dict__, so only lazy objects (see _lazy_from_attrib()) are decoded here.
+        raw = self.__dict__.get("_raw")
+        if raw is None or name.startswith("_"): raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        value = self._decode(name, *raw)
+        self.__dict__[name] = value
+        return value
+
     def __str__(self):
+        self._materialize()
         temp = f"{self.__class__.__name__}("
-        for k in self.__dict__:
-            temp += f"{k} = {getattr(self, k)}, "
+        for f in fields(self):
+            temp += f"{f.name} = {getattr(self, f.name)}, "
         temp += ")"
         return temp
 
@@ -41,9 +58,8 @@ class osm_object_primitive():
             element.setAttribute("changeset",   str(changeset_id))
             return element
 
-    @classmethod    
-    def _from_xml(cls, element: 'Element'):
-        attrib = element.attrib
+    @classmethod
+    def _from_attrib(cls, attrib: dict[str, str], tags: Iterable[tuple[str, str]] = ()):
         id = int(attrib["id"])
         visible = None
         if attrib.get("visible"):
@@ -53,10 +69,51 @@ class osm_object_primitive():
         user_id = int(attrib.get("uid", -1))
         changeset_id = int(attrib["changeset"])
         obj = cls(id=id, visible=visible, version=version, timestamp=timestamp, user_id=user_id, changeset_id=changeset_id)
-        for tag in element:
-            if tag.tag == "tag": obj.tags.add(tag.attrib["k"], tag.attrib["v"])
+        for k, v in tags: obj.tags.add(k, v)
 
         return obj
+
+    @classmethod
+    def _lazy_from_attrib(cls, attrib: dict[str, str], tags: list[tuple[str, str]] = [], *children: list):
+        """Creates object which keeps raw attributes and decodes every field on the first access.
+
+        Args:
+            attrib (dict[str, str]): Raw xml attributes.
+            tags (list[tuple[str, str]], optional): Raw (key, value) tags.
+            children (list): Way node refs or relation (type, ref, role) members.
+        """
+        obj = cls.__new__(cls)
+        obj.__dict__["_raw"] = (attrib, tags, *children)
+        return obj
+
+    def _decode(self, name: str, attrib: dict[str, str], tags: list[tuple[str, str]]):
+        match name:
+            case "id":              return int(attrib["id"])
+            case "visible":         return (attrib["visible"] == "true") if attrib.get("visible") else None
+            case "version":         return int(attrib["version"])
+            case "changeset_id":    return int(attrib["changeset"])
+            case "timestamp":       return str(attrib["timestamp"])
+            case "user_id":         return int(attrib.get("uid", -1))
+            case "tags":
+                decoded_tags = Tags()
+                for k, v in tags: decoded_tags.add(k, v)
+                return decoded_tags
+            case _: raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+    def _materialize(self) -> None:
+        """Decodes all not yet decoded fields of lazy object. Does nothing for other objects."""
+        if "_raw" not in self.__dict__: return
+        for f in fields(self): getattr(self, f.name)
+        del self.__dict__["_raw"]
+
+    @staticmethod
+    def _tags_from_xml(element: 'Element') -> Generator[tuple[str, str], None, None]:
+        for tag in element:
+            if tag.tag == "tag": yield (intern_string(tag.attrib["k"]), intern_string(tag.attrib["v"]))
+
+    @classmethod    
+    def _from_xml(cls, element: 'Element'):
+        return cls._from_attrib(element.attrib, cls._tags_from_xml(element))
         
     def to_dict(self) -> dict[str, str]:
         """Returns a dictionary that corresponds to the attributes of the object. In addition, a 'type' key is added to specify the type of element.
@@ -64,7 +121,8 @@ class osm_object_primitive():
         Returns:
             dict[str, str]: A dictionary that represents an object.
         """
-        return_dict = copy(self.__dict__)
+        self._materialize()
+        return_dict = {f.name: getattr(self, f.name) for f in fields(self)}
         return_dict.update({"type": self.__class__.__name__})
         return return_dict
     
@@ -85,5 +143,5 @@ class osm_object_primitive():
         node = cls()
         temp_dict = copy(dict)
         temp_dict.pop("type")
-        node.__dict__ = temp_dict
+        for k, v in temp_dict.items(): setattr(node, k, v)
         return node
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""Streaming osmChange xml writer. Output is the same as `toprettyxml(indent="\\t")` of `minidom` document built by `_to_xml()` methods (of Python 3.13+, which escapes new lines and tabs in attribute values), but no DOM is created."""
+from typing import Iterator, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .OsmChange import OsmChange
+
+from .node import Node
+from .way import Way
+from .relation import Relation
+from .compact import _FULL_TYPES
+
+def _escape(value) -> str:
+    # The same escaping as minidom uses for attribute values since Python 3.13. Older minidom writes new lines and tabs as they are, and xml parsers change them to spaces.
+    value = str(value)
+    if "&" in value: value = value.replace("&", "&amp;")
+    if "<" in value: value = value.replace("<", "&lt;")
+    if "\"" in value: value = value.replace("\"", "&quot;")
+    if ">" in value: value = value.replace(">", "&gt;")
+    if "\r" in value: value = value.replace("\r", "&#13;")
+    if "\n" in value: value = value.replace("\n", "&#10;")
+    if "\t" in value: value = value.replace("\t", "&#9;")
+    return value
+
+def _type_name(element) -> str:
+    return _FULL_TYPES.get(type(element), type(element)).__name__.lower()
+
+def _element_xml(element: Node | Way | Relation, changeset_id, indent: str) -> str:
+    name = _type_name(element)
+    start = f'{indent}<{name} id="{_escape(element.id)}" version="{_escape(element.version)}" changeset="{_escape(changeset_id)}"'
+    if name == "node": start += f' lat="{_escape(element.latitude)}" lon="{_escape(element.longitude)}"' # type: ignore
+
+    child_indent = indent + "\t"
+    children = [f'{child_indent}<tag k="{_escape(k)}" v="{_escape(v)}"/>\n' for k, v in element.tags.items()]
+    if name == "way":
+        nodes = element.nodes # type: ignore
+        for node in (nodes._iter_nodes() if hasattr(nodes, "_iter_nodes") else nodes):
+            children.append(f'{child_indent}<nd ref="{_escape(node.id)}"/>\n')
+    elif name == "relation":
+        for member, role in element.members: # type: ignore
+            children.append(f'{child_indent}<member type="{_type_name(member)}" ref="{_escape(member.id)}" role="{_escape(role)}"/>\n')
+
+    if not children: return start + "/>\n"
+    return start + ">\n" + "".join(children) + f"{indent}</{name}>\n"
+
+def _osmChange_xml(osmChange: "OsmChange", changeset_id) -> Iterator[str]:
+    """Yields parts of osmChange xml (one element at a time)."""
+    from .OsmChange import Action
+    yield '<?xml version="1.0" ?>\n'
+    root = f'<osmChange version="{_escape(osmChange.meta.version)}" generator="{_escape(osmChange.meta.generator)}"'
+    if not any(osmChange.get(element_type, action) for element_type in (Node, Way, Relation) for action in (Action.CREATE, Action.MODIFY, Action.DELETE)):
+        yield root + "/>\n"
+        return
+    yield root + ">\n"
+    for element_type in (Node, Way, Relation):
+        for action, master_name in ((Action.CREATE, "create"), (Action.MODIFY, "modify"), (Action.DELETE, "delete")):
+            elements = osmChange.get(element_type, action)
+            if not elements: continue
+            yield f"\t<{master_name}>\n"
+            for element in elements: yield _element_xml(element, changeset_id, "\t\t")
+            yield f"\t</{master_name}>\n"
+    yield "</osmChange>\n"
@@ -1,16 +1,17 @@
 from dataclasses import dataclass, field
 from copy import copy
-from typing import NamedTuple, TYPE_CHECKING
+from typing import Iterable, NamedTuple, TYPE_CHECKING
 if TYPE_CHECKING:
     from xml.etree.ElementTree import Element
 
-from ..data_classes.osm_object_primitive import osm_object_primitive
+from ..data_classes.osm_object_primitive import osm_object_primitive, _lazy_fields
 from ..data_classes import Node, Way
 
 
 _RELATION_DICTIONARY_TYPE = dict[str, str | list["_MEMBER_DICTIONARY_TYPE"]]
 _MEMBER_DICTIONARY_TYPE = dict[str, str | dict[str, str | list[dict[str, str]]] | _RELATION_DICTIONARY_TYPE]
 
+@_lazy_fields
 @dataclass
 class Relation(osm_object_primitive):
     members: list['Member'] = field(default_factory=list)
@@ -31,21 +32,37 @@ class Relation(osm_object_primitive):
 
             return element
         
-    @classmethod    
-    def _from_xml(cls, element: 'Element'):
-        relation: Relation = super()._from_xml(element)
-        
-        def _append_member(type: type[Node | Way | Relation], member_attrib: dict) -> None:
-            relation.members.append(Member(type(id=int(member_attrib["ref"])), member_attrib["role"]))
+    @classmethod
+    def _from_attrib(cls, attrib: dict[str, str], tags: Iterable[tuple[str, str]] = (), members: Iterable[tuple[str, str, str]] = ()):
+        """members: (type, ref, role) tuples."""
+        relation: Relation = super()._from_attrib(attrib, tags)
+        relation.members.extend(cls._members_from_raw(members))
+        return relation
 
-        for member in element:
-            if member.tag == "member":
-                match member.attrib["type"]:
-                    case "node":        _append_member(Node,        member.attrib)
-                    case "way":         _append_member(Way,         member.attrib)
-                    case "relation":    _append_member(Relation,    member.attrib)
+    @staticmethod
+    def _members_from_raw(members: Iterable[tuple[str, str, str]]) -> list['Member']:
+        """members: (type, ref, role) tuples."""
+        decoded: list[Member] = []
 
-        return relation
+        def _append_member(type: type[Node | Way | Relation], ref: str, role: str) -> None:
+            decoded.append(Member(type(id=int(ref)), role))
+
+        for member_type, ref, role in members:
+            match member_type:
+                case "node":        _append_member(Node,        ref, role)
+                case "way":         _append_member(Way,         ref, role)
+                case "relation":    _append_member(Relation,    ref, role)
+
+        return decoded
+
+    def _decode(self, name: str, attrib: dict[str, str], tags: list[tuple[str, str]], members: list[tuple[str, str, str]] = []):
+        if name == "members": return self._members_from_raw(members)
+        return super()._decode(name, attrib, tags)
+
+    @classmethod    
+    def _from_xml(cls, element: 'Element'):
+        members = ((member.attrib["type"], member.attrib["ref"], member.attrib["role"]) for member in element if member.tag == "member")
+        return cls._from_attrib(element.attrib, cls._tags_from_xml(element), members)
         
     def to_dict(self) -> dict[str, str | list[_MEMBER_DICTIONARY_TYPE]]:
         super_dict: dict[str, str | list[_MEMBER_DICTIONARY_TYPE]] = super().to_dict() # type: ignore
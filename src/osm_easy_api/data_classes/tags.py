@@ -1,6 +1,35 @@
 from xml.dom import minidom
 from typing import Generator
 
+MAX_INTERNED_STRINGS = 100_000
+"""Maximum number of strings in the intern table. When the table is full, it is cleared and filled again with strings seen next, so in a long-running process it follows current data instead of keeping only the earliest strings."""
+MAX_INTERNED_LENGTH = 64
+"""Longer strings (mostly unique names, notes, descriptions) are not interned."""
+
+_intern_table: dict[str, str] = {}
+
+def intern_string(string: str) -> str:
+    """Returns shared copy of a string from process-wide, bounded intern table. Used by parsers for tag keys and values, so equal strings (`highway`, `yes`, `residential`...) are stored in memory only once.
+
+    Args:
+        string (str): String to intern.
+
+    Returns:
+        str: Equal string, shared if it was seen before.
+    """
+    interned = _intern_table.get(string)
+    if interned is not None: return interned
+    if len(string) > MAX_INTERNED_LENGTH: return string
+    # Clearing is cheaper than LRU bookkeeping on every lookup. Common strings are interned again right after it.
+    if len(_intern_table) >= MAX_INTERNED_STRINGS: _intern_table.clear()
+    _intern_table[string] = string
+    return string
+
+def clear_intern_table() -> None:
+    """Removes all strings from the intern table."""
+    _intern_table.clear()
+
+
 class Tags(dict):
     # def __init__(self):
     #     super().__init__()
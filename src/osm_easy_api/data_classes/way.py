@@ -1,19 +1,22 @@
 from dataclasses import dataclass, field
 from copy import copy
 
-from typing import TYPE_CHECKING
+from typing import Iterable, TYPE_CHECKING
 if TYPE_CHECKING:
     from xml.etree.ElementTree import Element
 
-from ..data_classes.osm_object_primitive import osm_object_primitive
+from ..data_classes.osm_object_primitive import osm_object_primitive, _lazy_fields
 from ..data_classes.node import Node
+from ..data_classes.node_refs import NodeRefs
 
+@_lazy_fields
 @dataclass
 class Way(osm_object_primitive):
-    nodes: list[Node] = field(default_factory=list)
+    nodes: NodeRefs = field(default_factory=NodeRefs)
 
     def __post_init__(self):
         super().__init__(self.id, self.visible, self.version, self.changeset_id, self.timestamp, self.user_id, self.tags)
+        if not isinstance(self.nodes, NodeRefs): self.nodes = NodeRefs(self.nodes)
 
     def _to_xml(self, changeset_id, member_version=False, role=""):
         if member_version:
@@ -23,22 +26,34 @@ class Way(osm_object_primitive):
             for tag in self.tags._to_xml():
                 element.appendChild(tag)
                 
-            for node in self.nodes:
+            for node in self._iter_nodes():
                 node_element = node._to_xml(changeset_id, way_version=True)
                 element.appendChild(node_element)
             return element
         
+    @classmethod
+    def _from_attrib(cls, attrib: dict[str, str], tags: Iterable[tuple[str, str]] = (), refs: Iterable[str] = ()):
+        way: Way = super()._from_attrib(attrib, tags)
+        way.nodes = NodeRefs.from_ids(refs)
+        return way
+
+    def _decode(self, name: str, attrib: dict[str, str], tags: list[tuple[str, str]], refs: list[str] = []):
+        if name == "nodes": return NodeRefs.from_ids(refs)
+        return super()._decode(name, attrib, tags)
+
     @classmethod    
     def _from_xml(cls, element: 'Element'):
-        way: Way = super()._from_xml(element)
-        for nd in element:
-            if nd.tag == "nd": way.nodes.append(Node(id=int(nd.attrib["ref"])))
-        return way
+        refs = (nd.attrib["ref"] for nd in element if nd.tag == "nd")
+        return cls._from_attrib(element.attrib, cls._tags_from_xml(element), refs)
         
+    def _iter_nodes(self):
+        # Doesn't create Node objects stored in NodeRefs, only reads them.
+        return self.nodes._iter_nodes() if isinstance(self.nodes, NodeRefs) else iter(self.nodes)
+
     def to_dict(self) -> dict[str, str | list[dict[str, str]]]:
         super_dict: dict[str, str | list[dict[str, str]]] = super().to_dict() # type: ignore
         nodes: list[dict[str, str]] = []
-        for node in self.nodes:
+        for node in self._iter_nodes():
             nodes.append(node.to_dict())
         super_dict["nodes"] = nodes
         return super_dict
@@ -47,8 +62,5 @@ class Way(osm_object_primitive):
     def from_dict(cls, dict: dict[str, str | list[dict[str, str]]]):
         temp_dict = copy(dict)
         way = super().from_dict(temp_dict) # type: ignore (ignoring list of nodes)
-        nodes = copy(dict["nodes"])
-        way.nodes.clear()
-        for node in nodes:
-            way.nodes.append(Node.from_dict(node)) # type: ignore
+        way.nodes = NodeRefs(Node.from_dict(node) for node in dict["nodes"]) # type: ignore
         return way
\ No newline at end of file
@@ -1,2 +1,9 @@
 """Module responsible for downloading, parsing and returning diff files."""
-from .diff import Diff, Frequency 
\ No newline at end of file
+from .diff import Diff, Frequency, State
+from .async_diff import AsyncDiff
+from .parser_backends import ParserBackend
+from .filters import TagFilter, ElementFilter
+from .compaction import compact
+from .columnar import NodeColumns, WayColumns, RelationColumns
+from .stats import DiffStats
+from .sinks import Sink, CallbackSink, JsonLinesSink, SQLiteSink
\ No newline at end of file
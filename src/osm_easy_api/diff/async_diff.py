@@ -0,0 +1,184 @@
+from __future__ import annotations
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncGenerator, Callable, TYPE_CHECKING
+if TYPE_CHECKING:
+    import aiohttp
+
+from .diff import Diff, Frequency, State
+from .diff_parser import _parse_records, _records_to_generator, _ParsedDiff
+from .parser_backends import ParserBackend
+from .filters import TagFilter, ElementFilter
+from ..data_classes import Tags, Node, Way, Relation, OsmChange, Action
+from ..data_classes.OsmChange import Meta
+
+def _import_aiohttp():
+    try:
+        import aiohttp
+    except ImportError as e: # pragma: no cover
+        raise ImportError("AsyncDiff requires aiohttp package. Install it with `pip install osm_easy_api[async]`.") from e
+    return aiohttp
+
+class AsyncDiff():
+    """Asyncio version of `Diff`. Downloads run on the event loop and parsing runs in executor.
+
+    Example:
+        ```py
+        async with AsyncDiff(Frequency.MINUTE) as diff:
+            meta, gen = await diff.get()
+            async for action, element in gen: ...
+        ```
+    """
+    def __init__(self, frequency: Frequency, url: str = "https://planet.openstreetmap.org/replication", standard_url_frequency_format: bool = True, user_agent: str | None = None, parser_backend: ParserBackend = ParserBackend.ETREE, lazy_elements: bool = False, executor: Executor | None = None, compact_elements: bool = False):
+        """
+        Args:
+            frequency (Frequency): Time granularity.
+            url (str, optional): Replication server url. Defaults to "https://planet.openstreetmap.org/replication".
+            standard_url_frequency_format (bool, optional): If url to the state.txt file should contain time granularity. Defaults to True.
+            user_agent (str | None, optional): User agent used during requests. Defaults to None.
+            parser_backend (ParserBackend, optional): XML parser used to parse diffs. Defaults to ParserBackend.ETREE.
+            lazy_elements (bool, optional): Returned elements decode their fields on the first access. Defaults to False.
+            executor (Executor | None, optional): Executor used to parse diffs. ProcessPoolExecutor can be used, because only compressed diff and parsed records are sent between processes. Defaults to None (default executor of the event loop).
+            compact_elements (bool, optional): Returned elements are memory-compact `__slots__` variants. Defaults to False.
+        """
+        self._aiohttp = _import_aiohttp()
+        self._diff = Diff(frequency, url, standard_url_frequency_format, user_agent, parser_backend, lazy_elements, compact_elements)
+        self.executor = executor
+        self._session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> AsyncDiff:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes http session."""
+        if self._session: await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Session must be created inside running event loop.
+        if self._session is None: self._session = self._aiohttp.ClientSession(headers=self._diff._headers)
+        return self._session
+
+    async def _get_state(self) -> str:
+        """Downloads state.txt file content from diff server. Conditional request is used, so not changed file is not downloaded again."""
+        url = self._diff._get_state_url()
+        cached = self._diff._state_cache.get(url)
+        async with self._get_session().get(url, headers=cached[1] if cached else None) as response:
+            if response.status == 304 and cached: return cached[0]
+            if response.status != 200: raise ValueError(f"[ERROR::DIFF::_GET_STATE] API RESPONSE STATUS CODE: {response.status}")
+            state_txt = await response.text()
+            self._diff._cache_state(url, state_txt, response.headers)
+            return state_txt
+
+    async def get_state(self) -> State:
+        """Gets newest replication state from server.
+
+        Returns:
+            State: Sequence number and timestamp of the newest diff.
+        """
+        return Diff._get_state_from_state_txt(await self._get_state())
+
+    async def get_sequence_number(self) -> str:
+        """Gets newest sequence number from server.
+
+        Returns:
+            str: sequence number
+        """
+        return Diff._get_sequence_number_from_state(await self._get_state())
+
+    async def _download(self, sequence_number: str) -> bytes | int:
+        """Downloads whole compressed diff file. Returns response status code if the server did not return the file."""
+        async with self._get_session().get(self._diff._get_url(sequence_number)) as response:
+            if response.status != 200: return response.status
+            return await response.read()
+
+    async def _parse(self, content: bytes, tags: TagFilter | Tags | str, element_filter: ElementFilter | None) -> _ParsedDiff:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, _parse_records, content, tags, self._diff.parser_backend, element_filter)
+
+    async def _records_to_async_generator(self, root_attrib: dict[str, str], records: list, sequence_number: str) -> AsyncGenerator[Meta | tuple[Action, Node | Way | Relation], None]:
+        for item in _records_to_generator(root_attrib, records, sequence_number, self._diff.lazy_elements, self._diff.compact_elements):
+            yield item
+
+    async def get(self, sequence_number: str | None = None, tags: TagFilter | Tags | str = Tags(), generator: bool = True, element_filter: ElementFilter | None = None) -> tuple[Meta, AsyncGenerator[tuple[Action, Node | Way | Relation], None]] | OsmChange:
+        """Downloads and parses diff file.
+
+        Args:
+            sequence_number (str, optional): Sequence number to download. If no provided the newest diff will be downloaded.
+            tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
+            generator (bool, optional): Method should return async generator or OsmChange class?. Defaults to True = generator.
+            element_filter (ElementFilter | None, optional): Filter of element types and attributes. Defaults to None.
+
+        Raises:
+            ValueError: Server did not return the diff.
+
+        Returns:
+            tuple[Meta, AsyncGenerator[tuple[Action, Node | Way | Relation], None]] | OsmChange: Returns async generator or OsmChange type depending on generator argument.
+        """
+        if not sequence_number: sequence_number = await self.get_sequence_number()
+        content = await self._download(sequence_number)
+        if isinstance(content, int): raise ValueError(f"[ERROR::DIFF::GET] API RESPONSE STATUS CODE: {content}")
+        gen = self._records_to_async_generator(*await self._parse(content, tags, element_filter), sequence_number)
+        meta: Meta = await gen.__anext__() # type: ignore
+        if generator: return (meta, gen) # type: ignore
+
+        osmChange = OsmChange(meta.version, meta.generator, meta.sequence_number)
+        async for action, element in gen: osmChange.add(element, action) # type: ignore
+        return osmChange
+
+    async def get_range(self, start_sequence_number: str, end_sequence_number: str, tags: TagFilter | Tags | str = Tags(), max_concurrency: int = 8, on_missing: Callable[[str, int | aiohttp.ClientError | asyncio.TimeoutError], None] | None = None, element_filter: ElementFilter | None = None) -> AsyncGenerator[Meta | tuple[Action, Node | Way | Relation], None]:
+        """Downloads diffs from start_sequence_number to end_sequence_number (both inclusive) concurrently and yields their elements in sequence order.
+
+        Args:
+            start_sequence_number (str): First sequence number to download.
+            end_sequence_number (str): Last sequence number to download.
+            tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
+            max_concurrency (int, optional): Maximum number of simultaneous downloads. Defaults to 8.
+            on_missing (Callable[[str, int | aiohttp.ClientError | asyncio.TimeoutError], None] | None, optional): Called with sequence number and response status code for every diff the server did not return (for example 404) or with the exception if downloading failed (for example connection error or timeout). Such diffs are skipped and other diffs are still downloaded. Defaults to None.
+            element_filter (ElementFilter | None, optional): Filter of element types and attributes. Defaults to None.
+
+        Raises:
+            ValueError: Wrong sequence numbers or max_concurrency, or the server did not return a diff and on_missing is None.
+            aiohttp.ClientError | asyncio.TimeoutError: Downloading of a diff failed and on_missing is None. Pending downloads are cancelled.
+
+        Yields:
+            AsyncGenerator[Meta | tuple[Action, Node | Way | Relation], None]: For every downloaded diff Meta namedtuple first and then its elements.
+        """
+        start, end = int(start_sequence_number), int(end_sequence_number)
+        if start > end: raise ValueError(f"[ERROR::DIFF::GET_RANGE] start_sequence_number ({start}) is greater than end_sequence_number ({end}).")
+        if max_concurrency < 1: raise ValueError("[ERROR::DIFF::GET_RANGE] max_concurrency must be greater than 0.")
+
+        async def download_and_parse(sequence_number: str) -> _ParsedDiff | int:
+            content = await self._download(sequence_number)
+            if isinstance(content, int): return content
+            return await self._parse(content, tags, element_filter)
+
+        pending: deque[tuple[str, asyncio.Task[_ParsedDiff | int]]] = deque()
+        next_sequence_number = start
+        try:
+            while next_sequence_number <= end or pending:
+                # Keep only a limited number of downloaded diffs in memory.
+                while next_sequence_number <= end and len(pending) < max_concurrency:
+                    sequence_number = str(next_sequence_number)
+                    pending.append((sequence_number, asyncio.create_task(download_and_parse(sequence_number))))
+                    next_sequence_number += 1
+
+                sequence_number, task = pending.popleft()
+                try:
+                    result = await task
+                except (self._aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if not on_missing: raise # pending downloads are cancelled in finally
+                    on_missing(sequence_number, e)
+                    continue
+                if isinstance(result, int):
+                    if not on_missing: raise ValueError(f"[ERROR::DIFF::GET_RANGE] API RESPONSE STATUS CODE: {result} (sequence number {sequence_number})")
+                    on_missing(sequence_number, result)
+                    continue
+                root_attrib, records = result
+                for item in _records_to_generator(root_attrib, records, sequence_number, self._diff.lazy_elements, self._diff.compact_elements):
+                    yield item
+        finally:
+            for _, task in pending: task.cancel()
@@ -0,0 +1,110 @@
+"""Columnar (NumPy) representation of diffs. Requires numpy package."""
+from __future__ import annotations
+from array import array
+from typing import Iterable, NamedTuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    import numpy
+
+from ..data_classes import Node, Way, Relation, Action
+from ..utils import coordinate_to_fixed
+from .parser_backends import _Record
+
+MISSING_COORDINATE = -2 ** 31
+"""Latitude and longitude of nodes without coordinates (for example some deleted nodes)."""
+
+_MEMBER_TYPES = {"node": 0, "way": 1, "relation": 2}
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e: # pragma: no cover
+        raise ImportError("Columnar output requires numpy package. Install it with `pip install osm_easy_api[numpy]`.") from e
+    return numpy
+
+class NodeColumns(NamedTuple):
+    """Nodes as NumPy arrays. Timestamps are seconds since epoch (int64), coordinates are fixed-point int32 (degrees * 10**7)."""
+    id: numpy.ndarray
+    version: numpy.ndarray
+    changeset_id: numpy.ndarray
+    user_id: numpy.ndarray
+    timestamp: numpy.ndarray
+    latitude: numpy.ndarray
+    longitude: numpy.ndarray
+
+class WayColumns(NamedTuple):
+    """Ways as NumPy arrays. Node ids of way `i` are `nodes[nodes_offsets[i]:nodes_offsets[i + 1]]`."""
+    id: numpy.ndarray
+    version: numpy.ndarray
+    changeset_id: numpy.ndarray
+    user_id: numpy.ndarray
+    timestamp: numpy.ndarray
+    nodes_offsets: numpy.ndarray
+    nodes: numpy.ndarray
+
+class RelationColumns(NamedTuple):
+    """Relations as NumPy arrays. Members of relation `i` are at `members_offsets[i]:members_offsets[i + 1]` in member arrays. Member types: 0 node, 1 way, 2 relation."""
+    id: numpy.ndarray
+    version: numpy.ndarray
+    changeset_id: numpy.ndarray
+    user_id: numpy.ndarray
+    timestamp: numpy.ndarray
+    members_offsets: numpy.ndarray
+    members_type: numpy.ndarray
+    members_ref: numpy.ndarray
+    members_role: numpy.ndarray
+
+class _ColumnsBuilder():
+    """Collects record values in compact python arrays, which are converted to NumPy arrays at the end."""
+    def __init__(self):
+        self.id = array("q")
+        self.version = array("q")
+        self.changeset_id = array("q")
+        self.user_id = array("q")
+        self.timestamp: list[str] = []
+        self.latitude = array("i")
+        self.longitude = array("i")
+        self.offsets = array("q", [0])
+        self.refs = array("q")
+        self.members_type = array("b")
+        self.members_role: list[str] = []
+
+    def add(self, tag: str, attrib: dict[str, str], refs: list[str], members: list[tuple[str, str, str]]) -> None:
+        self.id.append(int(attrib["id"]))
+        self.version.append(int(attrib["version"]))
+        self.changeset_id.append(int(attrib["changeset"]))
+        self.user_id.append(int(attrib.get("uid", -1)))
+        self.timestamp.append(attrib["timestamp"])
+        match tag:
+            case "node":
+                latitude, longitude = attrib.get("lat"), attrib.get("lon")
+                self.latitude.append(coordinate_to_fixed(latitude) if latitude else MISSING_COORDINATE)
+                self.longitude.append(coordinate_to_fixed(longitude) if longitude else MISSING_COORDINATE)
+            case "way":
+                self.refs.extend(map(int, refs))
+                self.offsets.append(len(self.refs))
+            case "relation":
+                for member_type, ref, role in members:
+                    self.members_type.append(_MEMBER_TYPES[member_type])
+                    self.refs.append(int(ref))
+                    self.members_role.append(role)
+                self.offsets.append(len(self.refs))
+
+    def build(self, numpy, type: type[Node | Way | Relation]) -> NodeColumns | WayColumns | RelationColumns:
+        def int_array(values: array, dtype) -> numpy.ndarray:
+            return numpy.frombuffer(values, dtype=dtype).copy() if len(values) else numpy.zeros(0, dtype=dtype)
+
+        # Timestamps have fixed format (2022-11-12T12:52:39Z), which numpy parses without the trailing Z.
+        timestamp = numpy.array([timestamp[:-1] for timestamp in self.timestamp], dtype="datetime64[s]").astype(numpy.int64)
+        common = (int_array(self.id, numpy.int64), int_array(self.version, numpy.int64), int_array(self.changeset_id, numpy.int64), int_array(self.user_id, numpy.int64), timestamp)
+        if type == Node: return NodeColumns(*common, int_array(self.latitude, numpy.int32), int_array(self.longitude, numpy.int32))
+        if type == Way: return WayColumns(*common, int_array(self.offsets, numpy.int64), int_array(self.refs, numpy.int64))
+        return RelationColumns(*common, int_array(self.offsets, numpy.int64), int_array(self.members_type, numpy.int8), int_array(self.refs, numpy.int64), numpy.array(self.members_role, dtype=str))
+
+def _records_to_columns(records: Iterable[_Record]) -> dict[type[Node | Way | Relation], dict[Action, NodeColumns | WayColumns | RelationColumns]]:
+    """Converts records to columns grouped like `OsmChange.elements` (type -> action -> columns)."""
+    numpy = _import_numpy()
+    types: dict[str, type[Node | Way | Relation]] = {"node": Node, "way": Way, "relation": Relation}
+    builders = {type: {action: _ColumnsBuilder() for action in Action} for type in types.values()}
+    for action, tag, attrib, tags, refs, members in records:
+        builders[types[tag]][action].add(tag, attrib, refs, members)
+    return {type: {action: builder.build(numpy, type) for action, builder in by_action.items()} for type, by_action in builders.items()}
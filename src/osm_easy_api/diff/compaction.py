@@ -0,0 +1,54 @@
+"""Collapsing elements of many consecutive diffs into one net change."""
+from typing import Iterable
+
+from ..data_classes import Node, Way, Relation, OsmChange, Action
+from ..data_classes.OsmChange import Meta
+
+def compact(stream: Iterable[Meta | tuple[Action, Node | Way | Relation]]) -> OsmChange:
+    """Keeps only the newest version of every element and merges its actions, so each element is written to the output once.
+
+    Actions are merged as follows (first action + later action):
+    - create + modify = create (with the newest version),
+    - create + delete = element is dropped,
+    - modify + delete = delete,
+    - delete + create or modify = modify (element was undeleted).
+
+    Elements older than already seen version of the same element are ignored. Memory usage is proportional to the number of distinct elements.
+
+    Example:
+        ```py
+        osmChange = compact(diff.get_range("5315422", "5315482"))
+        ```
+
+    Args:
+        stream (Iterable[Meta | tuple[Action, Node | Way | Relation]]): Elements of consecutive diffs, for example from `Diff.get_range()`. Meta namedtuples are optional.
+
+    Returns:
+        OsmChange: Net change. Its meta is taken from the last Meta in the stream.
+    """
+    meta = Meta("0.6", "osm_easy_api", "")
+    # (type, id) -> [action or None if element was dropped, element, element was created in the stream]
+    index: dict[tuple[type, int | None], list] = {}
+    for item in stream:
+        if isinstance(item, Meta):
+            meta = item
+            continue
+        action, element = item
+        key = (type(element), element.id)
+        entry = index.get(key)
+        if entry is None:
+            index[key] = [action, element, action == Action.CREATE]
+            continue
+        if entry[1].version is not None and element.version is not None and element.version < entry[1].version: continue
+
+        entry[1] = element
+        if action == Action.DELETE: entry[0] = None if entry[2] else Action.DELETE
+        elif entry[2]: entry[0] = Action.CREATE
+        elif entry[0] == Action.DELETE: entry[0] = Action.MODIFY
+        elif action == Action.CREATE: entry[0], entry[2] = Action.CREATE, True
+        else: entry[0] = action
+
+    osmChange = OsmChange(meta.version, meta.generator, meta.sequence_number)
+    for action, element, _ in index.values():
+        if action is not None: osmChange.add(element, action)
+    return osmChange
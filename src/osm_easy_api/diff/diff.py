@@ -1,15 +1,27 @@
 from __future__ import annotations
 from enum import Enum
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 import gzip
-from typing import Generator, cast
+import io
+import os
+import time
+from typing import BinaryIO, Callable, Generator, Iterable, Mapping, NamedTuple, cast
 
 import requests
 
-from .diff_parser import _OsmChange_parser, _OsmChange_parser_generator
+from .diff_parser import _OsmChange_parser, _OsmChange_parser_generator, _parse_records, _records_to_generator, _filtered_records, _ParsedDiff
+from .columnar import NodeColumns, WayColumns, RelationColumns, _records_to_columns
+from .stats import DiffStats
+from .sinks import Sink
+from .parser_backends import ParserBackend, _Readable
+from .filters import TagFilter, ElementFilter
 from ..data_classes import Tags, Node, Way, Relation, OsmChange, Action
 from ..data_classes.OsmChange import Meta
 
-from ..utils import join_url, write_gzip_to_file
+from ..utils import join_url, atomic_write, TeeReader, PipelinedGzipReader
 
 class Frequency(Enum):
     MINUTE = 0
@@ -22,19 +34,53 @@ def frequency_to_str(frequency: Frequency) -> str:
         case Frequency.HOUR:    return "hour"
         case Frequency.DAY:     return "day"
 
+def frequency_to_timedelta(frequency: Frequency) -> timedelta:
+    match frequency:
+        case Frequency.MINUTE:  return timedelta(minutes=1)
+        case Frequency.HOUR:    return timedelta(hours=1)
+        case Frequency.DAY:     return timedelta(days=1)
+
+def _aborting_tee(gen: Generator[tuple[Action, Node | Way | Relation], None, None], tee: TeeReader) -> Generator[tuple[Action, Node | Way | Relation], None, None]:
+    """Passes elements of gen. If gen is not exhausted (closed, garbage collected or failed), partial file of tee is removed."""
+    try:
+        yield from gen
+    except BaseException:
+        tee.abort()
+        raise
+    tee.close()
+
+class State(NamedTuple):
+    """Replication state (`state.txt` file)."""
+    sequence_number: int
+    timestamp: datetime
+
 class Diff():
-    def __init__(self, frequency: Frequency, url: str = "https://planet.openstreetmap.org/replication", standard_url_frequency_format: bool = True, user_agent: str | None = None):
+    def __init__(self, frequency: Frequency, url: str = "https://planet.openstreetmap.org/replication", standard_url_frequency_format: bool = True, user_agent: str | None = None, parser_backend: ParserBackend = ParserBackend.ETREE, lazy_elements: bool = False, compact_elements: bool = False):
         """
         Args:
             frequency (Frequency): Time granularity.
             url (_type_, optional): Replication server url. Defaults to "https://planet.openstreetmap.org/replication".
             standard_url_frequency_format (bool, optional): If url to the state.txt file should contain time granularity. Defaults to True.
             user_agent (str | None, optional): User agent used during requests. Defaults to None.
+            parser_backend (ParserBackend, optional): XML parser used to parse diffs. Defaults to ParserBackend.ETREE.
+            lazy_elements (bool, optional): Returned elements keep raw xml attributes and decode fields (and tags) on the first access. Useful if only some fields are read. Defaults to False.
+            compact_elements (bool, optional): Returned elements are memory-compact `__slots__` variants (see `osm_easy_api.data_classes.compact`). Can't be used together with `lazy_elements`. Defaults to False.
+
+        Raises:
+            ValueError: Both `lazy_elements` and `compact_elements` are set.
         """
+        if lazy_elements and compact_elements:
+            raise ValueError("[ERROR::DIFF::INIT] lazy_elements and compact_elements can't be used together.")
         self.url = url
         self.frequency = frequency
         self.standard_url_frequency_format = standard_url_frequency_format
+        self.parser_backend = parser_backend
+        self.lazy_elements = lazy_elements
+        self.compact_elements = compact_elements
         self._headers = {"User-Agent": user_agent} if user_agent else {}
+        self._state_timestamps: dict[int, datetime] = {}
+        # state.txt url -> (content, conditional request headers)
+        self._state_cache: dict[str, tuple[str, dict[str, str]]] = {}
 
     @staticmethod
     def _get_sequence_number_from_state(state_txt: str) -> str:
@@ -56,14 +102,51 @@ class Diff():
 
         return sequence_number.removesuffix('\n')
 
+    @staticmethod
+    def _get_timestamp_from_state(state_txt: str) -> datetime:
+        """Extracts timestamp from state.txt file.
+
+        Args:
+            state_txt (str): Raw state.txt file from diff server.
+
+        Returns:
+            datetime: timestamp (UTC)
+        """
+        for line in state_txt.splitlines():
+            if line.startswith("timestamp="):
+                timestamp = line.removeprefix("timestamp=").replace("\\:", ":")
+                return datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        raise ValueError("[ERROR::DIFF::_GET_TIMESTAMP_FROM_STATE] CAN'T FIND timestamp.")
+
     def _get_state(self) -> str:
-        """Downloads state.txt file content from diff server."""
-        if self.standard_url_frequency_format: url = join_url(self.url, frequency_to_str(self.frequency), "state.txt")
-        else: url = join_url(self.url, "state.txt")
-        response = requests.get(url, headers=self._headers)
+        """Downloads state.txt file content from diff server. Conditional request (ETag, If-Modified-Since) is used, so not changed file is not downloaded again."""
+        url = self._get_state_url()
+        cached = self._state_cache.get(url)
+        response = requests.get(url, headers=(self._headers | cached[1]) if cached else self._headers)
+        if response.status_code == 304 and cached: return cached[0]
         if response.status_code != 200: raise ValueError(f"[ERROR::DIFF::_GET_STATE] API RESPONSE STATUS CODE: {response.status_code}")
+        self._cache_state(url, response.text, response.headers)
         return response.text
 
+    def _cache_state(self, url: str, state_txt: str, response_headers: Mapping[str, str]) -> None:
+        """Saves state.txt content with headers for the next conditional request."""
+        conditional_headers = {}
+        if response_headers.get("ETag"): conditional_headers["If-None-Match"] = response_headers["ETag"]
+        if response_headers.get("Last-Modified"): conditional_headers["If-Modified-Since"] = response_headers["Last-Modified"]
+        self._state_cache[url] = (state_txt, conditional_headers)
+
+    @classmethod
+    def _get_state_from_state_txt(cls, state_txt: str) -> State:
+        return State(int(cls._get_sequence_number_from_state(state_txt)), cls._get_timestamp_from_state(state_txt))
+
+    def get_state(self) -> State:
+        """Gets newest replication state from server. If state did not change since the last call, server returns only 304 status code.
+
+        Returns:
+            State: Sequence number and timestamp of the newest diff.
+        """
+        return self._get_state_from_state_txt(self._get_state())
+
     def get_sequence_number(self) -> str:
         """Gets newest sequence number from server.
 
@@ -72,6 +155,50 @@ class Diff():
         """
         return self._get_sequence_number_from_state(self._get_state())
 
+    def _get_timestamp_of_sequence(self, sequence_number: int) -> datetime:
+        """Returns timestamp from state file of given diff. State files of published diffs never change, so they are cached."""
+        timestamp = self._state_timestamps.get(sequence_number)
+        if timestamp is None:
+            response = requests.get(self._get_state_url(str(sequence_number)), headers=self._headers)
+            if response.status_code != 200: raise ValueError(f"[ERROR::DIFF::SEQUENCE_FOR_TIMESTAMP] API RESPONSE STATUS CODE: {response.status_code}")
+            timestamp = self._get_timestamp_from_state(response.text)
+            self._state_timestamps[sequence_number] = timestamp
+        return timestamp
+
+    def sequence_for_timestamp(self, timestamp: datetime) -> str:
+        """Finds the newest diff with state timestamp not later than given timestamp. Replication started from the next sequence number will contain all changes made after timestamp.
+
+        Uses binary search over state files of diffs (about 20 requests). Downloaded timestamps are cached, so next lookups need less or no requests.
+
+        Args:
+            timestamp (datetime): Timestamp to find. Naive datetime is treated as UTC.
+
+        Raises:
+            ValueError: Timestamp is older than the first diff or the server did not return state file.
+
+        Returns:
+            str: sequence number
+        """
+        if timestamp.tzinfo is None: timestamp = timestamp.replace(tzinfo=timezone.utc)
+        # Narrow the search using already known timestamps. Invariant: timestamp of low <= timestamp < timestamp of high.
+        low = max((sequence_number for sequence_number, known in self._state_timestamps.items() if known <= timestamp), default=None)
+        high = min((sequence_number for sequence_number, known in self._state_timestamps.items() if known > timestamp), default=None)
+
+        if high is None:
+            state = self.get_state()
+            high = state.sequence_number
+            self._state_timestamps[high] = state.timestamp
+            if state.timestamp <= timestamp: return str(high)
+        if low is None:
+            low = 0
+            if self._get_timestamp_of_sequence(low) > timestamp: raise ValueError(f"[ERROR::DIFF::SEQUENCE_FOR_TIMESTAMP] {timestamp} is older than the first diff.")
+
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._get_timestamp_of_sequence(middle) <= timestamp: low = middle
+            else: high = middle
+        return str(low)
+
     @staticmethod
     def _build_url(url: str, frequency: Frequency | None, sequence_number: str) -> str:
         """Builds diff url.
@@ -89,25 +216,38 @@ class Diff():
             return join_url(url, frequency_to_str(frequency), sequence_number[:3], sequence_number[3:6], sequence_number[6:9] + ".osc.gz")
         else:
             return join_url(url, sequence_number[:3], sequence_number[3:6], sequence_number[6:9] + ".osc.gz")
-    @staticmethod
-    def _return_generator_or_OsmChange(file: gzip.GzipFile, tags: Tags | str, sequence_number: str | None, generator: bool) -> tuple[Meta, Generator[tuple[Action, Node | Way | Relation], None, None]] | OsmChange:
+
+    def _get_state_url(self, sequence_number: str | None = None) -> str:
+        """Builds state.txt url for this replication server. If sequence_number is provided, url to state file of this diff is returned."""
+        if sequence_number: return self._get_url(sequence_number).removesuffix(".osc.gz") + ".state.txt"
+        if self.standard_url_frequency_format: return join_url(self.url, frequency_to_str(self.frequency), "state.txt")
+        else: return join_url(self.url, "state.txt")
+
+    def _get_url(self, sequence_number: str) -> str:
+        """Builds diff url for this replication server."""
+        if self.standard_url_frequency_format: return self._build_url(self.url, self.frequency, sequence_number)
+        else: return self._build_url(self.url, None, sequence_number)
+
+    def _return_generator_or_OsmChange(self, file: _Readable, tags: TagFilter | Tags | str, sequence_number: str | None, generator: bool, element_filter: ElementFilter | None = None) -> tuple[Meta, Generator[tuple[Action, Node | Way | Relation], None, None]] | OsmChange:
         """Returns tuple(Meta, generator) or OsmChange class depending on generator boolean."""
-        if not generator: return _OsmChange_parser(file, sequence_number, tags)
+        if not generator: return _OsmChange_parser(file, sequence_number, tags, self.parser_backend, element_filter, self.lazy_elements, self.compact_elements)
 
-        gen_to_return = _OsmChange_parser_generator(file, sequence_number, tags)
+        gen_to_return = _OsmChange_parser_generator(file, sequence_number, tags, self.parser_backend, element_filter, self.lazy_elements, self.compact_elements)
         meta = cast(Meta, next(gen_to_return))
         gen_to_return = cast(Generator[tuple[Action, Node | Way | Relation], None, None], gen_to_return)
         return (meta, gen_to_return)
 
-    def get(self, sequence_number: str | None = None, file_to: str | None = None, file_from: str | None = None, tags: Tags | str = Tags(), generator: bool = True) -> tuple[Meta, Generator[tuple[Action, Node | Way | Relation], None, None]] | OsmChange:
+    def get(self, sequence_number: str | None = None, file_to: str | None = None, file_from: str | None = None, tags: TagFilter | Tags | str = Tags(), generator: bool = True, element_filter: ElementFilter | None = None, pipelined: bool = False) -> tuple[Meta, Generator[tuple[Action, Node | Way | Relation], None, None]] | OsmChange:
         """Gets compressed diff file from server.
 
         Args:
             sequence_number (str, optional): Sequence number to download from. If no provided the newest diff will be downloaded.
-            file_to (str, optional): Path to .xml.gz file where downloaded compressed data will be saved. Defaults get() method will no save file.
+            file_to (str, optional): Path to .xml.gz file where downloaded compressed data will be saved. The file is written during parsing, so if generator is True it is complete after the generator is exhausted. If the generator is closed before that (or parsing fails), the partial file is removed. Defaults get() method will no save file.
             file_from (str, optional): Path to .xml.gz file to parse data from.
-            tags (Tags, optional): Useful if you want to prefetch specific tags. Other tags will be ignored.
+            tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
             generator (bool, optional): Method should return generator or OsmChange class?. Defaults to True = generator.
+            element_filter (ElementFilter | None, optional): Filter of element types and attributes (changeset, user, version, timestamp). Elements not matching it are skipped before any object is created. Defaults to None.
+            pipelined (bool, optional): Download and decompress the diff in a background thread, so it overlaps with parsing. Not used with file_from. Defaults to False.
 
         Returns:
             tuple[Meta, Generator[Node | Way | Relation, None, None]] | OsmChange: Returns Generator or OsmChange type depending on generator argument.
@@ -115,20 +255,279 @@ class Diff():
     
         if file_from: 
             with gzip.open(file_from, "r") as f:
-                return self._return_generator_or_OsmChange(f, tags, sequence_number, generator)
+                return self._return_generator_or_OsmChange(f, tags, sequence_number, generator, element_filter)
 
         if not sequence_number: sequence_number = self.get_sequence_number()
 
-        if self.standard_url_frequency_format: url = self._build_url(self.url, self.frequency, sequence_number)
-        else: url = self._build_url(self.url, None, sequence_number)
+        response = requests.get(self._get_url(sequence_number), stream=True, headers=self._headers)
+
+        # Compressed bytes are saved as they are downloaded, so the diff is decompressed only once.
+        tee = TeeReader(response.raw, file_to) if file_to else None
+        stream: BinaryIO = cast(BinaryIO, tee) if tee else response.raw
+        file: _Readable
+        if pipelined: file = PipelinedGzipReader(stream)
+        else: file = gzip.GzipFile(fileobj=stream)
+
+        if not tee: return self._return_generator_or_OsmChange(file, tags, sequence_number, generator, element_filter)
+        try:
+            result = self._return_generator_or_OsmChange(file, tags, sequence_number, generator, element_filter)
+        except BaseException:
+            tee.abort()
+            raise
+        if isinstance(result, OsmChange):
+            tee.close()
+            return result
+        meta, gen = result
+        return meta, _aborting_tee(gen, tee)
+
+    @contextmanager
+    def _open_compressed(self, sequence_number: str | None, file_from: str | None) -> Generator[tuple[gzip.GzipFile, str | None], None, None]:
+        """Opens diff from file or downloads it. Yields decompressed file and sequence number (None for file_from)."""
+        source: str | io.BytesIO
+        if file_from: source = file_from
+        else:
+            if not sequence_number: sequence_number = self.get_sequence_number()
+            content = self._download(sequence_number)
+            if isinstance(content, int): raise ValueError(f"[ERROR::DIFF::GET] API RESPONSE STATUS CODE: {content}")
+            source = io.BytesIO(content)
+        with gzip.open(source, "rb") as file:
+            yield cast(gzip.GzipFile, file), sequence_number
+
+    def get_columnar(self, sequence_number: str | None = None, file_from: str | None = None, tags: TagFilter | Tags | str = Tags(), element_filter: ElementFilter | None = None) -> tuple[Meta, dict[type[Node | Way | Relation], dict[Action, NodeColumns | WayColumns | RelationColumns]]]:
+        """Gets diff as NumPy arrays instead of osm objects. Useful for vectorized filtering and aggregation. Tags are not included (use tags argument to filter elements). Requires numpy package.
+
+        Args:
+            sequence_number (str, optional): Sequence number to download from. If no provided the newest diff will be downloaded.
+            file_from (str, optional): Path to .xml.gz file to parse data from.
+            tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
+            element_filter (ElementFilter | None, optional): Filter of element types and attributes. Defaults to None.
+
+        Raises:
+            ValueError: Server did not return the diff.
+
+        Returns:
+            tuple[Meta, dict[type[Node | Way | Relation], dict[Action, NodeColumns | WayColumns | RelationColumns]]]: Meta namedtuple and columns grouped by element type and action (like `OsmChange.elements`).
+        """
+        with self._open_compressed(sequence_number, file_from) as (file, sequence_number):
+            root_attrib, records = _filtered_records(file, tags, self.parser_backend, element_filter)
+            meta = Meta(version=root_attrib["version"], generator=root_attrib["generator"], sequence_number=sequence_number or "")
+            return meta, _records_to_columns(records)
+
+    def stats(self, sequence_number: str | None = None, file_from: str | None = None, tags: TagFilter | Tags | str = Tags(), element_filter: ElementFilter | None = None) -> DiffStats:
+        """Counts elements of diff without creating osm objects.
+
+        Args:
+            sequence_number (str, optional): Sequence number to download from. If no provided the newest diff will be downloaded.
+            file_from (str, optional): Path to .xml.gz file to parse data from.
+            tags (TagFilter | Tags | str, optional): Count only elements with specific tags.
+            element_filter (ElementFilter | None, optional): Count only elements matching the filter. Defaults to None.
+
+        Raises:
+            ValueError: Server did not return the diff.
+
+        Returns:
+            DiffStats: Counts of elements by type and action, changeset, user and tag key and timestamps range. Stats of many diffs can be added.
+        """
+        with self._open_compressed(sequence_number, file_from) as (file, _):
+            _, records = _filtered_records(file, tags, self.parser_backend, element_filter)
+            return DiffStats._from_records(records)
+
+    def _download(self, sequence_number: str) -> bytes | int:
+        """Downloads whole compressed diff file. Returns response status code if the server did not return the file."""
+        response = requests.get(self._get_url(sequence_number), headers=self._headers)
+        if response.status_code != 200: return response.status_code
+        return response.content
+
+    def get_range(self, start_sequence_number: str, end_sequence_number: str, tags: TagFilter | Tags | str = Tags(), max_workers: int = 8, on_missing: Callable[[str, int | requests.RequestException], None] | None = None, element_filter: ElementFilter | None = None) -> Generator[Meta | tuple[Action, Node | Way | Relation], None, None]:
+        """Downloads diffs from start_sequence_number to end_sequence_number (both inclusive) using a pool of threads and parses them in sequence order.
+
+        Args:
+            start_sequence_number (str): First sequence number to download.
+            end_sequence_number (str): Last sequence number to download.
+            tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
+            max_workers (int, optional): Maximum number of simultaneous downloads. Defaults to 8.
+            on_missing (Callable[[str, int | requests.RequestException], None] | None, optional): Called with sequence number and response status code for every diff the server did not return (for example 404) or with the exception if downloading failed (for example connection error or timeout). Such diffs are skipped and other diffs are still downloaded. Defaults to None.
+            element_filter (ElementFilter | None, optional): Filter of element types and attributes. Elements not matching it are skipped before any object is created. Defaults to None.
+
+        Raises:
+            ValueError: Wrong sequence numbers or max_workers, or the server did not return a diff and on_missing is None.
+            requests.RequestException: Downloading of a diff failed and on_missing is None. Pending downloads are cancelled.
+
+        Yields:
+            Generator[Meta | tuple[Action, Node | Way | Relation], None, None]: For every downloaded diff Meta namedtuple first and then its elements.
+        """
+        start, end = int(start_sequence_number), int(end_sequence_number)
+        if start > end: raise ValueError(f"[ERROR::DIFF::GET_RANGE] start_sequence_number ({start}) is greater than end_sequence_number ({end}).")
+        if max_workers < 1: raise ValueError("[ERROR::DIFF::GET_RANGE] max_workers must be greater than 0.")
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending: deque = deque()
+        next_sequence_number = start
+        try:
+            while next_sequence_number <= end or pending:
+                # Keep only a limited number of downloaded diffs in memory.
+                while next_sequence_number <= end and len(pending) < max_workers * 2:
+                    sequence_number = str(next_sequence_number)
+                    pending.append((sequence_number, executor.submit(self._download, sequence_number)))
+                    next_sequence_number += 1
+
+                sequence_number, future = pending.popleft()
+                try:
+                    content = future.result()
+                except requests.RequestException as e:
+                    if not on_missing: raise # pending downloads are cancelled in finally
+                    on_missing(sequence_number, e)
+                    continue
+                if isinstance(content, int):
+                    if not on_missing: raise ValueError(f"[ERROR::DIFF::GET_RANGE] API RESPONSE STATUS CODE: {content} (sequence number {sequence_number})")
+                    on_missing(sequence_number, content)
+                    continue
+                yield from _OsmChange_parser_generator(gzip.GzipFile(fileobj=io.BytesIO(content)), sequence_number, tags, self.parser_backend, element_filter, self.lazy_elements, self.compact_elements)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_parallel(self, sequence_numbers: Iterable[str] | None = None, files_from: Iterable[str] | None = None, tags: TagFilter | Tags | str = Tags(), max_workers: int | None = None, on_missing: Callable[[str, int | requests.RequestException], None] | None = None, element_filter: ElementFilter | None = None) -> Generator[Meta | tuple[Action, Node | Way | Relation], None, None]:
+        """Parses many diffs using a pool of processes and yields their elements in the given order. Useful for reprocessing large number of diffs, because parsing is not limited by the GIL.
+
+        Worker processes return parsed data of whole diff at once and osm objects are created in the calling process.
+
+        Args:
+            sequence_numbers (Iterable[str] | None, optional): Sequence numbers of diffs to download and parse. Defaults to None.
+            files_from (Iterable[str] | None, optional): Paths to .osc.gz files to parse. Used if sequence_numbers is None. Meta of such diffs has empty sequence_number. Defaults to None.
+            tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
+            max_workers (int | None, optional): Number of worker processes (and simultaneous downloads). Defaults to None (number of processors).
+            on_missing (Callable[[str, int | requests.RequestException], None] | None, optional): Called with sequence number and response status code for every diff the server did not return (for example 404) or with the exception if downloading failed (for example connection error or timeout). Such diffs are skipped and other diffs are still parsed. Defaults to None.
+            element_filter (ElementFilter | None, optional): Filter of element types and attributes. Elements not matching it are skipped in worker processes. Defaults to None.
+
+        Raises:
+            ValueError: Neither sequence_numbers nor files_from provided, wrong max_workers, or the server did not return a diff and on_missing is None. Pending tasks are cancelled.
+            requests.RequestException: Downloading of a diff failed and on_missing is None. Pending tasks are cancelled.
+
+        Yields:
+            Generator[Meta | tuple[Action, Node | Way | Relation], None, None]: For every diff Meta namedtuple first and then its elements.
+        """
+        if sequence_numbers is None and files_from is None: raise ValueError("[ERROR::DIFF::GET_PARALLEL] sequence_numbers or files_from must be provided.")
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers < 1: raise ValueError("[ERROR::DIFF::GET_PARALLEL] max_workers must be greater than 0.")
+
+        processes = ProcessPoolExecutor(max_workers=max_workers)
+        threads = ThreadPoolExecutor(max_workers=max_workers) if sequence_numbers is not None else None
+
+        def download_and_parse(sequence_number: str) -> _ParsedDiff | int:
+            content = self._download(sequence_number)
+            if isinstance(content, int): return content
+            return processes.submit(_parse_records, content, tags, self.parser_backend, element_filter).result()
+
+        def submit(source: str) -> Future[_ParsedDiff | int]:
+            if threads: return threads.submit(download_and_parse, source)
+            return processes.submit(_parse_records, source, tags, self.parser_backend, element_filter)
+
+        sources = iter(sequence_numbers if sequence_numbers is not None else files_from) # type: ignore
+        pending: deque[tuple[str, Future[_ParsedDiff | int]]] = deque()
+        try:
+            for source in sources:
+                pending.append((source, submit(source)))
+                # Keep only a limited number of parsed diffs in memory.
+                if len(pending) < max_workers * 2: continue
+                source, future = pending.popleft()
+                yield from self._parallel_result(source, future, threads is not None, on_missing)
+            while pending:
+                source, future = pending.popleft()
+                yield from self._parallel_result(source, future, threads is not None, on_missing)
+        finally:
+            if threads: threads.shutdown(wait=False, cancel_futures=True)
+            processes.shutdown(wait=False, cancel_futures=True)
+
+    def _parallel_result(self, source: str, future: Future[_ParsedDiff | int], is_sequence_number: bool, on_missing: Callable[[str, int | requests.RequestException], None] | None) -> Generator[Meta | tuple[Action, Node | Way | Relation], None, None]:
+        """Creates elements from result of get_parallel() worker."""
+        try:
+            result = future.result()
+        except requests.RequestException as e:
+            if not on_missing: raise # pending tasks are cancelled in get_parallel()
+            on_missing(source, e)
+            return
+        if isinstance(result, int):
+            if not on_missing: raise ValueError(f"[ERROR::DIFF::GET_PARALLEL] API RESPONSE STATUS CODE: {result} (sequence number {source})") # pending tasks are cancelled in get_parallel()
+            on_missing(source, result)
+            return
+        root_attrib, records = result
+        yield from _records_to_generator(root_attrib, records, source if is_sequence_number else None, self.lazy_elements, self.compact_elements)
+
+    def follow(self, state_path: str, tags: TagFilter | Tags | str = Tags(), poll_delay: float = 10.0, element_filter: ElementFilter | None = None) -> Generator[Meta | tuple[Action, Node | Way | Relation], None, None]:
+        """Endless generator with elements of every new diff. Last fully consumed sequence number is saved to state_path file, so the next call will continue where the previous one stopped.
+
+        After processing all available diffs it waits until the next diff should be published (state.txt timestamp + frequency) and poll_delay seconds more. If the server does not return a diff or state.txt or downloading fails, the download is retried every poll_delay seconds.
+
+        Args:
+            state_path (str): Path to file with last consumed sequence number. If the file does not exist, following starts from the newest diff.
+            tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
+            poll_delay (float, optional): Additional seconds to wait before asking the server for a new diff. Defaults to 10.0.
+            element_filter (ElementFilter | None, optional): Filter of element types and attributes. Elements not matching it are skipped before any object is created. Defaults to None.
+
+        Yields:
+            Generator[Meta | tuple[Action, Node | Way | Relation], None, None]: For every diff Meta namedtuple first and then its elements.
+        """
+        for sequence_number, gen in self._followed_diffs(state_path, tags, poll_delay, element_filter):
+            yield from gen
+            atomic_write(state_path, sequence_number)
+
+    def follow_to_sink(self, sink: Sink, state_path: str, tags: TagFilter | Tags | str = Tags(), poll_delay: float = 10.0, element_filter: ElementFilter | None = None, batch_size: int = 10000) -> None:
+        """Endless loop which writes elements of every new diff to sink. Sequence number is saved to state_path file only after the sink acknowledged the whole diff (`Sink.flush()`), so after a crash the diff is delivered again (at-least-once delivery). Every delivery starts with `Sink.begin()`. Failed downloads are retried every poll_delay seconds like in `follow()`.
+
+        Args:
+            sink (Sink): Sink to write to.
+            state_path (str): Path to file with last delivered sequence number. If the file does not exist, following starts from the newest diff.
+            tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
+            poll_delay (float, optional): Additional seconds to wait before asking the server for a new diff. Defaults to 10.0.
+            element_filter (ElementFilter | None, optional): Filter of element types and attributes. Defaults to None.
+            batch_size (int, optional): Maximum number of elements passed to `Sink.write()` at once. Defaults to 10000.
+        """
+        for sequence_number, gen in self._followed_diffs(state_path, tags, poll_delay, element_filter):
+            next(gen) # Meta
+            sink.begin(sequence_number)
+            batch: list[tuple[Action, Node | Way | Relation]] = []
+            for item in cast(Generator[tuple[Action, Node | Way | Relation], None, None], gen):
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    sink.write(sequence_number, batch)
+                    batch = []
+            if batch: sink.write(sequence_number, batch)
+            sink.flush(sequence_number)
+            atomic_write(state_path, sequence_number)
+
+    def _followed_diffs(self, state_path: str, tags: TagFilter | Tags | str, poll_delay: float, element_filter: ElementFilter | None) -> Generator[tuple[str, Generator[Meta | tuple[Action, Node | Way | Relation], None, None]], None, None]:
+        """Endless generator of new sequence numbers with parsers of their diffs (Meta first and then elements)."""
+        for sequence_number in self._new_sequence_numbers(state_path, poll_delay):
+            content = self._download_when_available(sequence_number, poll_delay)
+            yield sequence_number, _OsmChange_parser_generator(gzip.GzipFile(fileobj=io.BytesIO(content)), sequence_number, tags, self.parser_backend, element_filter, self.lazy_elements, self.compact_elements)
+
+    def _download_when_available(self, sequence_number: str, poll_delay: float) -> bytes:
+        """Downloads diff retrying every poll_delay seconds if the server did not return it (for example just announced diff is not published yet) or downloading failed."""
+        while True:
+            try:
+                content = self._download(sequence_number)
+                if not isinstance(content, int): return content
+            except requests.RequestException: pass
+            time.sleep(poll_delay)
+
+    def _new_sequence_numbers(self, state_path: str, poll_delay: float) -> Generator[str, None, None]:
+        """Endless generator of sequence numbers after the one saved in state_path file. Waits for new diffs, failed download of state.txt is retried every poll_delay seconds. Saving the state file is left to the caller."""
+        last_sequence_number = None
+        if os.path.exists(state_path):
+            with open(state_path) as f: last_sequence_number = int(f.read())
 
-        response = requests.get(url, stream=True, headers=self._headers)
+        while True:
+            try:
+                state = self.get_state()
+            except (requests.RequestException, ValueError): # for example 503 or connection error
+                time.sleep(poll_delay)
+                continue
+            newest_sequence_number = state.sequence_number
+            if last_sequence_number is None: last_sequence_number = newest_sequence_number - 1
 
-        file = gzip.GzipFile(fileobj=response.raw)
+            while last_sequence_number < newest_sequence_number:
+                last_sequence_number += 1
+                yield str(last_sequence_number)
 
-        if file_to:
-            write_gzip_to_file(file, file_to)
-            with gzip.open(file_to, "r") as f:
-                return self._return_generator_or_OsmChange(f, tags, sequence_number, generator)
-                
-        return self._return_generator_or_OsmChange(file, tags, sequence_number, generator)
\ No newline at end of file
+            next_diff_at = state.timestamp + frequency_to_timedelta(self.frequency)
+            time.sleep(max((next_diff_at - datetime.now(timezone.utc)).total_seconds(), 0) + poll_delay)
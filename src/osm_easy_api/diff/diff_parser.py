@@ -1,89 +1,93 @@
-from xml.etree import ElementTree
-from typing import Generator, cast, TYPE_CHECKING
-if TYPE_CHECKING:
-    import gzip
+import gzip
+import io
+from typing import Generator, Iterator, cast
 
 from ..data_classes import Node, Way, Relation, OsmChange, Action, Tags
 from ..data_classes.OsmChange import Meta
-from ..utils import element_to_osm_object
+from ..utils import record_to_osm_object
+from .parser_backends import ParserBackend, STRING_TO_ACTION, _records, _Record, _Readable
+from .filters import TagFilter, ElementFilter, _to_tag_filter
 
-STRING_TO_ACTION = {
-    "create": Action.CREATE,
-    "modify": Action.MODIFY,
-    "delete": Action.DELETE
-}
-
-def _is_correct(element: ElementTree.Element, tags: Tags | str) -> bool:
-    """Checks if provided element has all required tags.
-
-    Args:
-        element (ElementTree.Element): Element to look tags in.
-        tags (Tags | str): Required tags or required tag key.
-
-    Returns:
-        bool: True if element has required tags. False otherwise.
-    """
-    if not tags: return True
-
-    if type(tags) == str:
-        for tag in element:
-            if tag.tag != "tag": continue
-            if tag.attrib["k"] == tags: return True
-        return False
-    elif type(tags) == Tags:
-        matching_tags_counter = 0
-        for tag in element:
-            if tag.tag != "tag": continue
-            if tag.attrib["k"] in tags and tag.attrib["v"] == tags[tag.attrib["k"]]:
-                matching_tags_counter += 1
-        return matching_tags_counter == len(tags)
-    
-    assert False, ValueError("[ERROR::DIFF_PARSER::_IS_CORRECT] Unexpected return.") # pragma: no cover
-
-def _OsmChange_parser_generator(file: "gzip.GzipFile", sequence_number: str | None, required_tags: Tags | str = Tags()) -> Generator[tuple[Action, Node | Way | Relation] | Meta, None, None]:
+def _OsmChange_parser_generator(file: _Readable, sequence_number: str | None, required_tags: TagFilter | Tags | str = Tags(), backend: ParserBackend = ParserBackend.ETREE, element_filter: ElementFilter | None = None, lazy: bool = False, compact: bool = False) -> Generator[tuple[Action, Node | Way | Relation] | Meta, None, None]:
     """Generator with elements in diff file. First yield will be Meta namedtuple.
 
     Args:
-        file (gzip.GzipFile): File (stream) to parse.
+        file (_Readable): Decompressed file (stream) to parse.
         sequence_number (str): Sequence number for Meta namedtuple.
-        required_tags (Tags | str, optional): Useful if you want to prefetch specific tags. Other tags will be ignored.
+        required_tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
+        backend (ParserBackend, optional): XML parser to use. Defaults to ParserBackend.ETREE.
+        element_filter (ElementFilter | None, optional): Elements not matching the filter are skipped before their tags are read. Defaults to None.
+        lazy (bool, optional): Create elements which decode their attributes and tags on the first access. Defaults to False.
+        compact (bool, optional): Create `__slots__` based elements (see `osm_easy_api.data_classes.compact`). Defaults to False.
 
     Yields:
         Generator[tuple[Action, Node | Way | Relation] | Meta, None, None]: First yield will be Meta namedtuple with data about diff. Next yields will be osm data classes.
     """
-    action: Action = Action.NONE
     try:
-        file.seek(0)
+        file.seek(0) # type: ignore
     except: pass
-    iterator = ElementTree.iterparse(file, events=['start'])
-    _, root = next(iterator)
-    yield Meta(version=root.attrib["version"], generator=root.attrib["generator"], sequence_number=sequence_number or "")
-    for event, element in iterator:
-        if element.tag in ("modify", "create", "delete"): 
-            action = STRING_TO_ACTION.get(element.tag, Action.NONE)
-        elif element.tag in ("node", "way", "relation") and _is_correct(element, required_tags):
-            osmObject = element_to_osm_object(element)
-            yield(action, osmObject)
-        element.clear()
+    tag_filter = _to_tag_filter(required_tags)
+    root_attrib, records = _records(file, backend, element_filter._accept() if element_filter else None)
+    if element_filter: records = element_filter._filter_records(records)
+    yield Meta(version=root_attrib["version"], generator=root_attrib["generator"], sequence_number=sequence_number or "")
+    for action, tag, attrib, tags, refs, members in records:
+        if tag_filter is None or tag_filter._match(tags):
+            # Compact elements are used in place of Node, Way and Relation.
+            yield (action, cast(Node | Way | Relation, record_to_osm_object(tag, attrib, tags, refs, members, lazy, compact)))
 
-def _OsmChange_parser(file: "gzip.GzipFile", sequence_number: str | None, required_tags: Tags | str = Tags()) -> OsmChange:
+def _OsmChange_parser(file: _Readable, sequence_number: str | None, required_tags: TagFilter | Tags | str = Tags(), backend: ParserBackend = ParserBackend.ETREE, element_filter: ElementFilter | None = None, lazy: bool = False, compact: bool = False) -> OsmChange:
     """Creates OsmChange object from generator.
 
     Args:
-        file (gzip.GzipFile): File (stream) to parse.
+        file (_Readable): Decompressed file (stream) to parse.
         sequence_number (str): Sequence number for Meta in osmChange object.
-        required_tags (Tags | str, optional): Useful if you want to prefetch specific tags. Other tags will be ignored.
+        required_tags (TagFilter | Tags | str, optional): Useful if you want to prefetch specific tags. Other elements will be ignored.
+        backend (ParserBackend, optional): XML parser to use. Defaults to ParserBackend.ETREE.
+        element_filter (ElementFilter | None, optional): Elements not matching the filter are skipped before their tags are read. Defaults to None.
+        lazy (bool, optional): Create elements which decode their attributes and tags on the first access. Defaults to False.
+        compact (bool, optional): Create `__slots__` based elements (see `osm_easy_api.data_classes.compact`). Defaults to False.
 
     Returns:
         OsmChange: osmChange object.
     """
-    gen = _OsmChange_parser_generator(file, sequence_number, required_tags)
+    gen = _OsmChange_parser_generator(file, sequence_number, required_tags, backend, element_filter, lazy, compact)
     # FIXME: Maybe OsmChange_parser_generator should return tuple(Meta, gen)? EDIT: I think Meta should be generated somewhere else
     meta = next(gen)
     assert isinstance(meta, Meta), "[ERROR::DIFF_PARSER::OSMCHANGE_PARSER] meta type is not equal to Meta." # pragma: no cover
     osmChange = OsmChange(meta.version, meta.generator, meta.sequence_number)
-    for action, element in gen: # type: ignore (Next gen elements must be proper tuple type.)
-        element = cast(Node | Way | Relation, element)
-        action = cast(Action, action)
+    for action, element in cast(Generator[tuple[Action, Node | Way | Relation], None, None], gen):
         osmChange.add(element, action)
     return osmChange
+
+
+def _filtered_records(file: _Readable, required_tags: TagFilter | Tags | str = Tags(), backend: ParserBackend = ParserBackend.ETREE, element_filter: ElementFilter | None = None) -> tuple[dict[str, str], Iterator[_Record]]:
+    """Returns root element attributes and iterator of records of elements matching both filters."""
+    tag_filter = _to_tag_filter(required_tags)
+    root_attrib, records = _records(file, backend, element_filter._accept() if element_filter else None)
+    if element_filter: records = element_filter._filter_records(records)
+    if tag_filter: records = (record for record in records if tag_filter._match(record[3]))
+    return root_attrib, records
+
+_ParsedDiff = tuple[dict[str, str], list[_Record]]
+
+def _parse_records(source: bytes | str, required_tags: TagFilter | Tags | str = Tags(), backend: ParserBackend = ParserBackend.ETREE, element_filter: ElementFilter | None = None) -> _ParsedDiff:
+    """Parses whole compressed diff. Used in worker processes, so it returns records which are much cheaper to pickle than osm objects.
+
+    Args:
+        source (bytes | str): Compressed diff or path to .osc.gz file.
+        required_tags (TagFilter | Tags | str, optional): Elements without required tags are skipped.
+        backend (ParserBackend, optional): XML parser to use. Defaults to ParserBackend.ETREE.
+        element_filter (ElementFilter | None, optional): Elements not matching the filter are skipped. Defaults to None.
+
+    Returns:
+        _ParsedDiff: Root element attributes and records of elements.
+    """
+    with gzip.open(io.BytesIO(source) if isinstance(source, bytes) else source, "rb") as file:
+        root_attrib, records = _filtered_records(file, required_tags, backend, element_filter)
+        return root_attrib, list(records)
+
+def _records_to_generator(root_attrib: dict[str, str], records: list[_Record], sequence_number: str | None, lazy: bool = False, compact: bool = False) -> Generator[tuple[Action, Node | Way | Relation] | Meta, None, None]:
+    """Generator with Meta namedtuple and elements created from records returned by _parse_records()."""
+    yield Meta(version=root_attrib["version"], generator=root_attrib["generator"], sequence_number=sequence_number or "")
+    for action, tag, attrib, tags, refs, members in records:
+        yield (action, cast(Node | Way | Relation, record_to_osm_object(tag, attrib, tags, refs, members, lazy, compact)))
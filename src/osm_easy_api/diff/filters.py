@@ -0,0 +1,309 @@
+"""Filters used to skip elements during parsing, before any osm object is created."""
+import re
+from datetime import datetime, timezone
+from typing import Generator, Iterable, Iterator, Sequence
+
+from ..data_classes import Tags, Node, Way, Relation
+from ..utils import points_in_polygon
+from ..utils.points_in_polygon import _import_numpy
+from .parser_backends import _Record, _Accept
+
+_SPATIAL_BATCH_SIZE = 4096
+
+_MISSING = object()
+
+class TagFilter():
+    """Compiled filter of element tags. Create it with `TagFilter.has()` or `TagFilter.regex()` and combine with `&` (and), `|` (or) and `~` (not).
+
+    Example:
+        ```py
+        TagFilter.has("building") & ~TagFilter.has("building", "no")
+        TagFilter.has("highway", {"primary", "secondary"}) | TagFilter.has("addr:*")
+        TagFilter.regex("name", "^Saint ")
+        ```
+
+    Simple conditions joined with `|` or `&` are merged into a single dictionary, so checking an element costs one dictionary lookup per element tag.
+    """
+    @staticmethod
+    def has(key: str, value: str | Iterable[str] | None = None) -> "TagFilter":
+        """Element has tag with given key.
+
+        Args:
+            key (str): Tag key. Key ending with `*` matches all keys starting with given prefix (for example `addr:*`).
+            value (str | Iterable[str] | None, optional): Required value or set of allowed values. Defaults to None (any value).
+
+        Returns:
+            TagFilter: Filter.
+        """
+        values = None if value is None else frozenset((value,) if isinstance(value, str) else value)
+        if key.endswith("*"): return _Prefix(key[:-1], values)
+        return _KeyValues({key: values}, require_all=False)
+
+    @staticmethod
+    def regex(key: str, value: str | None = None) -> "TagFilter":
+        """Element has tag which key and value match regular expressions (`re.search`).
+
+        Args:
+            key (str): Regular expression for key.
+            value (str | None, optional): Regular expression for value. Defaults to None (any value).
+
+        Returns:
+            TagFilter: Filter.
+        """
+        return _Regex(re.compile(key), re.compile(value) if value is not None else None)
+
+    def match(self, tags: Tags | dict[str, str]) -> bool:
+        """Checks if tags match the filter.
+
+        Args:
+            tags (Tags | dict[str, str]): Tags of element.
+
+        Returns:
+            bool: True if tags match the filter. False otherwise.
+        """
+        return self._match(list(tags.items()))
+
+    def _match(self, tags: list[tuple[str, str]]) -> bool:
+        raise NotImplementedError # pragma: no cover
+
+    def __and__(self, other: "TagFilter") -> "TagFilter":
+        return _And._compile([self, other])
+
+    def __or__(self, other: "TagFilter") -> "TagFilter":
+        return _Or._compile([self, other])
+
+    def __invert__(self) -> "TagFilter":
+        if isinstance(self, _Not): return self.filter
+        return _Not(self)
+
+class _KeyValues(TagFilter):
+    def __init__(self, index: dict[str, frozenset[str] | None], require_all: bool):
+        """
+        Args:
+            index (dict[str, frozenset[str] | None]): Key -> allowed values (None means any value).
+            require_all (bool): All keys from index must match. Otherwise one is enough.
+        """
+        self.index = index
+        self.require_all = require_all
+
+    def _match(self, tags: list[tuple[str, str]]) -> bool:
+        index = self.index
+        matched = 0
+        for k, v in tags:
+            values = index.get(k, _MISSING)
+            if values is _MISSING: continue
+            if values is None or v in values: # type: ignore
+                if not self.require_all: return True
+                matched += 1
+        return self.require_all and matched == len(index)
+
+class _Prefix(TagFilter):
+    def __init__(self, prefix: str, values: frozenset[str] | None):
+        self.prefix = prefix
+        self.values = values
+
+    def _match(self, tags: list[tuple[str, str]]) -> bool:
+        for k, v in tags:
+            if k.startswith(self.prefix) and (self.values is None or v in self.values): return True
+        return False
+
+class _Regex(TagFilter):
+    def __init__(self, key: re.Pattern, value: re.Pattern | None):
+        self.key = key
+        self.value = value
+
+    def _match(self, tags: list[tuple[str, str]]) -> bool:
+        for k, v in tags:
+            if self.key.search(k) and (self.value is None or self.value.search(v)): return True
+        return False
+
+class _Not(TagFilter):
+    def __init__(self, filter: TagFilter):
+        self.filter = filter
+
+    def _match(self, tags: list[tuple[str, str]]) -> bool:
+        return not self.filter._match(tags)
+
+class _And(TagFilter):
+    def __init__(self, filters: list[TagFilter]):
+        self.filters = filters
+
+    @staticmethod
+    def _compile(filters: list[TagFilter]) -> TagFilter:
+        """Flattens nested filters and merges simple conditions with different keys into one dictionary."""
+        flat: list[TagFilter] = []
+        for filter in filters:
+            flat.extend(filter.filters if isinstance(filter, _And) else [filter])
+        index: dict[str, frozenset[str] | None] = {}
+        rest: list[TagFilter] = []
+        for filter in flat:
+            if isinstance(filter, _KeyValues) and (filter.require_all or len(filter.index) == 1) and not index.keys() & filter.index.keys():
+                index.update(filter.index)
+            else: rest.append(filter)
+        if index: rest.insert(0, _KeyValues(index, require_all=True))
+        return rest[0] if len(rest) == 1 else _And(rest)
+
+    def _match(self, tags: list[tuple[str, str]]) -> bool:
+        for filter in self.filters:
+            if not filter._match(tags): return False
+        return True
+
+class _Or(TagFilter):
+    def __init__(self, filters: list[TagFilter]):
+        self.filters = filters
+
+    @staticmethod
+    def _compile(filters: list[TagFilter]) -> TagFilter:
+        """Flattens nested filters and merges simple conditions into one dictionary."""
+        flat: list[TagFilter] = []
+        for filter in filters:
+            flat.extend(filter.filters if isinstance(filter, _Or) else [filter])
+        index: dict[str, frozenset[str] | None] = {}
+        rest: list[TagFilter] = []
+        for filter in flat:
+            if isinstance(filter, _KeyValues) and (not filter.require_all or len(filter.index) == 1):
+                for key, values in filter.index.items():
+                    if key in index:
+                        old_values = index[key]
+                        values = None if old_values is None or values is None else old_values | values
+                    index[key] = values
+            else: rest.append(filter)
+        if index: rest.insert(0, _KeyValues(index, require_all=False))
+        return rest[0] if len(rest) == 1 else _Or(rest)
+
+    def _match(self, tags: list[tuple[str, str]]) -> bool:
+        for filter in self.filters:
+            if filter._match(tags): return True
+        return False
+
+def _to_tag_filter(tags: TagFilter | Tags | str) -> TagFilter | None:
+    """Converts tags argument to filter. None means that all elements are accepted.
+
+    Args:
+        tags (TagFilter | Tags | str): Filter, required tags or required tag key.
+
+    Returns:
+        TagFilter | None: Filter.
+    """
+    if isinstance(tags, TagFilter): return tags
+    if not tags: return None
+    if isinstance(tags, str): return TagFilter.has(tags)
+    return _KeyValues({k: frozenset((v,)) for k, v in tags.items()}, require_all=True)
+
+class ElementFilter():
+    """Filter of element type and attributes. It is checked on raw xml attributes, before tags are read and any object is created.
+
+    With bbox or polygon only nodes inside the area are accepted, together with ways and relations which reference elements in the area seen earlier in the same stream. Ways and relations referencing only nodes not changed in the diff are not detected. Nodes without coordinates (some deleted nodes) are rejected. Type and attribute conditions are then checked only on elements to return, so for example `types=[Way]` returns ways referencing nodes in the area.
+    """
+    def __init__(self, types: Iterable[type[Node | Way | Relation]] | None = None, changeset_ids: Iterable[int] | None = None, user_ids: Iterable[int] | None = None, min_version: int | None = None, max_version: int | None = None, since: datetime | str | None = None, until: datetime | str | None = None, bbox: tuple[float, float, float, float] | None = None, polygon: Sequence[tuple[float, float]] | None = None):
+        """
+        Args:
+            types (Iterable[type[Node | Way | Relation]] | None, optional): Accepted element types. Defaults to None (all types).
+            changeset_ids (Iterable[int] | None, optional): Accepted changeset ids. Defaults to None (all changesets).
+            user_ids (Iterable[int] | None, optional): Accepted user ids. Defaults to None (all users).
+            min_version (int | None, optional): Minimal element version (inclusive). Defaults to None.
+            max_version (int | None, optional): Maximal element version (inclusive). Defaults to None.
+            since (datetime | str | None, optional): Minimal element timestamp (inclusive). Naive datetime is treated as UTC. String must be in osm format (`2022-11-12T12:08:55Z`). Defaults to None.
+            until (datetime | str | None, optional): Maximal element timestamp (exclusive). Same format as since. Defaults to None.
+            bbox (tuple[float, float, float, float] | None, optional): Area as (left, bottom, right, top). Defaults to None.
+            polygon (Sequence[tuple[float, float]] | None, optional): Area as polygon vertices (longitude, latitude). Can be used together with bbox. Defaults to None.
+        """
+        self.types = frozenset(type.__name__.lower() for type in types) if types is not None else None
+        # Ids are compared as strings, so attributes do not have to be converted to int.
+        self.changeset_ids = frozenset(str(id) for id in changeset_ids) if changeset_ids is not None else None
+        self.user_ids = frozenset(str(id) for id in user_ids) if user_ids is not None else None
+        self.min_version = min_version
+        self.max_version = max_version
+        self.since = self._timestamp_to_str(since)
+        self.until = self._timestamp_to_str(until)
+        self.polygon = list(polygon) if polygon is not None else None
+        if polygon is not None:
+            longitudes, latitudes = [point[0] for point in polygon], [point[1] for point in polygon]
+            polygon_bbox = (min(longitudes), min(latitudes), max(longitudes), max(latitudes))
+            if bbox is not None: polygon_bbox = (max(bbox[0], polygon_bbox[0]), max(bbox[1], polygon_bbox[1]), min(bbox[2], polygon_bbox[2]), min(bbox[3], polygon_bbox[3]))
+            bbox = polygon_bbox
+        self.bbox = bbox
+
+    @staticmethod
+    def _timestamp_to_str(timestamp: datetime | str | None) -> str | None:
+        """Osm timestamps have fixed format, so they can be compared as strings."""
+        if not isinstance(timestamp, datetime): return timestamp
+        if timestamp.tzinfo: timestamp = timestamp.astimezone(timezone.utc)
+        return timestamp.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def match(self, tag: str, attrib: dict[str, str]) -> bool:
+        """Checks if element matches the filter.
+
+        Args:
+            tag (str): Element xml tag (`node`, `way` or `relation`).
+            attrib (dict[str, str]): Element xml attributes.
+
+        Returns:
+            bool: True if element matches the filter. False otherwise.
+        """
+        if self.types is not None and tag not in self.types: return False
+        if self.changeset_ids is not None and attrib.get("changeset") not in self.changeset_ids: return False
+        if self.user_ids is not None and attrib.get("uid", "-1") not in self.user_ids: return False
+        if self.min_version is not None or self.max_version is not None:
+            version = int(attrib["version"])
+            if self.min_version is not None and version < self.min_version: return False
+            if self.max_version is not None and version > self.max_version: return False
+        if self.since is not None and attrib["timestamp"] < self.since: return False
+        if self.until is not None and attrib["timestamp"] >= self.until: return False
+        return True
+
+    def _accept(self) -> _Accept | None:
+        """Check passed to the parser. With area set all elements are needed to find ways and relations in the area, so nothing is skipped during parsing."""
+        return self.match if self.bbox is None else None
+
+    def _filter_records(self, records: Iterator[_Record]) -> Iterator[_Record]:
+        """Applies area filter to parsed records. Returns records unchanged if no area is set."""
+        if self.bbox is None: return records
+        return self._spatial_records(records)
+
+    def _spatial_records(self, records: Iterator[_Record]) -> Generator[_Record, None, None]:
+        # Ids of accepted elements. Ids are not converted to int, because refs and members are strings too.
+        matched: dict[str, set[str]] = {"node": set(), "way": set(), "relation": set()}
+        batch: list[_Record] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= _SPATIAL_BATCH_SIZE:
+                yield from self._spatial_batch(batch, matched)
+                batch = []
+        yield from self._spatial_batch(batch, matched)
+
+    def _spatial_batch(self, batch: list[_Record], matched: dict[str, set[str]]) -> Generator[_Record, None, None]:
+        """Checks coordinates of all nodes in batch at once and yields accepted records in original order."""
+        coordinates = [(attrib["lon"], attrib["lat"]) for _, tag, attrib, _, _, _ in batch if tag == "node" and "lat" in attrib and "lon" in attrib]
+        inside = iter(self._in_area([coordinate[0] for coordinate in coordinates], [coordinate[1] for coordinate in coordinates]))
+        nodes = matched["node"]
+        for record in batch:
+            _, tag, attrib, _, refs, members = record
+            match tag:
+                case "node":
+                    if "lat" not in attrib or "lon" not in attrib or not next(inside): continue
+                case "way":
+                    if nodes.isdisjoint(refs): continue
+                case "relation":
+                    if not any(ref in matched[member_type] for member_type, ref, _ in members): continue
+            matched[tag].add(attrib["id"])
+            if self.match(tag, attrib): yield record
+
+    def _in_area(self, longitudes: list[str], latitudes: list[str]) -> list[bool]:
+        left, bottom, right, top = self.bbox # type: ignore
+        numpy = _import_numpy()
+        if numpy is not None:
+            x = numpy.asarray(longitudes, dtype=numpy.float64)
+            y = numpy.asarray(latitudes, dtype=numpy.float64)
+            mask = (x >= left) & (x <= right) & (y >= bottom) & (y <= top)
+            if self.polygon is not None:
+                in_bbox = numpy.flatnonzero(mask)
+                mask[in_bbox] = points_in_polygon(x[in_bbox], y[in_bbox], self.polygon)
+            return mask.tolist()
+
+        result = []
+        for longitude, latitude in zip(map(float, longitudes), map(float, latitudes)):
+            inside = left <= longitude <= right and bottom <= latitude <= top
+            if inside and self.polygon is not None: inside = points_in_polygon([longitude], [latitude], self.polygon)[0]
+            result.append(inside)
+        return result
@@ -0,0 +1,145 @@
+"""XML parsers used for osmChange and osm files (diffs, `changeset.download()`, `misc.get_map_in_bbox()`).
+
+Every backend turns the file into a generator which first yields attributes of the root element
+and then a record for every node, way and relation: `(action, tag, attrib, tags, refs, members)`, where
+`tags` is a list of `(key, value)` (interned with `osm_easy_api.data_classes.tags.intern_string()`), `refs` is a list of way node ids and `members` is a list of `(type, ref, role)`.
+No `xml.etree.ElementTree.Element` tree is kept in memory.
+
+Backends accept optional `accept(tag, attrib)` predicate. Elements rejected by it are skipped before their children are read.
+"""
+from enum import Enum
+from typing import Callable, Generator, Iterator, Protocol, cast
+from xml.etree import ElementTree
+from xml.parsers import expat
+
+from ..data_classes import Action
+from ..data_classes.tags import intern_string
+
+class ParserBackend(Enum):
+    """XML parser used to parse data.
+
+    - `ETREE`: `xml.etree.ElementTree.iterparse`. Default.
+    - `EXPAT`: callbacks of `xml.parsers.expat` without creating intermediate elements. The fastest one.
+    - `LXML`: `lxml.etree.iterparse`. Requires `lxml` package.
+    """
+    ETREE = 0
+    EXPAT = 1
+    LXML = 2
+
+STRING_TO_ACTION = {
+    "create": Action.CREATE,
+    "modify": Action.MODIFY,
+    "delete": Action.DELETE
+}
+
+_Record = tuple[Action, str, dict[str, str], list[tuple[str, str]], list[str], list[tuple[str, str, str]]]
+
+_Accept = Callable[[str, dict[str, str]], bool]
+
+class _Readable(Protocol):
+    """Decompressed binary stream accepted by backends (for example `gzip.GzipFile`, `PipelinedGzipReader` or raw http response)."""
+    def read(self, size: int = -1, /) -> bytes: ...
+
+_READ_SIZE = 64 * 1024
+
+def _tree_records(iterator: Iterator, copy_attrib: bool, accept: _Accept | None) -> Generator[dict[str, str] | _Record, None, None]:
+    """Records from iterparse-like iterator with ("start", "end") events."""
+    action: Action = Action.NONE
+    _, root = next(iterator)
+    yield dict(root.attrib)
+    # Elements are read on "end" event (when all children are known) and then detached from their parent,
+    # so the tree never holds more than currently parsed element.
+    parents = [root]
+    for event, element in iterator:
+        if event == "start":
+            if element.tag in ("modify", "create", "delete"): 
+                action = STRING_TO_ACTION.get(element.tag, Action.NONE)
+            parents.append(element)
+            continue
+
+        parents.pop()
+        if not parents: break # root element
+        parent = parents[-1]
+        # Only direct children of root and action elements are detached. Tags, nodes and members are removed together with their element.
+        if parent is not root and parent.tag not in ("modify", "create", "delete"): continue
+
+        if element.tag in ("node", "way", "relation") and (accept is None or accept(element.tag, element.attrib)):
+            tags, refs, members = [], [], []
+            for child in element:
+                child_attrib = child.attrib
+                match child.tag:
+                    case "tag":     tags.append((intern_string(child_attrib["k"]), intern_string(child_attrib["v"])))
+                    case "nd":      refs.append(child_attrib["ref"])
+                    case "member":  members.append((child_attrib["type"], child_attrib["ref"], child_attrib["role"]))
+            yield (action, element.tag, dict(element.attrib) if copy_attrib else element.attrib, tags, refs, members)
+        parent.remove(element)
+
+def _etree_records(file: _Readable, accept: _Accept | None = None) -> Generator[dict[str, str] | _Record, None, None]:
+    return _tree_records(ElementTree.iterparse(file, events=("start", "end")), False, accept)
+
+def _import_lxml_etree():
+    try:
+        from lxml import etree
+    except ImportError as e: # pragma: no cover
+        raise ImportError("ParserBackend.LXML requires lxml package. Install it with `pip install lxml`.") from e
+    return etree
+
+def _lxml_records(file: _Readable, accept: _Accept | None = None) -> Generator[dict[str, str] | _Record, None, None]:
+    etree = _import_lxml_etree()
+    # lxml attributes are bound to the element, so they are copied to plain dictionaries.
+    return _tree_records(etree.iterparse(file, events=("start", "end")), True, accept)
+
+def _expat_records(file: _Readable, accept: _Accept | None = None) -> Generator[dict[str, str] | _Record, None, None]:
+    parser = expat.ParserCreate()
+    ready: list[dict[str, str] | _Record] = []
+    action: Action = Action.NONE
+    record: _Record | None = None
+    skipped: str | None = None # tag of rejected element which children are ignored
+    root_found = False
+
+    def start_element(name: str, attrib: dict[str, str]):
+        nonlocal action, record, skipped, root_found
+        if skipped is not None: return
+        if record is not None:
+            match name:
+                case "tag":     record[3].append((intern_string(attrib["k"]), intern_string(attrib["v"])))
+                case "nd":      record[4].append(attrib["ref"])
+                case "member":  record[5].append((attrib["type"], attrib["ref"], attrib["role"]))
+        elif name in ("node", "way", "relation"):
+            if accept is None or accept(name, attrib): record = (action, name, attrib, [], [], [])
+            else: skipped = name
+        elif name in ("modify", "create", "delete"):
+            action = STRING_TO_ACTION.get(name, Action.NONE)
+        elif not root_found:
+            root_found = True
+            ready.append(attrib)
+
+    def end_element(name: str):
+        nonlocal record, skipped
+        if skipped is not None:
+            if name == skipped: skipped = None
+        elif record is not None and name == record[1]:
+            ready.append(record)
+            record = None
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+
+    while True:
+        data = file.read(_READ_SIZE)
+        parser.Parse(data, not data)
+        yield from ready
+        ready.clear()
+        if not data: break
+
+_BACKENDS: dict[ParserBackend, Callable[[_Readable, _Accept | None], Generator[dict[str, str] | _Record, None, None]]] = {
+    ParserBackend.ETREE: _etree_records,
+    ParserBackend.EXPAT: _expat_records,
+    ParserBackend.LXML: _lxml_records,
+}
+
+def _records(file: _Readable, backend: ParserBackend = ParserBackend.ETREE, accept: _Accept | None = None) -> tuple[dict[str, str], Iterator[_Record]]:
+    """Returns root element attributes and iterator of records of nodes, ways and relations accepted by accept predicate."""
+    records = _BACKENDS[backend](file, accept)
+    # Backends yield root attributes only first.
+    return cast(dict[str, str], next(records)), cast(Iterator[_Record], records)
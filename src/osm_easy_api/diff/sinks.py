@@ -0,0 +1,126 @@
+"""Sinks for `Diff.follow_to_sink()`. Every sink must be idempotent, because after a crash the last not acknowledged diff is written again."""
+import json
+import os
+import sqlite3
+from typing import Callable, TextIO
+
+from ..data_classes import Node, Way, Relation, Action
+from ..data_classes.compact import _FULL_TYPES
+
+class Sink():
+    """Base class of sinks. For every delivery of a diff `begin()` is called, then `write()` with batches of elements and then `flush()`. Diff is acknowledged when `flush()` returns."""
+    def begin(self, sequence_number: str) -> None:
+        """Starts delivery of the diff. Called before the first batch, also when the diff is delivered again after a failed delivery, so not acknowledged elements must be discarded here.
+
+        Args:
+            sequence_number (str): Sequence number of the diff.
+        """
+        pass
+
+    def write(self, sequence_number: str, batch: list[tuple[Action, Node | Way | Relation]]) -> None:
+        """Writes batch of elements.
+
+        Args:
+            sequence_number (str): Sequence number of the diff the elements come from.
+            batch (list[tuple[Action, Node | Way | Relation]]): Elements.
+        """
+        raise NotImplementedError # pragma: no cover
+
+    def flush(self, sequence_number: str) -> None:
+        """Makes all elements of the diff durable. Called after the last batch of the diff.
+
+        Args:
+            sequence_number (str): Sequence number of the diff.
+        """
+        pass
+
+    def close(self) -> None:
+        pass
+
+class CallbackSink(Sink):
+    """Passes every batch to a function."""
+    def __init__(self, callback: Callable[[str, list[tuple[Action, Node | Way | Relation]]], None], flush_callback: Callable[[str], None] | None = None):
+        """
+        Args:
+            callback (Callable[[str, list[tuple[Action, Node | Way | Relation]]], None]): Called with sequence number and batch of elements.
+            flush_callback (Callable[[str], None] | None, optional): Called with sequence number after the last batch of the diff. Defaults to None.
+        """
+        self.callback = callback
+        self.flush_callback = flush_callback
+
+    def write(self, sequence_number: str, batch: list[tuple[Action, Node | Way | Relation]]) -> None:
+        self.callback(sequence_number, batch)
+
+    def flush(self, sequence_number: str) -> None:
+        if self.flush_callback: self.flush_callback(sequence_number)
+
+class JsonLinesSink(Sink):
+    """Writes every diff to `<sequence_number>.jsonl` file in directory. Every line is `{"sequence_number": ..., "action": ..., "element": element.to_dict()}`. File is renamed to its final name in `flush()`, so written again diff replaces the old file."""
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Path to directory for files. It is created if it does not exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._file: TextIO | None = None
+        self._sequence_number: str | None = None # of the open file
+
+    def _path(self, sequence_number: str) -> str:
+        return os.path.join(self.directory, f"{sequence_number}.jsonl")
+
+    def _open(self, sequence_number: str) -> TextIO:
+        """Returns temporary file of the diff. It is truncated if it is not open yet or the open file belongs to another diff."""
+        if self._file is None or self._sequence_number != sequence_number:
+            self.close()
+            self._file = open(self._path(sequence_number) + ".tmp", "w", encoding="utf-8")
+            self._sequence_number = sequence_number
+        return self._file
+
+    def begin(self, sequence_number: str) -> None:
+        # Lines of the failed delivery are still in the open file.
+        self.close()
+        self._open(sequence_number)
+
+    def write(self, sequence_number: str, batch: list[tuple[Action, Node | Way | Relation]]) -> None:
+        file = self._open(sequence_number)
+        for action, element in batch:
+            file.write(json.dumps({"sequence_number": sequence_number, "action": action.name.lower(), "element": element.to_dict()}) + "\n")
+
+    def flush(self, sequence_number: str) -> None:
+        file = self._open(sequence_number)
+        file.flush()
+        os.fsync(file.fileno())
+        self.close()
+        os.replace(self._path(sequence_number) + ".tmp", self._path(sequence_number))
+
+    def close(self) -> None:
+        if self._file: self._file.close()
+        self._file = None
+        self._sequence_number = None
+
+class SQLiteSink(Sink):
+    """Writes elements to `elements` table of SQLite database: (type, id, version, action, sequence_number, data) with primary key (type, id, version). `data` is json of `element.to_dict()`. Elements of one diff are committed in one transaction in `flush()`, written again elements replace the old rows."""
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path to database file.
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS elements (type TEXT NOT NULL, id INTEGER NOT NULL, version INTEGER, action TEXT NOT NULL, sequence_number INTEGER NOT NULL, data TEXT NOT NULL, PRIMARY KEY (type, id, version))")
+        self.connection.commit()
+
+    def begin(self, sequence_number: str) -> None:
+        self.connection.rollback()
+
+    def write(self, sequence_number: str, batch: list[tuple[Action, Node | Way | Relation]]) -> None:
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO elements VALUES (?, ?, ?, ?, ?, ?)",
+            ((_FULL_TYPES.get(type(element), type(element)).__name__.lower(), element.id, element.version, action.name.lower(), int(sequence_number), json.dumps(element.to_dict())) for action, element in batch)
+        )
+
+    def flush(self, sequence_number: str) -> None:
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
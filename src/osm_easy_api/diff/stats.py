@@ -0,0 +1,70 @@
+"""Aggregates of diffs computed without creating osm objects."""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from ..data_classes import Node, Way, Relation, Action
+from .parser_backends import _Record
+
+_TYPES: dict[str, type[Node | Way | Relation]] = {"node": Node, "way": Way, "relation": Relation}
+
+@dataclass
+class DiffStats():
+    """Aggregates of one or many diffs. Stats of many diffs can be combined with `+` or `update()`.
+
+    Example:
+        ```py
+        stats = diff.stats("5315422") + diff.stats("5315423")
+        stats.elements[(Node, Action.MODIFY)]
+        stats.tag_keys.most_common(10)
+        ```
+    """
+    elements: Counter[tuple[type[Node | Way | Relation], Action]] = field(default_factory=Counter)
+    """Number of elements of every type and action."""
+    changesets: Counter[int] = field(default_factory=Counter)
+    """Number of elements in every changeset."""
+    users: Counter[int] = field(default_factory=Counter)
+    """Number of elements of every user id (-1 if unknown)."""
+    tag_keys: Counter[str] = field(default_factory=Counter)
+    """Number of elements with every tag key."""
+    min_timestamp: str | None = None
+    max_timestamp: str | None = None
+
+    @classmethod
+    def _from_records(cls, records: Iterable[_Record]) -> "DiffStats":
+        # Values are collected in lists and counted at once, which is much faster than updating counters for every element.
+        elements, changesets, users, tag_keys, timestamps = [], [], [], [], []
+        for action, tag, attrib, tags, refs, members in records:
+            elements.append((tag, action))
+            changesets.append(attrib["changeset"])
+            users.append(attrib.get("uid", "-1"))
+            timestamps.append(attrib["timestamp"])
+            for k, _ in tags: tag_keys.append(k)
+
+        return cls(
+            Counter({(_TYPES[tag], action): count for (tag, action), count in Counter(elements).items()}),
+            Counter({int(changeset): count for changeset, count in Counter(changesets).items()}),
+            Counter({int(user): count for user, count in Counter(users).items()}),
+            Counter(tag_keys),
+            min(timestamps, default=None),
+            max(timestamps, default=None)
+        )
+
+    def update(self, other: "DiffStats") -> None:
+        """Adds other stats to these stats.
+
+        Args:
+            other (DiffStats): Stats to add.
+        """
+        self.elements.update(other.elements)
+        self.changesets.update(other.changesets)
+        self.users.update(other.users)
+        self.tag_keys.update(other.tag_keys)
+        if other.min_timestamp and (self.min_timestamp is None or other.min_timestamp < self.min_timestamp): self.min_timestamp = other.min_timestamp
+        if other.max_timestamp and (self.max_timestamp is None or other.max_timestamp > self.max_timestamp): self.max_timestamp = other.max_timestamp
+
+    def __add__(self, other: "DiffStats") -> "DiffStats":
+        result = DiffStats()
+        result.update(self)
+        result.update(other)
+        return result
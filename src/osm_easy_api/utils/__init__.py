@@ -1,3 +1,8 @@
 from .join_url import join_url
 from .write_gzip_to_file import write_gzip_to_file
-from .element_to_osm_object import element_to_osm_object
\ No newline at end of file
+from .element_to_osm_object import element_to_osm_object, record_to_osm_object
+from .atomic_write import atomic_write
+from .tee_reader import TeeReader
+from .pipelined_gzip_reader import PipelinedGzipReader
+from .fixed_point import coordinate_to_fixed, fixed_to_coordinate
+from .points_in_polygon import points_in_polygon
\ No newline at end of file
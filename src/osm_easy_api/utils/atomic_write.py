@@ -0,0 +1,15 @@
+import os
+
+def atomic_write(path: str, text: str):
+    """Writes text to file. The file always contains either old or new content, even if the process is killed while writing.
+
+    Args:
+        path (str): Path to file to write to.
+        text (str): Content of the file.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
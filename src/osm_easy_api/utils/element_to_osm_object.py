@@ -1,10 +1,19 @@
 from osm_easy_api.data_classes import Node, Way, Relation
+from osm_easy_api.data_classes.compact import CompactNode, CompactWay, CompactRelation
 
-from typing import TYPE_CHECKING
+from typing import Literal, TYPE_CHECKING, overload
 if TYPE_CHECKING:
     from xml.etree.ElementTree import Element
 
-def element_to_osm_object(element: 'Element') -> Node | Way | Relation:
+@overload
+def element_to_osm_object(element: 'Element', compact: Literal[False] = False) -> Node | Way | Relation: ...
+@overload
+def element_to_osm_object(element: 'Element', compact: Literal[True]) -> CompactNode | CompactWay | CompactRelation: ...
+@overload
+def element_to_osm_object(element: 'Element', compact: bool = False) -> Node | Way | Relation | CompactNode | CompactWay | CompactRelation: ...
+def element_to_osm_object(element: 'Element', compact: bool = False) -> Node | Way | Relation | CompactNode | CompactWay | CompactRelation:
+    if compact:
+        return record_to_osm_object(element.tag, element.attrib, list(Node._tags_from_xml(element)), [nd.attrib["ref"] for nd in element.iter("nd")], [(member.attrib["type"], member.attrib["ref"], member.attrib["role"]) for member in element.iter("member")], compact=True)
     match element.tag:
         case "node":
             return Node._from_xml(element)
@@ -12,4 +21,31 @@ def element_to_osm_object(element: 'Element') -> Node | Way | Relation:
             return Way._from_xml(element)
         case "relation":
             return Relation._from_xml(element)
-        case _: assert False, f"[ERROR::DIFF_PARSER::_ELEMENT_TO_OSM_OBJECT] Unknown element tag: {element.tag}" # pragma: no cover
\ No newline at end of file
+        case _: assert False, f"[ERROR::DIFF_PARSER::_ELEMENT_TO_OSM_OBJECT] Unknown element tag: {element.tag}" # pragma: no cover
+
+@overload
+def record_to_osm_object(tag: str, attrib: dict[str, str], tags: list[tuple[str, str]], refs: list[str], members: list[tuple[str, str, str]], lazy: bool = False, compact: Literal[False] = False) -> Node | Way | Relation: ...
+@overload
+def record_to_osm_object(tag: str, attrib: dict[str, str], tags: list[tuple[str, str]], refs: list[str], members: list[tuple[str, str, str]], lazy: bool = False, *, compact: Literal[True]) -> CompactNode | CompactWay | CompactRelation: ...
+@overload
+def record_to_osm_object(tag: str, attrib: dict[str, str], tags: list[tuple[str, str]], refs: list[str], members: list[tuple[str, str, str]], lazy: bool = False, compact: bool = False) -> Node | Way | Relation | CompactNode | CompactWay | CompactRelation: ...
+def record_to_osm_object(tag: str, attrib: dict[str, str], tags: list[tuple[str, str]], refs: list[str], members: list[tuple[str, str, str]], lazy: bool = False, compact: bool = False) -> Node | Way | Relation | CompactNode | CompactWay | CompactRelation:
+    """Creates osm object from already parsed element data (see `osm_easy_api.diff.parser_backends`). Lazy object decodes its fields on the first access. Compact object uses `__slots__` (see `osm_easy_api.data_classes.compact`)."""
+    if compact:
+        match tag:
+            case "node":        return CompactNode._from_attrib(attrib, tags)
+            case "way":         return CompactWay._from_attrib(attrib, tags, refs)
+            case "relation":    return CompactRelation._from_attrib(attrib, tags, members)
+    if lazy:
+        match tag:
+            case "node":        return Node._lazy_from_attrib(attrib, tags)
+            case "way":         return Way._lazy_from_attrib(attrib, tags, refs)
+            case "relation":    return Relation._lazy_from_attrib(attrib, tags, members)
+    match tag:
+        case "node":
+            return Node._from_attrib(attrib, tags)
+        case "way": 
+            return Way._from_attrib(attrib, tags, refs)
+        case "relation":
+            return Relation._from_attrib(attrib, tags, members)
+        case _: assert False, f"[ERROR::DIFF_PARSER::_RECORD_TO_OSM_OBJECT] Unknown element tag: {tag}" # pragma: no cover
@@ -0,0 +1,2 @@
+# Implementation is in data_classes, so node coordinates can use it without circular import.
+from ..data_classes.fixed_point import coordinate_to_fixed, fixed_to_coordinate
@@ -0,0 +1,82 @@
+import queue
+import threading
+import zlib
+from typing import BinaryIO
+
+def _inflate(stream: BinaryIO, chunk_size: int, chunks: queue.Queue, stop: threading.Event):
+    """Background thread of PipelinedGzipReader. Puts decompressed chunks, then b"" (end of stream) or exception to chunks queue."""
+    def put(item: bytes | BaseException):
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return
+            except queue.Full: pass
+
+    try:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        in_member = False
+        while not stop.is_set():
+            data = stream.read(chunk_size)
+            if not data: break
+            # Stream can contain many gzip members, one after another.
+            while data:
+                in_member = True
+                inflated = decompressor.decompress(data)
+                if inflated: put(inflated)
+                data = b""
+                if decompressor.eof:
+                    data = decompressor.unused_data
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    in_member = False
+        if in_member: raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+        put(b"")
+    except BaseException as e:
+        put(e)
+
+class PipelinedGzipReader():
+    """File-like object with decompressed content of gzip stream. Stream is read and decompressed in a background thread (both release the GIL), so downloading and decompression overlap with parsing of already decompressed data."""
+    def __init__(self, stream: BinaryIO, chunk_size: int = 256 * 1024, max_chunks: int = 8):
+        """
+        Args:
+            stream (BinaryIO): Gzip compressed stream (for example raw http response).
+            chunk_size (int, optional): Number of compressed bytes read at once. Defaults to 256 * 1024.
+            max_chunks (int, optional): Maximum number of decompressed chunks waiting for reading. Defaults to 8.
+        """
+        self._chunks: queue.Queue = queue.Queue(max_chunks)
+        self._stop = threading.Event()
+        self._buffer = b""
+        self._position = 0
+        self._eof = False
+        # Thread does not reference self, so not exhausted reader can be garbage collected and then stops the thread.
+        threading.Thread(target=_inflate, args=(stream, chunk_size, self._chunks, self._stop), daemon=True).start()
+
+    def _next_chunk(self) -> bytes:
+        if self._eof: return b""
+        chunk = self._chunks.get()
+        if isinstance(chunk, BaseException):
+            self._eof = True
+            raise chunk
+        if not chunk: self._eof = True
+        return chunk
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            parts = [self._buffer[self._position:]]
+            while chunk := self._next_chunk(): parts.append(chunk)
+            self._buffer, self._position = b"", 0
+            return b"".join(parts)
+
+        while self._position >= len(self._buffer):
+            chunk = self._next_chunk()
+            if not chunk: return b""
+            self._buffer, self._position = chunk, 0
+        data = self._buffer[self._position:self._position + size]
+        self._position += len(data)
+        return data
+
+    def close(self):
+        """Stops the background thread."""
+        self._stop.set()
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,39 @@
+from typing import Sequence
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError: # pragma: no cover
+        return None
+    return numpy
+
+def points_in_polygon(longitudes: Sequence[float], latitudes: Sequence[float], polygon: Sequence[tuple[float, float]]) -> list[bool]:
+    """Checks which points are inside polygon (even-odd rule). If numpy is installed, all points are checked at once for every polygon edge.
+
+    Args:
+        longitudes (Sequence[float]): Longitudes of points.
+        latitudes (Sequence[float]): Latitudes of points.
+        polygon (Sequence[tuple[float, float]]): Polygon vertices as (longitude, latitude). Polygon does not have to be closed.
+
+    Returns:
+        list[bool]: True for every point inside polygon.
+    """
+    edges = list(zip(polygon, [*polygon[1:], polygon[0]]))
+    numpy = _import_numpy()
+    if numpy is not None:
+        x = numpy.asarray(longitudes, dtype=numpy.float64)
+        y = numpy.asarray(latitudes, dtype=numpy.float64)
+        inside = numpy.zeros(len(x), dtype=bool)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            for (x1, y1), (x2, y2) in edges:
+                crosses = (y1 > y) != (y2 > y)
+                inside ^= crosses & (x < (x2 - x1) * (y - y1) / (y2 - y1) + x1)
+        return inside.tolist()
+
+    result = []
+    for x, y in zip(longitudes, latitudes):
+        inside = False
+        for (x1, y1), (x2, y2) in edges:
+            if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1: inside = not inside
+        result.append(inside)
+    return result
@@ -0,0 +1,30 @@
+import os
+from typing import BinaryIO
+
+class TeeReader():
+    """File-like object which writes all bytes read from stream to file. File is closed when the stream is exhausted."""
+    def __init__(self, stream: BinaryIO, file_to: str):
+        """
+        Args:
+            stream (BinaryIO): Stream to read from (for example raw http response).
+            file_to (str): Path to file to write to.
+        """
+        self._stream = stream
+        self._file = open(file_to, "wb")
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        if data: self._file.write(data)
+        else: self._file.close()
+        return data
+
+    def close(self):
+        """Writes rest of the stream to file and closes it."""
+        while not self._file.closed:
+            self.read(128 * 1024)
+
+    def abort(self):
+        """Closes and removes the file if the stream is not exhausted yet, so no partial file is left. Complete file is kept."""
+        if self._file.closed: return
+        self._file.close()
+        os.remove(self._file.name)
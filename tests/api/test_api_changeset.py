@@ -7,6 +7,7 @@ from ..fixtures.default_variables import TOKEN
 from osm_easy_api.api import Api
 from osm_easy_api.data_classes import Changeset, Tags, Node, OsmChange, Action
 from osm_easy_api.api import exceptions as ApiExceptions
+from osm_easy_api.diff import TagFilter
 from ..fixtures import sample_dataclasses 
 from ..fixtures.stubs import changeset_stub 
 
@@ -188,6 +189,9 @@ class TestApiChangeset(unittest.TestCase):
 
         self.assertIsInstance(second_node, Node)
 
+        elements = list(self.API.changeset.download(111, TagFilter.has("testkey", "secondnode")))
+        self.assertEqual(len(elements), 1)
+        self.assertEqual(elements[0][0], Action.MODIFY)
 
         responses.add(**{
             "method": responses.GET,
@@ -3,6 +3,7 @@ import responses
 
 from osm_easy_api.api import Api
 from osm_easy_api.api import exceptions as ApiExceptions
+from osm_easy_api.diff import ParserBackend, TagFilter
 
 class TestApi(unittest.TestCase):
     api = Api("https://test.pl")
@@ -134,6 +135,15 @@ class TestApiMisc(unittest.TestCase):
 
         gen = self.api.misc.get_map_in_bbox(111, 222, 333, 444)
         self.assertEqual(next(gen).id, 209148101)
+        next(gen)
+        self.assertEqual(len(next(gen).tags), 5)
+
+        elements = list(Api("https://test.pl", parser_backend=ParserBackend.EXPAT).misc.get_map_in_bbox(111, 222, 333, 444))
+        self.assertEqual(len(elements), 5)
+        self.assertEqual(len(elements[2].tags), 5)
+
+        elements = list(self.api.misc.get_map_in_bbox(111, 222, 333, 444, tags=TagFilter.has("highway", "crossing")))
+        self.assertEqual([element.id for element in elements], [209148176])
 
         responses.add(**{
             "method": responses.GET,
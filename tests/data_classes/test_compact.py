@@ -0,0 +1,85 @@
+import unittest
+import copy
+import pickle
+import gzip
+import os
+
+from osm_easy_api.data_classes import Node, Way, Relation, Tags, OsmChange, Action
+from osm_easy_api.data_classes.relation import Member
+from osm_easy_api.data_classes.compact import CompactNode, CompactWay, CompactRelation, EMPTY_TAGS
+from osm_easy_api.diff.diff_parser import _OsmChange_parser
+from osm_easy_api.diff import Diff, Frequency
+from osm_easy_api.utils import record_to_osm_object
+
+class TestCompact(unittest.TestCase):
+    def test_slots(self):
+        node = CompactNode(id=1, latitude="1.5", longitude="2.5")
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.not_existing = 1 # type: ignore
+
+    def test_empty_tags_sentinel(self):
+        first = CompactNode(id=1)
+        second = CompactWay(id=2)
+        self.assertIs(first.tags, EMPTY_TAGS)
+        self.assertIs(second.tags, EMPTY_TAGS)
+        self.assertEqual(first.tags, {})
+        with self.assertRaises(TypeError): first.tags.add("building", "yes")
+        with self.assertRaises(TypeError): first.tags["building"] = "yes"
+        with self.assertRaises(TypeError): first.tags.update({"building": "yes"})
+        self.assertEqual(EMPTY_TAGS, {})
+        self.assertIs(copy.deepcopy(EMPTY_TAGS), EMPTY_TAGS)
+        self.assertIs(pickle.loads(pickle.dumps(first)).tags, EMPTY_TAGS)
+
+        first.tags = Tags({"building": "yes"})
+        self.assertEqual(first.tags, {"building": "yes"})
+        self.assertEqual(second.tags, {})
+
+    def test_record_to_osm_object(self):
+        attrib = {"id": "5", "version": "2", "changeset": "7", "timestamp": "2023-01-01T00:00:00Z", "uid": "3", "lat": "50.1", "lon": "20.2"}
+        node = record_to_osm_object("node", attrib, [("amenity", "bench")], [], [], compact=True)
+        self.assertIsInstance(node, CompactNode)
+        self.assertEqual(node.to_full(), Node(5, None, 2, 7, "2023-01-01T00:00:00Z", 3, Tags({"amenity": "bench"}), "50.1", "20.2"))
+
+        way = record_to_osm_object("way", attrib, [], ["1", "2"], [], compact=True)
+        self.assertIs(way.tags, EMPTY_TAGS)
+        self.assertEqual([node.id for node in way.nodes], [1, 2])
+        self.assertEqual(way.to_full().nodes, [Node(1), Node(2)])
+
+        relation = record_to_osm_object("relation", attrib, [], [], [("node", "1", "stop"), ("way", "2", ""), ("relation", "3", "sub")], compact=True)
+        self.assertEqual([type(member.element) for member in relation.members], [CompactNode, CompactWay, CompactRelation])
+        self.assertEqual(relation.to_full().members, [Member(Node(1), "stop"), Member(Way(2), ""), Member(Relation(3), "sub")])
+        self.assertEqual(relation.to_dict(), relation.to_full().to_dict())
+
+    def test_parser_same_as_normal(self):
+        file_path = os.path.join("tests", "fixtures", "hour.xml.gz")
+        normal = _OsmChange_parser(gzip.open(file_path, "r"), "-1")
+        compact = _OsmChange_parser(gzip.open(file_path, "r"), "-1", compact=True)
+        for element_type in (Node, Way, Relation):
+            for action in Action:
+                elements = compact.get(element_type, action)
+                self.assertEqual([element.to_full() for element in elements], normal.get(element_type, action))
+
+    def test_osmChange(self):
+        osmChange = OsmChange("0.6", "test", "-1")
+        node = CompactNode(latitude="1.5", longitude="2.5")
+        way = CompactWay(tags=Tags({"highway": "path"}), nodes=[node, CompactNode(id=10, version=1, latitude="1", longitude="2")])
+        osmChange.add(way, Action.CREATE)
+        osmChange.add(node, Action.CREATE)
+        self.assertEqual(osmChange.get(Way, Action.CREATE), [way])
+        self.assertEqual(osmChange.get(CompactNode, Action.CREATE), [node])
+
+        full = OsmChange("0.6", "test", "-1")
+        full_node = node.to_full()
+        full_way = way.to_full()
+        full_way.nodes[0] = full_node
+        full.add(full_way, Action.CREATE)
+        full.add(full_node, Action.CREATE)
+        self.assertEqual(osmChange.to_xml(), full.to_xml())
+
+        osmChange.remove(node, Action.CREATE)
+        self.assertEqual(osmChange.get(Node, Action.CREATE), [])
+
+    def test_diff_argument(self):
+        with self.assertRaises(ValueError):
+            Diff(Frequency.MINUTE, lazy_elements=True, compact_elements=True)
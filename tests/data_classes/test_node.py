@@ -1,6 +1,7 @@
 import unittest
 
 from osm_easy_api.data_classes import Node, Tags
+from osm_easy_api.utils import coordinate_to_fixed
 from ..fixtures import sample_dataclasses
 
 class TestNode(unittest.TestCase):
@@ -76,4 +77,47 @@ class TestNode(unittest.TestCase):
 
         def from_type_dict():
             return Node.from_dict({"type": "changeset"})
-        self.assertRaises(ValueError, from_type_dict)
\ No newline at end of file
+        self.assertRaises(ValueError, from_type_dict)
+
+    def test_fixed_point_coordinates(self):
+        for coordinate in ("53.3814725", "-6.5778065", "27.0864870", "50", "-0.5", "180.0000000"):
+            node = Node(latitude=coordinate, longitude=coordinate)
+            self.assertEqual(node.latitude, coordinate)
+            self.assertIsInstance(node._latitude, int)
+            self.assertEqual(node._to_xml(1).getAttribute("lat"), coordinate)
+            self.assertEqual(node.to_dict()["longitude"], coordinate)
+        self.assertEqual(Node(latitude="27.0864870").latitude_e7, 270864870)
+        self.assertEqual(Node(longitude="-6.5").longitude_e7, -65000000)
+
+        # Not canonical values are stored as they are.
+        for coordinate in ("-0.0", "50.12345678", "+1", "007.5", "None", None):
+            node = Node(latitude=coordinate)
+            self.assertEqual(node.latitude, coordinate)
+        self.assertIsNone(Node(latitude="None").latitude_e7)
+        self.assertIsNone(Node(latitude=None).latitude_e7)
+
+        # The same conversion as coordinate_to_fixed().
+        for coordinate in ("53.3814725", "-6.5778065", "-0.0000001", "-0.0", "50.12345678", "-50.12345675", "+1", "007.5", "1.", "-180"):
+            node = Node(latitude=coordinate, longitude=coordinate)
+            self.assertEqual(node.latitude_e7, coordinate_to_fixed(coordinate))
+            self.assertEqual(node.longitude_e7, coordinate_to_fixed(coordinate))
+
+        node = Node()
+        node.latitude_e7 = 501234500
+        node.longitude_e7 = -15
+        self.assertEqual(node.latitude, "50.1234500")
+        self.assertEqual(node.longitude, "-0.0000015")
+
+    def test_fixed_point_parsed(self):
+        # Parsers pack coordinates without validation, the result must be the same.
+        for coordinate in ("53.3814725", "-6.5778065", "27.0864870", "50", "-0.5", "-0.0000001", "180.0000000", "-0.0", "50.12345678"):
+            node = Node._from_attrib({"id": "1", "version": "1", "changeset": "2", "timestamp": "2022-11-11T21:15:26Z", "lat": coordinate, "lon": coordinate})
+            self.assertEqual(node._latitude, Node(latitude=coordinate)._latitude)
+            self.assertEqual(node.longitude, coordinate)
+        self.assertIsNone(Node._from_attrib({"id": "1", "version": "1", "changeset": "2", "timestamp": "2022-11-11T21:15:26Z"}).latitude_e7)
+
+    def test_fixed_point_lazy(self):
+        node = Node._lazy_from_attrib({"id": "1", "version": "1", "changeset": "2", "timestamp": "2022-11-11T21:15:26Z", "lat": "50.10", "lon": "20.2"})
+        self.assertEqual(node.latitude_e7, 501000000)
+        self.assertEqual(node.latitude, "50.10")
+        self.assertEqual(node, Node(1, None, 1, 2, "2022-11-11T21:15:26Z", -1, Tags(), "50.10", "20.2"))
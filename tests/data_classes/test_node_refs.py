@@ -0,0 +1,69 @@
+import unittest
+import copy
+from array import array
+
+from osm_easy_api.data_classes import Node, Way, NodeRefs
+
+class TestNodeRefs(unittest.TestCase):
+    def test_from_ids(self):
+        refs = NodeRefs.from_ids(["1", "2", "3"])
+        self.assertEqual(len(refs), 3)
+        self.assertEqual(refs.ids, array("q", [1, 2, 3]))
+        self.assertIsNone(refs._nodes)
+        self.assertEqual(refs, [Node(id=1), Node(id=2), Node(id=3)])
+        self.assertIsNone(refs._nodes) # Comparing doesn't create stored nodes.
+
+    def test_access_keeps_identity(self):
+        refs = NodeRefs.from_ids([1, 2])
+        self.assertIs(refs[0], refs[0])
+        refs[1].id = 5
+        self.assertEqual(refs.ids, array("q", [1, 5]))
+        self.assertEqual(refs[-1].id, 5)
+
+    def test_list_operations(self):
+        refs = NodeRefs.from_ids([1, 2, 3])
+        new = Node(latitude="1", longitude="2")
+        refs.append(new)
+        refs.insert(0, Node(id=10))
+        refs.append_id(4)
+        self.assertEqual([node.id for node in refs], [10, 1, 2, 3, None, 4])
+        self.assertIs(refs[4], new)
+        del refs[1]
+        refs[0] = Node(id=11)
+        self.assertEqual([node.id for node in refs], [11, 2, 3, None, 4])
+        self.assertEqual([node.id for node in refs[1:3]], [2, 3])
+        refs.remove(new)
+        self.assertEqual(refs.ids, array("q", [11, 2, 3, 4]))
+        refs.reverse()
+        self.assertEqual(refs.ids, array("q", [4, 3, 2, 11]))
+        refs.clear()
+        self.assertEqual(len(refs), 0)
+
+        with self.assertRaises(ValueError):
+            NodeRefs([Node()]).ids
+
+    def test_resolver(self):
+        lookup = {1: Node(id=1, latitude="1", longitude="2")}
+        refs = NodeRefs.from_ids([1, 2], resolver=lookup.get)
+        self.assertIs(refs[0], lookup[1])
+        self.assertEqual(refs[1], Node(id=2))
+
+        copied = copy.deepcopy(refs)
+        self.assertIs(copied.resolver, refs.resolver)
+        self.assertIs(copied[0], lookup[1])
+
+    def test_copy(self):
+        refs = NodeRefs.from_ids([1, 2])
+        refs[0].version = 3
+        copied = copy.copy(refs)
+        copied.append_id(5)
+        self.assertEqual(len(refs), 2)
+        self.assertIs(copied[0], refs[0])
+        self.assertIsNot(copy.deepcopy(refs)[0], refs[0])
+
+    def test_way(self):
+        way = Way(id=1, nodes=[Node(id=1), Node(id=2)])
+        self.assertIsInstance(way.nodes, NodeRefs)
+        self.assertEqual(way, Way(id=1, nodes=NodeRefs.from_ids([1, 2])))
+        self.assertIsInstance(Way().nodes, NodeRefs)
+        self.assertEqual(Way.from_dict(way.to_dict()), way)
@@ -1,7 +1,9 @@
 import unittest
+from unittest import mock
 import os
 
 from osm_easy_api.data_classes import Node, Way, OsmChange, Action, Tags, Relation
+from osm_easy_api.data_classes.relation import Member
 from ..fixtures import sample_dataclasses
 
 class TestOsmChange(unittest.TestCase):
@@ -56,6 +58,89 @@ class TestOsmChange(unittest.TestCase):
         osmChange.remove(way_one)
         self.assertEqual(osmChange.get(Way), [])
 
+    def test_find_contains_replace(self):
+        osmChange = OsmChange("0.1", "unittest", "123")
+        created = Node(id=1, version=1)
+        modified = Node(id=1, version=2)
+        way = Way(id=1)
+        osmChange.add(created, Action.CREATE)
+        osmChange.add(modified, Action.MODIFY)
+        osmChange.add(way, Action.DELETE)
+
+        self.assertIs(osmChange.find(Node, 1), modified)
+        self.assertIs(osmChange.find(Node, 1, Action.CREATE), created)
+        self.assertIs(osmChange.find(Way, 1), way)
+        self.assertIsNone(osmChange.find(Relation, 1))
+        self.assertTrue(osmChange.contains(Node, 1, Action.MODIFY))
+        self.assertFalse(osmChange.contains(Node, 1, Action.DELETE))
+        self.assertFalse(osmChange.contains(Node, 2))
+
+        new = Node(id=2, version=3)
+        osmChange.replace(modified, new)
+        self.assertEqual(osmChange.get(Node, Action.MODIFY), [new])
+        self.assertIs(osmChange.find(Node, 1), created)
+        self.assertRaises(ValueError, osmChange.replace, modified, new)
+        self.assertRaises(ValueError, osmChange.replace, new, Way(id=2))
+
+        osmChange.remove(created, Action.CREATE)
+        self.assertFalse(osmChange.contains(Node, 1))
+        self.assertIsInstance(osmChange.get(Node, Action.MODIFY), list)
+
+        # The previous element with the same id is found after the last one is removed.
+        first, second = Node(id=5, version=1), Node(id=5, version=2)
+        osmChange.add(first, Action.CREATE)
+        osmChange.add(second, Action.CREATE)
+        self.assertIs(osmChange.find(Node, 5), second)
+        osmChange.remove(second, Action.CREATE)
+        self.assertIs(osmChange.find(Node, 5), first)
+
+        # Changed id is found after replace(element, element).
+        first.id = 6
+        self.assertIsNone(osmChange.find(Node, 5))
+        osmChange.replace(first, first)
+        self.assertIs(osmChange.find(Node, 6, Action.CREATE), first)
+
+    def test_make_osmChange_valid_shared_elements(self):
+        osmChange = OsmChange("0.1", "unittest", "123")
+        shared = Node(latitude="1", longitude="2")
+        created = Node(id=-5, latitude="3", longitude="4")
+        osmChange.add(created, Action.CREATE)
+        osmChange.add(Way(nodes=[shared, created, Node(id=7)]), Action.CREATE)
+        osmChange.add(Way(id=3, version=2, nodes=[shared]), Action.MODIFY)
+        sub_relation = Relation(members=[Member(Node(), "inner")])
+        osmChange.add(Relation(members=[Member(created, "a"), Member(sub_relation, "b")]), Action.CREATE)
+        OsmChange._make_osmChange_valid(osmChange)
+
+        nodes = osmChange.get(Node, Action.CREATE)
+        self.assertEqual(len(nodes), 3) # created, node of sub relation, shared
+        self.assertEqual(len({node.id for node in nodes}), 3)
+        self.assertTrue(all(node.id < 0 for node in nodes))
+        self.assertIs(osmChange.find(Node, shared.id), shared)
+        self.assertIs(osmChange.find(Node, created.id), created)
+        self.assertEqual(osmChange.get(Relation, Action.CREATE)[-1], sub_relation)
+        self.assertLess(sub_relation.id, 0)
+
+    def test_make_osmChange_valid_scaling(self):
+        # Time is measured in benchmarks/make_osmChange_valid.py. Here: elements are never compared and every element gets new id only once.
+        nodes_count = 1000
+        osmChange = OsmChange("0.1", "unittest", "123")
+        nodes = [Node(latitude="1", longitude="2") for _ in range(nodes_count)]
+        for i in range(0, len(nodes), 10): osmChange.add(Way(nodes=nodes[i:i + 10]), Action.CREATE)
+        for i in range(0, len(nodes), 100): osmChange.add(Relation(members=[Member(nodes[i], "")]), Action.MODIFY)
+
+        comparisons = []
+        def counting_eq(self, other):
+            comparisons.append(self)
+            return self is other
+        with mock.patch.object(Node, "__eq__", counting_eq), mock.patch.object(Way, "__eq__", counting_eq), mock.patch.object(Relation, "__eq__", counting_eq):
+            OsmChange._make_osmChange_valid(osmChange)
+        self.assertEqual(comparisons, [])
+
+        created = osmChange.get(Node, Action.CREATE) + osmChange.get(Way, Action.CREATE)
+        self.assertEqual(len(created), nodes_count + nodes_count // 10)
+        # Not used ids would mean that some element got new id more than once.
+        self.assertEqual(sorted(element.id for element in created), list(range(-len(created), 0)))
+
     def test_to_xml(self):
         node_full_1 = sample_dataclasses.node("full_1")
         node_full_1.id = -99
@@ -0,0 +1,75 @@
+import unittest
+import gzip
+import io
+import os
+import sys
+from xml.dom import minidom
+from xml.etree import ElementTree
+
+from osm_easy_api.data_classes import Node, Way, Relation, OsmChange, Action, Tags
+from osm_easy_api.data_classes.relation import Member
+from osm_easy_api.data_classes.compact import CompactNode, CompactWay
+from osm_easy_api.diff.diff_parser import _OsmChange_parser
+
+def minidom_xml(osmChange: OsmChange, changeset_id) -> str:
+    # Previous, DOM based implementation.
+    root = minidom.Document()
+    xml = root.createElement("osmChange")
+    xml.setAttribute("version", osmChange.meta.version)
+    xml.setAttribute("generator", osmChange.meta.generator)
+    root.appendChild(xml)
+    for element_type in (Node, Way, Relation):
+        for action, name in ((Action.CREATE, "create"), (Action.MODIFY, "modify"), (Action.DELETE, "delete")):
+            elements = osmChange.get(element_type, action)
+            if not elements: continue
+            master = root.createElement(name)
+            for element in elements: master.appendChild(element._to_xml(changeset_id))
+            xml.appendChild(master)
+    return root.toprettyxml(indent="\t")
+
+class TestOsmChangeWriter(unittest.TestCase):
+    def test_same_as_minidom(self):
+        osmChange = OsmChange("0.6", "a \"b\" & <c>", "-1")
+        node = Node(id=1, version=2, tags=Tags({"name": "Tom & Jerry's \"<bar>\"", "amenity": "pub"}), latitude="50.0100000", longitude="-0.5")
+        osmChange.add(node, Action.MODIFY)
+        osmChange.add(Node(id=2, version=1, latitude="1", longitude="2"), Action.DELETE)
+        osmChange.add(Way(id=3, version=1, tags=Tags({"highway": "path"}), nodes=[node, Node(id=5)]), Action.CREATE)
+        osmChange.add(Way(id=4, version=1), Action.DELETE)
+        osmChange.add(Relation(id=6, version=1, tags=Tags({"type": "route"}), members=[Member(node, "stop"), Member(Way(id=3), ""), Member(Relation(id=7), "<sub>")]), Action.MODIFY)
+        osmChange.add(CompactNode(id=8, version=1, latitude="3", longitude="4"), Action.CREATE)
+        osmChange.add(CompactWay(id=9, version=1, nodes=[CompactNode(id=8)]), Action.MODIFY)
+        osmChange.add(Node(id=10, version=1, tags=Tags({"note": "a\nb\tc\rd"}), latitude="1", longitude="2"), Action.CREATE)
+        xml = osmChange.to_xml(999, make_osmChange_valid=False)
+        self.assertIn('v="a&#10;b&#9;c&#13;d"', xml)
+        if sys.version_info >= (3, 13):
+            self.assertEqual(xml, minidom_xml(osmChange, 999))
+        else:
+            # Older minidom writes new lines and tabs in attribute values as they are.
+            self.assertEqual(xml.replace("&#10;", "\n").replace("&#9;", "\t").replace("&#13;", "\r"), minidom_xml(osmChange, 999))
+        tag = ElementTree.fromstring(xml).find("create/node[@id='10']/tag")
+        assert tag is not None
+        self.assertEqual(tag.get("v"), "a\nb\tc\rd")
+
+        self.assertEqual(OsmChange("0.6", "empty", "-1").to_xml(), minidom_xml(OsmChange("0.6", "empty", "-1"), -1))
+
+    def test_diff_same_as_minidom(self):
+        file_path = os.path.join("tests", "fixtures", "hour.xml.gz")
+        osmChange = _OsmChange_parser(gzip.open(file_path, "r"), "-1")
+        self.assertEqual(osmChange.to_xml(123, make_osmChange_valid=False), minidom_xml(osmChange, 123))
+
+    def test_iter_and_write_xml(self):
+        osmChange = OsmChange("0.6", "test", "-1")
+        for i in range(1000): osmChange.add(Node(id=i, version=1, tags=Tags({"name": "żółw"}), latitude="1", longitude="2"), Action.CREATE)
+        expected = osmChange.to_xml(5)
+
+        chunks = list(osmChange.iter_xml(5, chunk_size=1000))
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(b"".join(chunks), expected.encode("utf-8"))
+
+        binary = io.BytesIO()
+        osmChange.write_xml(binary, 5)
+        self.assertEqual(binary.getvalue(), expected.encode("utf-8"))
+
+        text = io.StringIO()
+        osmChange.write_xml(text, 5)
+        self.assertEqual(text.getvalue(), expected)
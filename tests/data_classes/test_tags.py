@@ -1,6 +1,12 @@
 import unittest
 
+import io
+from unittest import mock
+
 from osm_easy_api.data_classes import Tags
+from osm_easy_api.data_classes import tags as tags_module
+from osm_easy_api.diff import ParserBackend
+from osm_easy_api.diff.diff_parser import _OsmChange_parser_generator
 from ..fixtures import sample_dataclasses
 
 class TestTags(unittest.TestCase):
@@ -46,4 +52,30 @@ class TestTags(unittest.TestCase):
         self.assertEqual(nxt.getAttribute("v"), "3")
         nxt = next(xml)
         self.assertEqual(nxt.getAttribute("k"), "roof:levels")
-        self.assertEqual(nxt.getAttribute("v"), "1")
\ No newline at end of file
+        self.assertEqual(nxt.getAttribute("v"), "1")
+
+    def test_intern_string(self):
+        first = "".join(["high", "way"])
+        second = "".join(["high", "way"])
+        self.assertIsNot(first, second)
+        self.assertIs(tags_module.intern_string(first), tags_module.intern_string(second))
+
+        long = "x" * (tags_module.MAX_INTERNED_LENGTH + 1)
+        self.assertIsNot(tags_module.intern_string(long), tags_module.intern_string("".join(long)))
+
+        with mock.patch.object(tags_module, "_intern_table", {}), mock.patch.object(tags_module, "MAX_INTERNED_STRINGS", 1):
+            tags_module.intern_string("a")
+            new = "".join(["b", "c"])
+            self.assertIs(tags_module.intern_string(new), new)
+            # Full table is cleared, so strings seen later are still interned.
+            self.assertEqual(tags_module._intern_table, {"bc": "bc"})
+            self.assertIs(tags_module.intern_string("".join(["b", "c"])), new)
+
+    def test_parsers_intern_tags(self):
+        xml = b'<osmChange version="0.6" generator="test"><create>' + b''.join(b'<node id="%d" version="1" timestamp="2022-11-12T12:52:39Z" uid="1" user="a" changeset="1" lat="1" lon="2"><tag k="highway" v="crossing"/></node>' % i for i in range(2)) + b'</create></osmChange>'
+        for backend in ParserBackend:
+            nodes = [node for _, node in list(_OsmChange_parser_generator(io.BytesIO(xml), None, backend=backend))[1:]]
+            (first_key, first_value), = nodes[0].tags.items()
+            (second_key, second_value), = nodes[1].tags.items()
+            self.assertIs(first_key, second_key)
+            self.assertIs(first_value, second_value)
@@ -0,0 +1,105 @@
+import unittest
+import asyncio
+import functools
+import shutil
+import tempfile
+import threading
+import os
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from osm_easy_api.diff import AsyncDiff, Diff, Frequency, TagFilter, State
+from osm_easy_api.data_classes import OsmChange, Node, Action
+from osm_easy_api.data_classes.OsmChange import Meta
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args): pass
+
+    def do_GET(self):
+        # Connection is closed without response, like after a network failure.
+        if self.path.endswith("/425.osc.gz"):
+            self.close_connection = True
+            return
+        super().do_GET()
+
+@unittest.skipUnless(aiohttp, "aiohttp is not installed")
+class TestAsyncDiff(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Local replication server with diffs 5315422 and 5315424 (5315423 is missing, 5315425 is dropped).
+        cls.directory = tempfile.mkdtemp()
+        os.makedirs(os.path.join(cls.directory, "minute", "005", "315"))
+        with open(os.path.join(cls.directory, "minute", "state.txt"), "w") as f:
+            f.write("#Sat Nov 12 14:22:10 UTC 2022\nsequenceNumber=5315424\ntimestamp=2022-11-12T14\\:22\\:07Z")
+        for name in ("422.osc.gz", "424.osc.gz", "425.osc.gz"):
+            shutil.copy(os.path.join("tests", "fixtures", "hour.xml.gz"), os.path.join(cls.directory, "minute", "005", "315", name))
+
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=cls.directory))
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.URL = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        shutil.rmtree(cls.directory)
+
+    def _expected(self) -> tuple[Meta, list]:
+        meta, gen = Diff(Frequency.MINUTE).get(file_from=os.path.join("tests", "fixtures", "hour.xml.gz")) # type: ignore
+        return meta, list(gen)
+
+    async def test_get_sequence_number(self):
+        async with AsyncDiff(Frequency.MINUTE, self.URL) as diff:
+            self.assertEqual(await diff.get_sequence_number(), "5315424")
+            # Second request is conditional (local server answers with 304).
+            self.assertEqual(await diff.get_state(), State(5315424, datetime(2022, 11, 12, 14, 22, 7, tzinfo=timezone.utc)))
+            self.assertIn("If-Modified-Since", list(diff._diff._state_cache.values())[0][1])
+
+        async with AsyncDiff(Frequency.MINUTE, self.URL + "/wrong") as diff:
+            with self.assertRaises(ValueError): await diff.get_sequence_number()
+
+    async def test_get(self):
+        expected_meta, expected = self._expected()
+        async with AsyncDiff(Frequency.MINUTE, self.URL) as diff:
+            meta, gen = await diff.get() # type: ignore
+            self.assertEqual(meta, expected_meta._replace(sequence_number="5315424"))
+            self.assertEqual([item async for item in gen], expected)
+
+            osmChange = await diff.get("5315422", tags=TagFilter.has("highway"), generator=False)
+            self.assertIsInstance(osmChange, OsmChange)
+            self.assertEqual(osmChange.meta.sequence_number, "5315422") # type: ignore
+            self.assertEqual(osmChange.get(Node, Action.CREATE), [element for action, element in expected if action == Action.CREATE and isinstance(element, Node) and "highway" in element.tags]) # type: ignore
+
+            with self.assertRaises(ValueError): await diff.get("5315423")
+
+    async def test_get_range(self):
+        expected_meta, expected = self._expected()
+        missing = []
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            async with AsyncDiff(Frequency.MINUTE, self.URL, executor=executor) as diff:
+                stream = [item async for item in diff.get_range("5315422", "5315424", on_missing=lambda sequence_number, status_code: missing.append((sequence_number, status_code)))]
+                self.assertEqual(stream, [expected_meta._replace(sequence_number="5315422"), *expected, expected_meta._replace(sequence_number="5315424"), *expected])
+                self.assertEqual(missing, [("5315423", 404)])
+
+                with self.assertRaises(ValueError): await diff.get_range("5315424", "5315422").__anext__()
+
+    async def test_get_range_errors(self):
+        expected_meta, expected = self._expected()
+        missing = []
+        async with AsyncDiff(Frequency.MINUTE, self.URL) as diff:
+            stream = [item async for item in diff.get_range("5315423", "5315425", on_missing=lambda sequence_number, error: missing.append((sequence_number, error)))]
+            self.assertEqual(stream, [expected_meta._replace(sequence_number="5315424"), *expected])
+            self.assertEqual([sequence_number for sequence_number, _ in missing], ["5315423", "5315425"])
+            self.assertEqual(missing[0][1], 404)
+            self.assertIsInstance(missing[1][1], aiohttp.ClientError) # type: ignore
+
+            with self.assertRaises(ValueError): [item async for item in diff.get_range("5315422", "5315423")]
+            gen = diff.get_range("5315424", "5315425")
+            self.assertIsInstance(await gen.__anext__(), Meta)
+            with self.assertRaises(aiohttp.ClientError): [item async for item in gen] # type: ignore
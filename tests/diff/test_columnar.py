@@ -0,0 +1,69 @@
+import unittest
+import os
+from datetime import datetime, timezone
+
+from osm_easy_api.diff import Diff, Frequency, TagFilter, NodeColumns, WayColumns, RelationColumns
+from osm_easy_api.diff.columnar import MISSING_COORDINATE, _records_to_columns
+from osm_easy_api.data_classes import Node, Way, Relation, Action
+from osm_easy_api.data_classes.OsmChange import Meta
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def _timestamp(timestamp: str) -> int:
+    return int(datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp())
+
+@unittest.skipUnless(numpy, "numpy is not installed")
+class TestColumnar(unittest.TestCase):
+    def test_get_columnar(self):
+        FILE_FROM = os.path.join("tests", "fixtures", "hour.xml.gz")
+        DIFF = Diff(Frequency.HOUR)
+        osmChange = DIFF.get(file_from=FILE_FROM, generator=False)
+        meta, columns = DIFF.get_columnar(file_from=FILE_FROM)
+        self.assertEqual(meta, osmChange.meta) # type: ignore
+
+        for type in (Node, Way, Relation):
+            for action in Action:
+                elements = osmChange.get(type, action) # type: ignore
+                table = columns[type][action]
+                self.assertEqual(table.id.tolist(), [element.id for element in elements])
+                self.assertEqual(table.version.tolist(), [element.version for element in elements])
+                self.assertEqual(table.changeset_id.tolist(), [element.changeset_id for element in elements])
+                self.assertEqual(table.user_id.tolist(), [element.user_id for element in elements])
+                self.assertEqual(table.timestamp.tolist(), [_timestamp(element.timestamp) for element in elements])
+                self.assertEqual(table.id.dtype, numpy.int64)
+
+        nodes = columns[Node][Action.MODIFY]
+        self.assertIsInstance(nodes, NodeColumns)
+        self.assertEqual(nodes.latitude.dtype, numpy.int32)
+        self.assertEqual(nodes.latitude[0], 533814725)
+        self.assertEqual(nodes.longitude[0], -65778065)
+
+        ways = columns[Way][Action.MODIFY]
+        self.assertIsInstance(ways, WayColumns)
+        for i, way in enumerate(osmChange.get(Way, Action.MODIFY)): # type: ignore
+            self.assertEqual(ways.nodes[ways.nodes_offsets[i]:ways.nodes_offsets[i + 1]].tolist(), [node.id for node in way.nodes])
+
+        meta, columns = DIFF.get_columnar(file_from=FILE_FROM, tags=TagFilter.has("highway"))
+        self.assertEqual(columns[Node][Action.CREATE].id.tolist(), [node.id for node in osmChange.get(Node, Action.CREATE) if "highway" in node.tags]) # type: ignore
+
+    def test_records_to_columns(self):
+        records = [
+            (Action.DELETE, "node", {"id": "1", "version": "2", "changeset": "3", "timestamp": "1970-01-01T00:01:00Z"}, [], [], []),
+            (Action.CREATE, "relation", {"id": "2", "version": "1", "changeset": "3", "uid": "4", "timestamp": "1970-01-01T00:00:00Z"}, [], [], [("node", "1", "stop"), ("way", "5", "")]),
+            (Action.CREATE, "relation", {"id": "3", "version": "1", "changeset": "3", "uid": "4", "timestamp": "1970-01-01T00:00:00Z"}, [], [], [("relation", "2", "sub")]),
+        ]
+        columns = _records_to_columns(records) # type: ignore
+        nodes = columns[Node][Action.DELETE]
+        self.assertEqual((nodes.user_id.tolist(), nodes.timestamp.tolist()), ([-1], [60]))
+        self.assertEqual((nodes.latitude.tolist(), nodes.longitude.tolist()), ([MISSING_COORDINATE], [MISSING_COORDINATE]))
+
+        relations = columns[Relation][Action.CREATE]
+        self.assertIsInstance(relations, RelationColumns)
+        self.assertEqual(relations.members_offsets.tolist(), [0, 2, 3])
+        self.assertEqual(relations.members_type.tolist(), [0, 1, 2])
+        self.assertEqual(relations.members_ref.tolist(), [1, 5, 2])
+        self.assertEqual(relations.members_role.tolist(), ["stop", "", "sub"])
+        self.assertEqual(len(columns[Way][Action.CREATE].id), 0)
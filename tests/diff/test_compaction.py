@@ -0,0 +1,40 @@
+import unittest
+import gzip
+import os
+
+from osm_easy_api.diff import compact
+from osm_easy_api.diff.diff_parser import _OsmChange_parser_generator
+from osm_easy_api.data_classes import Node, Way, Relation, Action
+from osm_easy_api.data_classes.OsmChange import Meta
+
+class TestCompaction(unittest.TestCase):
+    def test_compact_actions(self):
+        def node(id: int, version: int) -> Node: return Node(id=id, version=version)
+        stream = [
+            Meta("0.6", "unittest", "1"),
+            (Action.CREATE, node(1, 1)), (Action.MODIFY, node(1, 2)),                               # create + modify = create
+            (Action.CREATE, node(2, 1)), (Action.MODIFY, node(2, 2)), (Action.DELETE, node(2, 3)),  # create + delete = dropped
+            (Action.MODIFY, node(3, 5)), (Action.DELETE, node(3, 6)),                               # modify + delete = delete
+            (Action.DELETE, node(4, 2)),
+            Meta("0.6", "unittest", "2"),
+            (Action.MODIFY, node(4, 3)),                                                            # delete + modify = modify
+            (Action.MODIFY, node(5, 7)), (Action.MODIFY, node(5, 6)),                               # older version is ignored
+            (Action.CREATE, node(6, 1)), (Action.DELETE, node(6, 2)), (Action.MODIFY, node(6, 3)),  # created, deleted and undeleted = create
+            (Action.MODIFY, Way(id=1, version=4)),                                                  # different type, same id
+        ]
+        osmChange = compact(stream)
+        self.assertEqual(osmChange.meta, Meta("0.6", "unittest", "2"))
+        self.assertEqual(osmChange.get(Node, Action.CREATE), [node(1, 2), node(6, 3)])
+        self.assertEqual(osmChange.get(Node, Action.MODIFY), [node(4, 3), node(5, 7)])
+        self.assertEqual(osmChange.get(Node, Action.DELETE), [node(3, 6)])
+        self.assertEqual(osmChange.get(Way, Action.MODIFY), [Way(id=1, version=4)])
+
+    def test_compact_diffs(self):
+        file_path = os.path.join("tests", "fixtures", "hour.xml.gz")
+        with gzip.open(file_path, "r") as file:
+            stream = list(_OsmChange_parser_generator(file, "1"))
+        # The same diff twice: every element is written once.
+        osmChange = compact(stream + stream)
+        elements = [element for item in stream if not isinstance(item, Meta) for element in (item[1],)]
+        count = sum(len(osmChange.get(type, action)) for type in (Node, Way, Relation) for action in (Action.CREATE, Action.MODIFY, Action.DELETE))
+        self.assertEqual(count, len({(type(element), element.id) for element in elements}))
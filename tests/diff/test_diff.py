@@ -1,10 +1,17 @@
 import unittest
+from unittest import mock
+from datetime import datetime, timedelta, timezone
+import re
+import tempfile
+import gzip
 import responses
+import requests
 import os
 import filecmp
 
-from osm_easy_api.diff import Diff, Frequency
+from osm_easy_api.diff import Diff, Frequency, ElementFilter, State
 from osm_easy_api.data_classes import OsmChange, Node, Way, Relation, Action
+from osm_easy_api.data_classes.OsmChange import Meta
 from ..fixtures.compare_files import _compare_files
 
 class TestDiff(unittest.TestCase):
@@ -82,6 +89,25 @@ class TestDiff(unittest.TestCase):
 
         self.assertEqual(DIFF.get_sequence_number(), self.SEQUENCE_NUMBER)
 
+    @responses.activate
+    def test_diff_get_state(self):
+        BODY = "#Sat Nov 12 14:22:10 UTC 2022\nsequenceNumber=5315422\ntimestamp=2022-11-12T14\\:22\\:07Z"
+        requests_headers = []
+        def callback(request):
+            requests_headers.append(request.headers)
+            if request.headers.get("If-None-Match") == '"abc"': return (304, {}, "")
+            return (200, {"ETag": '"abc"', "Last-Modified": "Sat, 12 Nov 2022 14:22:10 GMT"}, BODY)
+        responses.add_callback(responses.GET, "https://test.pl/minute/state.txt", callback=callback)
+
+        DIFF = Diff(Frequency.MINUTE, "https://test.pl", user_agent="unittest")
+        self.assertEqual(DIFF.get_state(), State(5315422, datetime(2022, 11, 12, 14, 22, 7, tzinfo=timezone.utc)))
+        self.assertNotIn("If-None-Match", requests_headers[0])
+        self.assertEqual(DIFF.get_state(), State(5315422, datetime(2022, 11, 12, 14, 22, 7, tzinfo=timezone.utc)))
+        self.assertEqual(requests_headers[1]["If-None-Match"], '"abc"')
+        self.assertEqual(requests_headers[1]["If-Modified-Since"], "Sat, 12 Nov 2022 14:22:10 GMT")
+        self.assertEqual(requests_headers[1]["User-Agent"], "unittest")
+        self.assertEqual(DIFF.get_sequence_number(), "5315422")
+
     def test_diff__build_url(self):
         DIFF = Diff(Frequency.MINUTE, "https://test.pl")
         self.assertEqual(DIFF._build_url(DIFF.url, DIFF.frequency, "5"), "https://test.pl/minute/000/000/005.osc.gz")
@@ -117,6 +143,36 @@ class TestDiff(unittest.TestCase):
         self.assertEqual(meta.sequence_number, self.SEQUENCE_NUMBER)
         self.assertEqual(element.id, 4222078)
 
+    @responses.activate
+    def test_diff_get_pipelined(self):
+        FILE_FROM = os.path.join("tests", "fixtures", "hour.xml.gz")
+        FILE_TO = os.path.join("tests", "fixtures", "pipelined_to.xml.gz")
+        with open(FILE_FROM, "rb") as f: body = f.read()
+        responses.add(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", body=body, status=200)
+
+        d = Diff(Frequency.MINUTE, "https://test.pl")
+        meta, gen = d.get(file_from=FILE_FROM) # type: ignore
+        expected = list(gen)
+
+        pipelined_meta, gen = d.get(sequence_number=self.SEQUENCE_NUMBER, pipelined=True, file_to=FILE_TO) # type: ignore
+        self.assertEqual(pipelined_meta, meta._replace(sequence_number=self.SEQUENCE_NUMBER))
+        self.assertEqual(list(gen), expected)
+        with open(FILE_TO, "rb") as f: self.assertEqual(f.read(), body)
+        os.remove(FILE_TO)
+
+        # Abandoned generator does not leave partial file. Diff must be bigger than data read in advance.
+        padded = gzip.decompress(body).replace(b"</osmChange>", b"<!--" + b" " * 8 * 1024 * 1024 + b"--></osmChange>")
+        responses.replace(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", body=gzip.compress(padded, compresslevel=0), status=200)
+        for pipelined in (False, True):
+            _, gen = d.get(sequence_number=self.SEQUENCE_NUMBER, pipelined=pipelined, file_to=FILE_TO) # type: ignore
+            next(gen)
+            gen.close()
+            self.assertFalse(os.path.exists(FILE_TO))
+        responses.replace(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", body=body, status=200)
+
+        osmChange = d.get(sequence_number=self.SEQUENCE_NUMBER, pipelined=True, generator=False)
+        self.assertEqual(len(osmChange.get(Node, Action.MODIFY)), len([element for action, element in expected if action == Action.MODIFY and isinstance(element, Node)])) # type: ignore
+
     @responses.activate
     def test_diff_get(self):
         FILE_FROM = os.path.join("tests", "fixtures", "hour.xml.gz")
@@ -194,6 +250,228 @@ timestamp=2024-03-18T19\\:33\\:45Z""",
             assert isinstance(osm_change, OsmChange)
             check_osm_change(osm_change)
             self.assertTrue(_compare_files(FILE_FROM, FILE_TO))
+            with open(FILE_FROM, "rb") as f_from, open(FILE_TO, "rb") as f_to:
+                self.assertEqual(f_from.read(), f_to.read())
             os.remove(FILE_TO)
             self.assertTrue(responses.assert_call_count("https://test.pl/minute/state.txt", 1))
             self.assertTrue(responses.assert_call_count("https://test.pl/minute/005/315/422.osc.gz", 3))
+
+    @responses.activate
+    def test_diff_get_range(self):
+        FILE_FROM = os.path.join("tests", "fixtures", "hour.xml.gz")
+        with open(FILE_FROM, "rb") as f: body = f.read()
+
+        for url in ("https://test.pl/minute/005/315/422.osc.gz", "https://test.pl/minute/005/315/424.osc.gz"):
+            responses.add(**{
+                "method": responses.GET,
+                "url": url,
+                "body": body,
+                "status": 200
+            })
+        responses.add(**{
+            "method": responses.GET,
+            "url": "https://test.pl/minute/005/315/423.osc.gz",
+            "status": 404
+        })
+
+        missing = []
+        DIFF = Diff(Frequency.MINUTE, "https://test.pl")
+        gen = DIFF.get_range("5315422", "5315424", max_workers=2, on_missing=lambda sequence_number, status_code: missing.append((sequence_number, status_code)))
+
+        sequence_numbers = []
+        elements_count = 0
+        for item in gen:
+            if isinstance(item, Meta): sequence_numbers.append(item.sequence_number)
+            else: elements_count += 1
+
+        self.assertEqual(sequence_numbers, ["5315422", "5315424"])
+        self.assertEqual(missing, [("5315423", 404)])
+        self.assertEqual(elements_count, 2 * 19)
+        self.assertTrue(responses.assert_call_count("https://test.pl/minute/005/315/423.osc.gz", 1))
+
+        self.assertRaises(ValueError, lambda: next(DIFF.get_range("5315424", "5315422")))
+
+        # Without on_missing the range must not have gaps.
+        gen = DIFF.get_range("5315422", "5315424", max_workers=2)
+        self.assertIsInstance(next(gen), Meta)
+        with self.assertRaises(ValueError):
+            for _ in gen: pass
+
+    @responses.activate
+    def test_diff_get_range_request_exception(self):
+        FILE_FROM = os.path.join("tests", "fixtures", "hour.xml.gz")
+        with open(FILE_FROM, "rb") as f: body = f.read()
+        responses.add(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", body=body, status=200)
+        responses.add(responses.GET, "https://test.pl/minute/005/315/423.osc.gz", body=requests.ConnectionError("Connection refused"))
+        responses.add(responses.GET, "https://test.pl/minute/005/315/424.osc.gz", body=body, status=200)
+        DIFF = Diff(Frequency.MINUTE, "https://test.pl")
+
+        missing = []
+        stream = list(DIFF.get_range("5315422", "5315424", max_workers=2, on_missing=lambda sequence_number, error: missing.append((sequence_number, error))))
+        self.assertEqual([item.sequence_number for item in stream if isinstance(item, Meta)], ["5315422", "5315424"])
+        self.assertEqual(len(missing), 1)
+        self.assertEqual(missing[0][0], "5315423")
+        self.assertIsInstance(missing[0][1], requests.ConnectionError)
+
+        gen = DIFF.get_range("5315422", "5315424", max_workers=2)
+        self.assertIsInstance(next(gen), Meta)
+        with self.assertRaises(requests.ConnectionError):
+            for _ in gen: pass
+
+    @responses.activate
+    def test_diff_get_parallel(self):
+        FILE_FROM = os.path.join("tests", "fixtures", "hour.xml.gz")
+        with open(FILE_FROM, "rb") as f: body = f.read()
+        responses.add(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", body=body, status=200)
+        responses.add(responses.GET, "https://test.pl/minute/005/315/423.osc.gz", status=404)
+        responses.add(responses.GET, "https://test.pl/minute/005/315/424.osc.gz", body=body, status=200)
+
+        DIFF = Diff(Frequency.MINUTE, "https://test.pl")
+        meta, gen = DIFF.get(file_from=FILE_FROM) # type: ignore
+        expected = list(gen)
+
+        missing = []
+        stream = list(DIFF.get_parallel(["5315422", "5315423", "5315424"], max_workers=2, on_missing=lambda sequence_number, status_code: missing.append((sequence_number, status_code))))
+        self.assertEqual(stream, [meta._replace(sequence_number="5315422"), *expected, meta._replace(sequence_number="5315424"), *expected])
+        self.assertEqual(missing, [("5315423", 404)])
+
+        gen = DIFF.get_parallel(["5315422", "5315423", "5315424"], max_workers=2)
+        self.assertIsInstance(next(gen), Meta)
+        with self.assertRaises(ValueError):
+            for _ in gen: pass
+
+        stream = list(DIFF.get_parallel(files_from=[FILE_FROM] * 5, max_workers=2, tags="highway", element_filter=ElementFilter(types=[Node])))
+        self.assertEqual([item for item in stream if isinstance(item, Meta)], [meta] * 5)
+        nodes = [item for item in expected if isinstance(item[1], Node) and "highway" in item[1].tags] # type: ignore
+        self.assertTrue(nodes)
+        self.assertEqual([item for item in stream if not isinstance(item, Meta)], nodes * 5)
+
+        self.assertRaises(ValueError, lambda: next(DIFF.get_parallel()))
+
+    @responses.activate
+    def test_diff_get_parallel_request_exception(self):
+        FILE_FROM = os.path.join("tests", "fixtures", "hour.xml.gz")
+        with open(FILE_FROM, "rb") as f: body = f.read()
+        responses.add(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", body=body, status=200)
+        responses.add(responses.GET, "https://test.pl/minute/005/315/423.osc.gz", body=requests.ConnectionError("Connection refused"))
+        responses.add(responses.GET, "https://test.pl/minute/005/315/424.osc.gz", body=body, status=200)
+        DIFF = Diff(Frequency.MINUTE, "https://test.pl")
+
+        missing = []
+        stream = list(DIFF.get_parallel(["5315422", "5315423", "5315424"], max_workers=2, on_missing=lambda sequence_number, error: missing.append((sequence_number, error))))
+        self.assertEqual([item.sequence_number for item in stream if isinstance(item, Meta)], ["5315422", "5315424"])
+        self.assertEqual(len(missing), 1)
+        self.assertEqual(missing[0][0], "5315423")
+        self.assertIsInstance(missing[0][1], requests.ConnectionError)
+
+        gen = DIFF.get_parallel(["5315422", "5315423", "5315424"], max_workers=2)
+        self.assertIsInstance(next(gen), Meta)
+        with self.assertRaises(requests.ConnectionError):
+            for _ in gen: pass
+
+    @responses.activate
+    def test_diff_sequence_for_timestamp(self):
+        FIRST = datetime(2012, 9, 12, 8, 15, tzinfo=timezone.utc)
+        def state_txt(sequence_number: int) -> str:
+            timestamp = (FIRST + timedelta(minutes=sequence_number)).strftime("%Y-%m-%dT%H\\:%M\\:%SZ")
+            return f"#Sat Nov 12 14:22:10 UTC 2022\nsequenceNumber={sequence_number}\ntimestamp={timestamp}"
+
+        def state_callback(request):
+            match = re.search(r"/minute/(\d{3})/(\d{3})/(\d{3})\.state\.txt$", request.url)
+            assert match
+            return (200, {}, state_txt(int("".join(match.groups()))))
+
+        responses.add(responses.GET, "https://test.pl/minute/state.txt", body=state_txt(5315424), status=200)
+        responses.add_callback(responses.GET, re.compile(r"https://test\.pl/minute/\d{3}/\d{3}/\d{3}\.state\.txt"), callback=state_callback)
+
+        DIFF = Diff(Frequency.MINUTE, "https://test.pl")
+        self.assertEqual(DIFF.sequence_for_timestamp(FIRST + timedelta(minutes=1234567, seconds=30)), "1234567")
+        self.assertLessEqual(len(responses.calls), 25)
+
+        calls = len(responses.calls)
+        self.assertEqual(DIFF.sequence_for_timestamp(datetime(2012, 9, 12, 8, 15) + timedelta(minutes=1234567)), "1234567")
+        self.assertEqual(len(responses.calls), calls)
+
+        self.assertEqual(DIFF.sequence_for_timestamp(FIRST + timedelta(minutes=1234000)), "1234000")
+        self.assertLess(len(responses.calls) - calls, 15)
+
+        self.assertEqual(DIFF.sequence_for_timestamp(FIRST), "0")
+        self.assertEqual(DIFF.sequence_for_timestamp(datetime.now(timezone.utc)), "5315424")
+        self.assertRaises(ValueError, DIFF.sequence_for_timestamp, FIRST - timedelta(seconds=1))
+
+    def test_diff__get_timestamp_from_state(self):
+        BODY = "#Sat Nov 12 14:22:10 UTC 2022\nsequenceNumber=5315422\ntimestamp=2022-11-12T14\\:22\\:07Z"
+        self.assertEqual(Diff._get_timestamp_from_state(BODY), datetime(2022, 11, 12, 14, 22, 7, tzinfo=timezone.utc))
+        self.assertRaises(ValueError, Diff._get_timestamp_from_state, "sequenceNumber=5315422")
+
+    @responses.activate
+    def test_diff_follow(self):
+        class StopFollowing(Exception): pass
+
+        with open(os.path.join("tests", "fixtures", "hour.xml.gz"), "rb") as f: body = f.read()
+        responses.add(**{
+            "method": responses.GET,
+            "url": "https://test.pl/minute/state.txt",
+            "body": "#Sat Nov 12 14:22:10 UTC 2022\nsequenceNumber=5315422\ntimestamp=2022-11-12T14\\:22\\:07Z",
+            "status": 200
+        })
+        for url in ("https://test.pl/minute/005/315/421.osc.gz", "https://test.pl/minute/005/315/422.osc.gz"):
+            responses.add(**{
+                "method": responses.GET,
+                "url": url,
+                "body": body,
+                "status": 200
+            })
+
+        DIFF = Diff(Frequency.MINUTE, "https://test.pl")
+        with tempfile.TemporaryDirectory() as directory:
+            state_path = os.path.join(directory, "cursor")
+            with open(state_path, "w") as f: f.write("5315420")
+
+            with mock.patch("osm_easy_api.diff.diff.time.sleep", side_effect=StopFollowing) as sleep:
+                gen = DIFF.follow(state_path, poll_delay=5)
+                sequence_numbers = []
+                elements_count = 0
+                with self.assertRaises(StopFollowing):
+                    for item in gen:
+                        if isinstance(item, Meta):
+                            sequence_numbers.append(item.sequence_number)
+                            with open(state_path) as f: self.assertEqual(int(f.read()), int(item.sequence_number) - 1)
+                        else: elements_count += 1
+                sleep.assert_called_once_with(5)
+
+            self.assertEqual(sequence_numbers, ["5315421", "5315422"])
+            self.assertEqual(elements_count, 2 * 19)
+            with open(state_path) as f: self.assertEqual(f.read(), "5315422")
+
+            # Without saved state following starts from the newest diff.
+            os.remove(state_path)
+            with mock.patch("osm_easy_api.diff.diff.time.sleep", side_effect=StopFollowing):
+                meta = next(DIFF.follow(state_path))
+            self.assertEqual(meta.sequence_number, "5315422")
+
+    @responses.activate
+    def test_diff_follow_retry(self):
+        class StopFollowing(Exception): pass
+
+        with open(os.path.join("tests", "fixtures", "hour.xml.gz"), "rb") as f: body = f.read()
+        responses.add(responses.GET, "https://test.pl/minute/state.txt", body="#Sat Nov 12 14:22:10 UTC 2022\nsequenceNumber=5315422\ntimestamp=2022-11-12T14\\:22\\:07Z", status=200)
+        # Just announced diff is not published yet.
+        responses.add(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", body="Not Found", status=404)
+        responses.add(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", body=requests.ConnectionError("Connection refused"))
+        responses.add(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", body=body, status=200)
+
+        DIFF = Diff(Frequency.MINUTE, "https://test.pl")
+        with tempfile.TemporaryDirectory() as directory:
+            state_path = os.path.join(directory, "cursor")
+            with open(state_path, "w") as f: f.write("5315421")
+
+            with mock.patch("osm_easy_api.diff.diff.time.sleep", side_effect=[None, None, StopFollowing]) as sleep:
+                with self.assertRaises(StopFollowing):
+                    stream = []
+                    for item in DIFF.follow(state_path, poll_delay=5): stream.append(item)
+                self.assertEqual(sleep.call_args_list[:2], [mock.call(5), mock.call(5)])
+
+            self.assertEqual([item.sequence_number for item in stream if isinstance(item, Meta)], ["5315422"])
+            self.assertEqual(len(stream), 1 + 19)
+            with open(state_path) as f: self.assertEqual(f.read(), "5315422")
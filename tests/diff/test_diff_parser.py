@@ -1,8 +1,10 @@
 import unittest
+import tracemalloc
 import gzip
+import io
 import os
 
-from osm_easy_api.diff.diff_parser import _OsmChange_parser
+from osm_easy_api.diff.diff_parser import _OsmChange_parser, _OsmChange_parser_generator
 from osm_easy_api.data_classes import Node, Way, Relation, Action, Tags
 from osm_easy_api.data_classes.relation import Member
 
@@ -92,4 +94,63 @@ class TestDiffParser(unittest.TestCase):
         self.assertEqual(len(osmChange.get(Node, Action.DELETE  )), 0   )
         self.assertEqual(len(osmChange.get(Node, Action.NONE    )), 0   )
 
-        file.close()
\ No newline at end of file
+        file.close()
+
+    def test_OsmChange_parser_generator_children_on_buffer_boundary(self):
+        NODE = '<node id="{id}" version="1" timestamp="2022-11-12T12:52:39Z" uid="1" user="a" changeset="1" lat="53.3814725" lon="-6.5778065"><tag k="highway" v="crossing"/><tag k="crossing" v="zebra"/></node>'
+        xml = f'<osmChange version="0.6" generator="unittest"><create>{"".join(NODE.format(id=id) for id in range(5000))}</create></osmChange>'
+        gen = _OsmChange_parser_generator(io.BytesIO(xml.encode()), None)
+        next(gen)
+        for action, element in gen:
+            self.assertEqual(element.tags, Tags({"highway": "crossing", "crossing": "zebra"}))
+
+    def test_OsmChange_parser_generator_memory(self):
+        def osm_change(nodes_count: int) -> io.BytesIO:
+            NODE = '<node id="{id}" version="1" timestamp="2022-11-12T12:52:39Z" uid="1" user="a" changeset="1" lat="53.3814725" lon="-6.5778065"><tag k="highway" v="crossing"/></node>'
+            blocks = []
+            for block_start in range(0, nodes_count, 1000):
+                action = ("create", "modify")[block_start // 1000 % 2]
+                nodes = "".join(NODE.format(id=id) for id in range(block_start, block_start + 1000))
+                blocks.append(f"<{action}>{nodes}</{action}>")
+            return io.BytesIO(f'<osmChange version="0.6" generator="unittest">{"".join(blocks)}</osmChange>'.encode())
+
+        def peak_memory(file: io.BytesIO) -> int:
+            tracemalloc.start()
+            count = 0
+            for _ in _OsmChange_parser_generator(file, None): count += 1
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak
+
+        small = osm_change(2000)
+        big = osm_change(20000)
+        peak_memory(small) # warm up
+        self.assertLess(peak_memory(big), peak_memory(small) * 1.5)
+
+    def test_OsmChange_parser_generator_lazy(self):
+        file_path = os.path.join("tests", "fixtures", "hour.xml.gz")
+        with gzip.open(file_path, "r") as file:
+            gen = _OsmChange_parser_generator(file, None)
+            next(gen)
+            eager = list(gen)
+            gen = _OsmChange_parser_generator(file, None, lazy=True)
+            next(gen)
+            lazy = list(gen)
+
+        self.assertEqual([type(element) for _, element in lazy], [type(element) for _, element in eager])
+        self.assertEqual(lazy, eager)
+        self.assertEqual([element.to_dict() for _, element in lazy], [element.to_dict() for _, element in eager])
+
+        gen = _OsmChange_parser_generator(io.BytesIO(b'<osmChange version="0.6" generator="unittest"><modify><way id="2" version="3" timestamp="2022-11-12T12:52:39Z" uid="1" user="a" changeset="4"><nd ref="5"/><tag k="highway" v="service"/></way></modify></osmChange>'), None, lazy=True)
+        next(gen)
+        _, way = next(gen)
+        self.assertEqual(way.id, 2)
+        self.assertEqual(way.version, 3)
+        self.assertNotIn("tags", way.__dict__)
+        self.assertNotIn("nodes", way.__dict__)
+        way.tags.add("name", "Test")
+        self.assertEqual(way.tags, Tags({"highway": "service", "name": "Test"}))
+        expected = Way(id=2, version=3, changeset_id=4, timestamp="2022-11-12T12:52:39Z", user_id=1, tags=Tags({"highway": "service", "name": "Test"}), nodes=[Node(id=5)])
+        self.assertEqual(str(way), str(expected))
+        self.assertEqual(way, expected)
+        self.assertRaises(AttributeError, lambda: way.unknown)
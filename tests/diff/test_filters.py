@@ -0,0 +1,194 @@
+import unittest
+import gzip
+import os
+import io
+from unittest import mock
+
+from osm_easy_api.diff import TagFilter, ElementFilter, ParserBackend
+from osm_easy_api.diff.filters import _to_tag_filter, _KeyValues
+from osm_easy_api.diff.diff_parser import _OsmChange_parser, _OsmChange_parser_generator
+from osm_easy_api.data_classes import Node, Way, Relation, Action, Tags
+from datetime import datetime, timezone, timedelta
+
+class TestTagFilter(unittest.TestCase):
+    def test_has(self):
+        self.assertTrue(TagFilter.has("building").match(Tags({"building": "yes"})))
+        self.assertFalse(TagFilter.has("building").match(Tags({"highway": "yes"})))
+        self.assertFalse(TagFilter.has("building").match(Tags()))
+
+        self.assertTrue(TagFilter.has("building", "yes").match(Tags({"building": "yes"})))
+        self.assertFalse(TagFilter.has("building", "yes").match(Tags({"building": "house"})))
+
+        self.assertTrue(TagFilter.has("highway", {"primary", "secondary"}).match(Tags({"highway": "secondary"})))
+        self.assertFalse(TagFilter.has("highway", {"primary", "secondary"}).match(Tags({"highway": "tertiary"})))
+
+    def test_prefix(self):
+        self.assertTrue(TagFilter.has("addr:*").match(Tags({"addr:street": "Main"})))
+        self.assertFalse(TagFilter.has("addr:*").match(Tags({"address": "Main"})))
+        self.assertTrue(TagFilter.has("addr:*", "Main").match(Tags({"name": "A", "addr:street": "Main"})))
+        self.assertFalse(TagFilter.has("addr:*", "Main").match(Tags({"name": "Main", "addr:street": "Other"})))
+
+    def test_regex(self):
+        self.assertTrue(TagFilter.regex("^name").match(Tags({"name:en": "Saint John"})))
+        self.assertTrue(TagFilter.regex("^name", "^Saint ").match(Tags({"name:en": "Saint John"})))
+        self.assertFalse(TagFilter.regex("^name", "^Saint ").match(Tags({"name:en": "John Saint "})))
+
+    def test_not_and_or(self):
+        building = TagFilter.has("building") & ~TagFilter.has("building", "no")
+        self.assertTrue(building.match(Tags({"building": "yes"})))
+        self.assertFalse(building.match(Tags({"building": "no"})))
+        self.assertFalse(building.match(Tags()))
+        self.assertIs(~~building, building)
+
+        roads = TagFilter.has("highway", "primary") | TagFilter.has("highway", "secondary") | TagFilter.has("railway")
+        self.assertIsInstance(roads, _KeyValues)
+        self.assertEqual(roads.index, {"highway": frozenset({"primary", "secondary"}), "railway": None}) # type: ignore
+        self.assertTrue(roads.match(Tags({"highway": "secondary"})))
+        self.assertTrue(roads.match(Tags({"railway": "rail"})))
+        self.assertFalse(roads.match(Tags({"highway": "tertiary"})))
+
+        both = TagFilter.has("highway") & TagFilter.has("name")
+        self.assertIsInstance(both, _KeyValues)
+        self.assertTrue(both.match(Tags({"highway": "primary", "name": "A"})))
+        self.assertFalse(both.match(Tags({"highway": "primary"})))
+
+        mixed = (TagFilter.has("highway", "primary") | TagFilter.regex("^addr:")) & ~TagFilter.has("name")
+        self.assertTrue(mixed.match(Tags({"highway": "primary"})))
+        self.assertTrue(mixed.match(Tags({"addr:street": "Main"})))
+        self.assertFalse(mixed.match(Tags({"addr:street": "Main", "name": "A"})))
+        self.assertFalse(mixed.match(Tags({"highway": "secondary"})))
+
+    def test_to_tag_filter(self):
+        self.assertIsNone(_to_tag_filter(Tags()))
+        self.assertIsNone(_to_tag_filter(""))
+        tag_filter = TagFilter.has("a")
+        self.assertIs(_to_tag_filter(tag_filter), tag_filter)
+        self.assertTrue(_to_tag_filter("a").match(Tags({"a": "b"}))) # type: ignore
+        self.assertTrue(_to_tag_filter(Tags({"a": "b", "c": "d"})).match(Tags({"a": "b", "c": "d", "e": "f"}))) # type: ignore
+        self.assertFalse(_to_tag_filter(Tags({"a": "b", "c": "d"})).match(Tags({"a": "b"}))) # type: ignore
+
+    def test_OsmChange_parser(self):
+        file_path = os.path.join("tests", "fixtures", "hour.xml.gz")
+        with gzip.open(file_path, "r") as file:
+            osmChange = _OsmChange_parser(file, "-1", TagFilter.has("highway", "crossing") & TagFilter.has("crossing", {"marked", "uncontrolled"}))
+            self.assertEqual(len(osmChange.get(Node, Action.CREATE)), 1)
+            self.assertEqual(len(osmChange.get(Node, Action.MODIFY)), 2)
+
+            osmChange = _OsmChange_parser(file, "-1", TagFilter.has("railway") | TagFilter.has("route", "bus"))
+            self.assertEqual(len(osmChange.get(Node, Action.MODIFY)), 1)
+            self.assertEqual(osmChange.get(Node, Action.MODIFY)[0].id, 10288507)
+            self.assertEqual(len(osmChange.get(Node, Action.CREATE)), 0)
+
+            osmChange = _OsmChange_parser(file, "-1", ~TagFilter.regex(""))
+            self.assertEqual(len(osmChange.get(Node, Action.CREATE)), 0)
+            self.assertEqual(len(osmChange.get(Node, Action.MODIFY)), 11)
+
+class TestElementFilter(unittest.TestCase):
+    def test_match(self):
+        attrib = {"id": "1", "version": "7", "timestamp": "2022-11-12T12:52:39Z", "uid": "16842649", "changeset": "128811655"}
+        self.assertTrue(ElementFilter().match("node", attrib))
+        self.assertTrue(ElementFilter(types=[Node, Way]).match("node", attrib))
+        self.assertFalse(ElementFilter(types=[Way]).match("node", attrib))
+        self.assertTrue(ElementFilter(changeset_ids=[128811655]).match("node", attrib))
+        self.assertFalse(ElementFilter(changeset_ids=[1]).match("node", attrib))
+        self.assertTrue(ElementFilter(user_ids={16842649}).match("node", attrib))
+        self.assertFalse(ElementFilter(user_ids={1}).match("node", attrib))
+        self.assertFalse(ElementFilter(user_ids={1}).match("node", {"version": "1"}))
+        self.assertTrue(ElementFilter(min_version=7, max_version=7).match("node", attrib))
+        self.assertFalse(ElementFilter(min_version=8).match("node", attrib))
+        self.assertFalse(ElementFilter(max_version=6).match("node", attrib))
+
+    def test_timestamp(self):
+        attrib = {"timestamp": "2022-11-12T12:52:39Z"}
+        self.assertTrue(ElementFilter(since="2022-11-12T12:52:39Z").match("node", attrib))
+        self.assertFalse(ElementFilter(until="2022-11-12T12:52:39Z").match("node", attrib))
+        self.assertTrue(ElementFilter(since=datetime(2022, 11, 12, 12), until=datetime(2022, 11, 12, 13)).match("node", attrib))
+        self.assertFalse(ElementFilter(since=datetime(2022, 11, 12, 13)).match("node", attrib))
+        # 14:00 in UTC+2 is 12:00 UTC.
+        self.assertFalse(ElementFilter(until=datetime(2022, 11, 12, 14, tzinfo=timezone(timedelta(hours=2)))).match("node", attrib))
+        self.assertTrue(ElementFilter(until=datetime(2022, 11, 12, 15, tzinfo=timezone(timedelta(hours=2)))).match("node", attrib))
+
+    def test_OsmChange_parser(self):
+        file_path = os.path.join("tests", "fixtures", "hour.xml.gz")
+        element_filter = ElementFilter(types=[Node, Way], min_version=2, since="2022-11-12T12:30:00Z")
+        for backend in (ParserBackend.ETREE, ParserBackend.EXPAT):
+            with gzip.open(file_path, "r") as file:
+                gen = _OsmChange_parser_generator(file, "-1", Tags(), backend)
+                next(gen)
+                expected = [(action, element) for action, element in gen if isinstance(element, (Node, Way)) and element.version >= 2 and element.timestamp >= "2022-11-12T12:30:00Z"] # type: ignore
+                self.assertTrue(expected)
+
+                gen = _OsmChange_parser_generator(file, "-1", Tags(), backend, element_filter)
+                next(gen)
+                self.assertEqual(list(gen), expected)
+
+                osmChange = _OsmChange_parser(file, "-1", TagFilter.has("highway"), backend, ElementFilter(types=[Way]))
+                self.assertEqual(osmChange.get(Node, Action.MODIFY), [])
+                self.assertEqual(osmChange.get(Relation, Action.MODIFY), [])
+                for way in osmChange.get(Way, Action.MODIFY) + osmChange.get(Way, Action.CREATE):
+                    self.assertIn("highway", way.tags) # type: ignore
+                    self.assertTrue(way.nodes) # type: ignore
+
+class TestSpatialFilter(unittest.TestCase):
+    XML = b"""<osmChange version="0.6" generator="unittest">
+    <create>
+        <node id="1" version="1" timestamp="2022-11-12T12:52:39Z" changeset="1" lat="0.5" lon="0.5"/>
+        <node id="2" version="1" timestamp="2022-11-12T12:52:39Z" changeset="1" lat="1.5" lon="1.5"/>
+        <node id="3" version="1" timestamp="2022-11-12T12:52:39Z" changeset="1" lat="5" lon="5"/>
+        <way id="1" version="1" timestamp="2022-11-12T12:52:39Z" changeset="1"><nd ref="3"/><nd ref="1"/><tag k="highway" v="service"/></way>
+        <way id="2" version="1" timestamp="2022-11-12T12:52:39Z" changeset="1"><nd ref="3"/><nd ref="2"/></way>
+        <relation id="1" version="1" timestamp="2022-11-12T12:52:39Z" changeset="1"><member type="way" ref="1" role=""/></relation>
+        <relation id="2" version="1" timestamp="2022-11-12T12:52:39Z" changeset="1"><member type="relation" ref="1" role=""/></relation>
+        <relation id="3" version="1" timestamp="2022-11-12T12:52:39Z" changeset="1"><member type="way" ref="2" role=""/></relation>
+    </create>
+    <delete>
+        <node id="4" version="2" timestamp="2022-11-12T12:52:39Z" changeset="1"/>
+    </delete>
+</osmChange>"""
+
+    def _parse(self, element_filter: ElementFilter, tags=Tags()) -> list[tuple[str, int]]:
+        gen = _OsmChange_parser_generator(io.BytesIO(self.XML), None, tags, ParserBackend.ETREE, element_filter)
+        next(gen)
+        return [(type(element).__name__, element.id) for _, element in gen] # type: ignore
+
+    def test_bbox(self):
+        expected = [("Node", 1), ("Way", 1), ("Relation", 1), ("Relation", 2)]
+        self.assertEqual(self._parse(ElementFilter(bbox=(0, 0, 1, 1))), expected)
+        with mock.patch("osm_easy_api.diff.filters._import_numpy", return_value=None):
+            self.assertEqual(self._parse(ElementFilter(bbox=(0, 0, 1, 1))), expected)
+        with mock.patch("osm_easy_api.diff.filters._SPATIAL_BATCH_SIZE", 2):
+            self.assertEqual(self._parse(ElementFilter(bbox=(0, 0, 1, 1))), expected)
+
+        # Ways are used to find relations, although they are not returned.
+        self.assertEqual(self._parse(ElementFilter(bbox=(0, 0, 2, 2), types=[Node, Relation])), [("Node", 1), ("Node", 2), ("Relation", 1), ("Relation", 2), ("Relation", 3)])
+        # Tags are checked after area, so untagged nodes are used to find the way.
+        self.assertEqual(self._parse(ElementFilter(bbox=(0, 0, 1, 1)), tags="highway"), [("Way", 1)])
+
+    def test_polygon(self):
+        # Triangle which contains node 1 but not node 2, although both are in its bbox.
+        POLYGON = [(0, 0), (2, 0), (0, 2)]
+        expected = [("Node", 1), ("Way", 1), ("Relation", 1), ("Relation", 2)]
+        self.assertEqual(self._parse(ElementFilter(polygon=POLYGON)), expected)
+        with mock.patch("osm_easy_api.diff.filters._import_numpy", return_value=None):
+            self.assertEqual(self._parse(ElementFilter(polygon=POLYGON)), expected)
+        self.assertEqual(self._parse(ElementFilter(polygon=POLYGON, bbox=(1, 0, 2, 2))), [])
+
+    def test_types_and_attributes_with_area(self):
+        XML = b"""<osmChange version="0.6" generator="unittest">
+    <modify>
+        <node id="1" version="1" timestamp="2022-11-12T12:52:39Z" uid="1" changeset="1" lat="1.5" lon="1.5"/>
+        <node id="2" version="1" timestamp="2022-11-12T12:52:39Z" uid="1" changeset="1" lat="1.6" lon="1.6"/>
+        <way id="10" version="2" timestamp="2022-11-12T12:52:39Z" uid="2" changeset="2"><nd ref="1"/><nd ref="2"/></way>
+    </modify>
+</osmChange>"""
+        def parse(element_filter: ElementFilter) -> list[tuple[str, int]]:
+            gen = _OsmChange_parser_generator(io.BytesIO(XML), None, Tags(), ParserBackend.ETREE, element_filter)
+            next(gen)
+            return [(type(element).__name__, element.id) for _, element in gen] # type: ignore
+
+        BBOX = (1, 1, 2, 2)
+        self.assertEqual(parse(ElementFilter(bbox=BBOX)), [("Node", 1), ("Node", 2), ("Way", 10)])
+        self.assertEqual(parse(ElementFilter(types=[Way], bbox=BBOX)), [("Way", 10)])
+        self.assertEqual(parse(ElementFilter(user_ids=[2], bbox=BBOX)), [("Way", 10)])
+        self.assertEqual(parse(ElementFilter(changeset_ids=[2], min_version=2, bbox=BBOX)), [("Way", 10)])
+        self.assertEqual(parse(ElementFilter(user_ids=[1], polygon=[(1, 1), (2, 1), (2, 2), (1, 2)])), [("Node", 1), ("Node", 2)])
@@ -0,0 +1,61 @@
+import unittest
+import gzip
+import io
+import os
+
+from osm_easy_api.diff import ParserBackend
+from osm_easy_api.diff.diff_parser import _OsmChange_parser_generator
+from osm_easy_api.data_classes import Node, Way, Relation, Action, Tags
+from osm_easy_api.data_classes.relation import Member
+
+try:
+    import lxml
+    LXML_INSTALLED = True
+except ImportError:
+    LXML_INSTALLED = False
+
+MAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<osm version="0.6" generator="CGImap 0.8.8">
+<bounds minlat="57.67" minlon="27.08" maxlat="57.68" maxlon="27.09"/>
+<node id="5281" visible="true" version="1" changeset="287" timestamp="2009-09-14T23:02:39Z" user="green525" uid="12" lat="58.5769849" lon="26.2733110">
+<tag k="name" v="A &amp; B"/>
+</node>
+<way id="226" visible="true" version="1" changeset="287" timestamp="2009-09-14T23:02:40Z" user="green525" uid="12">
+<nd ref="5281"/>
+<nd ref="5282"/>
+<tag k="highway" v="residential"/>
+</way>
+<relation id="56688" visible="true" version="28" changeset="6947637" timestamp="2011-01-12T14:23:49Z" user="kmvar" uid="56190">
+<member type="node" ref="5281" role="stop"/>
+<member type="way" ref="226" role=""/>
+<tag k="type" v="route"/>
+</relation>
+</osm>"""
+
+class TestParserBackends(unittest.TestCase):
+    def _parse(self, file, backend: ParserBackend, required_tags: Tags | str = Tags()) -> list:
+        return list(_OsmChange_parser_generator(file, "1", required_tags, backend))
+
+    def _check_backend(self, backend: ParserBackend):
+        file_path = os.path.join("tests", "fixtures", "hour.xml.gz")
+        with gzip.open(file_path, "r") as file:
+            self.assertEqual(self._parse(file, backend), self._parse(file, ParserBackend.ETREE))
+            self.assertEqual(self._parse(file, backend, Tags({"highway": "crossing"})), self._parse(file, ParserBackend.ETREE, Tags({"highway": "crossing"})))
+            self.assertEqual(self._parse(file, backend, "crossing"), self._parse(file, ParserBackend.ETREE, "crossing"))
+
+        elements = self._parse(io.BytesIO(MAP), backend)
+        self.assertEqual(elements, self._parse(io.BytesIO(MAP), ParserBackend.ETREE))
+        self.assertEqual(elements[0].version, "0.6")
+        self.assertEqual(elements[1], (Action.NONE, Node(id=5281, visible=True, version=1, changeset_id=287, timestamp="2009-09-14T23:02:39Z", user_id=12, latitude="58.5769849", longitude="26.2733110", tags=Tags({"name": "A & B"}))))
+        self.assertEqual(elements[2], (Action.NONE, Way(id=226, visible=True, version=1, changeset_id=287, timestamp="2009-09-14T23:02:40Z", user_id=12, nodes=[Node(5281), Node(5282)], tags=Tags({"highway": "residential"}))))
+        self.assertEqual(elements[3], (Action.NONE, Relation(id=56688, visible=True, version=28, changeset_id=6947637, timestamp="2011-01-12T14:23:49Z", user_id=56190, members=[Member(Node(5281), "stop"), Member(Way(226), "")], tags=Tags({"type": "route"}))))
+
+    def test_etree(self):
+        self._check_backend(ParserBackend.ETREE)
+
+    def test_expat(self):
+        self._check_backend(ParserBackend.EXPAT)
+
+    @unittest.skipUnless(LXML_INSTALLED, "lxml is not installed")
+    def test_lxml(self):
+        self._check_backend(ParserBackend.LXML)
@@ -0,0 +1,140 @@
+import unittest
+from unittest import mock
+import json
+import os
+import sqlite3
+import tempfile
+import responses
+
+from osm_easy_api.diff import Diff, Frequency, CallbackSink, JsonLinesSink, SQLiteSink
+from osm_easy_api.data_classes import Node, Action
+
+class StopFollowing(Exception): pass
+
+class TestSinks(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join("tests", "fixtures", "hour.xml.gz"), "rb") as f: self.body = f.read()
+        self.responses = responses.RequestsMock()
+        self.responses.start()
+        self.responses.add(responses.GET, "https://test.pl/minute/state.txt", body="#Sat Nov 12 14:22:10 UTC 2022\nsequenceNumber=5315422\ntimestamp=2022-11-12T14\\:22\\:07Z", status=200)
+        for url in ("https://test.pl/minute/005/315/421.osc.gz", "https://test.pl/minute/005/315/422.osc.gz"):
+            self.responses.add(responses.GET, url, body=self.body, status=200)
+        self.directory = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.directory.name, "cursor")
+        with open(self.state_path, "w") as f: f.write("5315420")
+
+    def tearDown(self):
+        self.responses.stop()
+        self.responses.reset()
+        self.directory.cleanup()
+
+    def _run(self, sink, **kwargs):
+        with mock.patch("osm_easy_api.diff.diff.time.sleep", side_effect=StopFollowing):
+            with self.assertRaises(StopFollowing):
+                Diff(Frequency.MINUTE, "https://test.pl").follow_to_sink(sink, self.state_path, **kwargs)
+
+    def _state(self) -> str:
+        with open(self.state_path) as f: return f.read()
+
+    def test_callback_sink(self):
+        calls = []
+        def flush(sequence_number: str):
+            # State is saved only after the sink acknowledged the diff.
+            self.assertEqual(int(self._state()), int(sequence_number) - 1)
+            calls.append(("flush", sequence_number))
+        self._run(CallbackSink(lambda sequence_number, batch: calls.append((sequence_number, len(batch))), flush), batch_size=8)
+        self.assertEqual(calls, [("5315421", 8), ("5315421", 8), ("5315421", 3), ("flush", "5315421"), ("5315422", 8), ("5315422", 8), ("5315422", 3), ("flush", "5315422")])
+        self.assertEqual(self._state(), "5315422")
+
+    def test_failing_sink(self):
+        def write(sequence_number: str, batch):
+            if sequence_number == "5315422": raise RuntimeError()
+        with self.assertRaises(RuntimeError):
+            Diff(Frequency.MINUTE, "https://test.pl").follow_to_sink(CallbackSink(write), self.state_path)
+        self.assertEqual(self._state(), "5315421")
+
+        # Not acknowledged diff is delivered again.
+        delivered = []
+        self._run(CallbackSink(lambda sequence_number, batch: delivered.append(sequence_number)))
+        self.assertEqual(delivered, ["5315422"])
+
+    def test_failed_download(self):
+        self.responses.replace(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", status=503)
+        self.responses.add(responses.GET, "https://test.pl/minute/005/315/422.osc.gz", body=self.body, status=200)
+        delivered = []
+        with mock.patch("osm_easy_api.diff.diff.time.sleep", side_effect=[None, StopFollowing]):
+            with self.assertRaises(StopFollowing):
+                Diff(Frequency.MINUTE, "https://test.pl").follow_to_sink(CallbackSink(lambda sequence_number, batch: delivered.append(sequence_number)), self.state_path)
+        self.assertEqual(delivered, ["5315421", "5315422"])
+        self.assertEqual(self._state(), "5315422")
+
+    def test_failed_state_download(self):
+        self.responses.replace(responses.GET, "https://test.pl/minute/state.txt", status=503)
+        self.responses.add(responses.GET, "https://test.pl/minute/state.txt", body="#Sat Nov 12 14:22:10 UTC 2022\nsequenceNumber=5315422\ntimestamp=2022-11-12T14\\:22\\:07Z", status=200)
+        delivered = []
+        with mock.patch("osm_easy_api.diff.diff.time.sleep", side_effect=[None, StopFollowing]) as sleep:
+            with self.assertRaises(StopFollowing):
+                Diff(Frequency.MINUTE, "https://test.pl").follow_to_sink(CallbackSink(lambda sequence_number, batch: delivered.append(sequence_number)), self.state_path, poll_delay=3)
+        self.assertEqual(sleep.call_args_list[0], mock.call(3))
+        self.assertEqual(delivered, ["5315421", "5315422"])
+        self.assertEqual(self._state(), "5315422")
+
+    def test_json_lines_sink(self):
+        path = os.path.join(self.directory.name, "jsonl")
+        sink = JsonLinesSink(path)
+        self._run(sink, tags="highway")
+        sink.close()
+        self.assertEqual(sorted(os.listdir(path)), ["5315421.jsonl", "5315422.jsonl"])
+        with open(os.path.join(path, "5315422.jsonl"), encoding="utf-8") as f: lines = [json.loads(line) for line in f]
+        self.assertTrue(lines)
+        self.assertTrue(all("highway" in line["element"]["tags"] and line["sequence_number"] == "5315422" for line in lines))
+        self.assertEqual(Node.from_dict(lines[0]["element"]).id, lines[0]["element"]["id"])
+
+    def test_json_lines_sink_redelivery(self):
+        path = os.path.join(self.directory.name, "jsonl")
+        sink = JsonLinesSink(path)
+        def write(sequence_number: str, batch):
+            JsonLinesSink.write(sink, sequence_number, batch)
+            raise RuntimeError()
+        with mock.patch.object(sink, "write", side_effect=write):
+            with self.assertRaises(RuntimeError):
+                Diff(Frequency.MINUTE, "https://test.pl").follow_to_sink(sink, self.state_path, batch_size=8)
+        self.assertEqual(self._state(), "5315420")
+
+        # The same sink receives the diff again, lines of the failed delivery are discarded.
+        self._run(sink)
+        sink.close()
+        self.assertEqual(sorted(os.listdir(path)), ["5315421.jsonl", "5315422.jsonl"])
+        with open(os.path.join(path, "5315421.jsonl"), encoding="utf-8") as f: lines = f.readlines()
+        self.assertEqual(len(lines), 19)
+
+    def test_sqlite_sink(self):
+        path = os.path.join(self.directory.name, "elements.db")
+        sink = SQLiteSink(path)
+        self._run(sink)
+        # The same diffs written again replace the rows.
+        with open(self.state_path, "w") as f: f.write("5315420")
+        self._run(sink)
+        sink.close()
+
+        connection = sqlite3.connect(path)
+        rows = connection.execute("SELECT type, action, sequence_number, data FROM elements WHERE type = 'node' AND id = 10288507").fetchall()
+        connection.close()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][:3], ("node", "modify", 5315422))
+        self.assertEqual(json.loads(rows[0][3])["tags"], {"railway": "switch"})
+
+    def test_sqlite_sink_compact_elements(self):
+        path = os.path.join(self.directory.name, "elements.db")
+        sink = SQLiteSink(path)
+        with mock.patch("osm_easy_api.diff.diff.time.sleep", side_effect=StopFollowing):
+            with self.assertRaises(StopFollowing):
+                Diff(Frequency.MINUTE, "https://test.pl", compact_elements=True).follow_to_sink(sink, self.state_path)
+        sink.close()
+
+        connection = sqlite3.connect(path)
+        types = {row[0] for row in connection.execute("SELECT DISTINCT type FROM elements")}
+        rows = connection.execute("SELECT data FROM elements WHERE type = 'node' AND id = 10288507").fetchall()
+        connection.close()
+        self.assertEqual(types, {"node", "way", "relation"})
+        self.assertEqual(json.loads(rows[0][0])["tags"], {"railway": "switch"})
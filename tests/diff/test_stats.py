@@ -0,0 +1,38 @@
+import unittest
+import os
+from collections import Counter
+
+from osm_easy_api.diff import Diff, Frequency, DiffStats, ElementFilter
+from osm_easy_api.data_classes import Node, Way, Relation, Action
+
+class TestDiffStats(unittest.TestCase):
+    def test_stats(self):
+        FILE_FROM = os.path.join("tests", "fixtures", "hour.xml.gz")
+        DIFF = Diff(Frequency.HOUR)
+        meta, gen = DIFF.get(file_from=FILE_FROM) # type: ignore
+        elements = list(gen)
+
+        stats = DIFF.stats(file_from=FILE_FROM)
+        self.assertEqual(stats.elements, Counter((type(element), action) for action, element in elements))
+        self.assertEqual(stats.changesets, Counter(element.changeset_id for _, element in elements))
+        self.assertEqual(stats.users, Counter(element.user_id for _, element in elements))
+        self.assertEqual(stats.tag_keys, Counter(key for _, element in elements for key in element.tags))
+        self.assertEqual(stats.min_timestamp, min(element.timestamp for _, element in elements))
+        self.assertEqual(stats.max_timestamp, max(element.timestamp for _, element in elements))
+
+        ways = DIFF.stats(file_from=FILE_FROM, element_filter=ElementFilter(types=[Way]))
+        self.assertEqual(sum(ways.elements.values()), len([element for _, element in elements if isinstance(element, Way)]))
+
+        merged = stats + ways
+        self.assertEqual(merged.elements[(Way, Action.MODIFY)], stats.elements[(Way, Action.MODIFY)] * 2)
+        self.assertEqual(merged.elements[(Node, Action.MODIFY)], stats.elements[(Node, Action.MODIFY)])
+        self.assertEqual(merged.min_timestamp, stats.min_timestamp)
+        self.assertEqual(stats.elements[(Node, Action.MODIFY)], merged.elements[(Node, Action.MODIFY)]) # operands are not modified
+        self.assertEqual(sum(stats.elements.values()), len(elements))
+
+    def test_update(self):
+        stats = DiffStats()
+        stats.update(DiffStats(Counter({(Relation, Action.CREATE): 1}), Counter({1: 1}), Counter({2: 1}), Counter({"type": 1}), "2022-11-12T12:00:00Z", "2022-11-12T13:00:00Z"))
+        stats.update(DiffStats(Counter({(Relation, Action.CREATE): 2}), Counter({1: 2}), Counter({3: 2}), Counter(), "2022-11-12T11:00:00Z", "2022-11-12T12:30:00Z"))
+        stats.update(DiffStats())
+        self.assertEqual(stats, DiffStats(Counter({(Relation, Action.CREATE): 3}), Counter({1: 3}), Counter({2: 1, 3: 2}), Counter({"type": 1}), "2022-11-12T11:00:00Z", "2022-11-12T13:00:00Z"))
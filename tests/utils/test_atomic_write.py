@@ -0,0 +1,15 @@
+import unittest
+import tempfile
+import os
+
+from osm_easy_api.utils import atomic_write
+
+class TestMiscAtomicWrite(unittest.TestCase):
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "state")
+            atomic_write(path, "123")
+            with open(path) as f: self.assertEqual(f.read(), "123")
+            atomic_write(path, "1234")
+            with open(path) as f: self.assertEqual(f.read(), "1234")
+            self.assertEqual(os.listdir(directory), ["state"])
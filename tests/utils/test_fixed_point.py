@@ -0,0 +1,20 @@
+import unittest
+
+from osm_easy_api.utils import coordinate_to_fixed, fixed_to_coordinate
+
+class TestMiscFixedPoint(unittest.TestCase):
+    def test_coordinate_to_fixed(self):
+        self.assertEqual(coordinate_to_fixed("53.3814725"), 533814725)
+        self.assertEqual(coordinate_to_fixed("-6.5778065"), -65778065)
+        self.assertEqual(coordinate_to_fixed("-0.5"), -5000000)
+        self.assertEqual(coordinate_to_fixed("180"), 1800000000)
+        self.assertEqual(coordinate_to_fixed("0.00000001"), 0)
+        self.assertEqual(coordinate_to_fixed("0.00000005"), 1)
+        self.assertEqual(coordinate_to_fixed("1.5", 2), 150)
+
+    def test_fixed_to_coordinate(self):
+        self.assertEqual(fixed_to_coordinate(533814725), "53.3814725")
+        self.assertEqual(fixed_to_coordinate(-65778065), "-6.5778065")
+        self.assertEqual(fixed_to_coordinate(-5000000), "-0.5")
+        self.assertEqual(fixed_to_coordinate(1800000000), "180")
+        self.assertEqual(fixed_to_coordinate(0), "0")
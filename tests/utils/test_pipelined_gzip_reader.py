@@ -0,0 +1,35 @@
+import unittest
+import gzip
+import io
+import os
+
+from osm_easy_api.utils import PipelinedGzipReader
+
+class TestMiscPipelinedGzipReader(unittest.TestCase):
+    def test_read(self):
+        with open(os.path.join("tests", "fixtures", "hour.xml.gz"), "rb") as f: compressed = f.read()
+        decompressed = gzip.decompress(compressed)
+
+        self.assertEqual(PipelinedGzipReader(io.BytesIO(compressed)).read(), decompressed)
+
+        reader = PipelinedGzipReader(io.BytesIO(compressed), chunk_size=100, max_chunks=2)
+        parts = []
+        while data := reader.read(1000):
+            self.assertLessEqual(len(data), 1000)
+            parts.append(data)
+        self.assertEqual(b"".join(parts), decompressed)
+        self.assertEqual(reader.read(10), b"")
+
+    def test_multiple_members(self):
+        compressed = gzip.compress(b"abc") + gzip.compress(b"def") + gzip.compress(b"")
+        self.assertEqual(PipelinedGzipReader(io.BytesIO(compressed), chunk_size=7).read(), b"abcdef")
+
+    def test_errors(self):
+        compressed = gzip.compress(b"abc" * 1000)
+        self.assertRaises(EOFError, PipelinedGzipReader(io.BytesIO(compressed[:-10])).read)
+        self.assertRaises(Exception, PipelinedGzipReader(io.BytesIO(b"not gzip")).read)
+
+    def test_close(self):
+        reader = PipelinedGzipReader(io.BytesIO(gzip.compress(os.urandom(1024 * 1024))), chunk_size=1024, max_chunks=1)
+        self.assertEqual(len(reader.read(10)), 10)
+        reader.close()
@@ -0,0 +1,17 @@
+import unittest
+from unittest import mock
+
+from osm_easy_api.utils import points_in_polygon
+
+class TestMiscPointsInPolygon(unittest.TestCase):
+    def test_points_in_polygon(self):
+        # L-shaped polygon.
+        POLYGON = [(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)]
+        longitudes = [0.5, 1.5, 1.5, 0.5, 3, -1, 0.5]
+        latitudes  = [0.5, 0.5, 1.5, 1.5, 0.5, 0.5, 5]
+        expected = [True, True, False, True, False, False, False]
+        self.assertEqual(points_in_polygon(longitudes, latitudes, POLYGON), expected)
+        self.assertEqual(points_in_polygon(longitudes, latitudes, POLYGON + [POLYGON[0]]), expected)
+        with mock.patch("osm_easy_api.utils.points_in_polygon._import_numpy", return_value=None):
+            self.assertEqual(points_in_polygon(longitudes, latitudes, POLYGON), expected)
+        self.assertEqual(points_in_polygon([], [], POLYGON), [])
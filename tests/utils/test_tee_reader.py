@@ -0,0 +1,40 @@
+import unittest
+import gzip
+import io
+import os
+
+from osm_easy_api.utils import TeeReader
+
+class TestMiscTeeReader(unittest.TestCase):
+    def test_read(self):
+        f_from_path = os.path.join("tests", "fixtures", "hour.xml.gz")
+        f_to_path = os.path.join("tests", "fixtures", "tee_reader_to.xml.gz")
+        with open(f_from_path, "rb") as f: compressed = f.read()
+
+        with gzip.GzipFile(fileobj=TeeReader(io.BytesIO(compressed), f_to_path)) as file:
+            self.assertEqual(file.read(), gzip.decompress(compressed))
+
+        with open(f_to_path, "rb") as f: self.assertEqual(f.read(), compressed)
+        os.remove(f_to_path)
+
+    def test_close(self):
+        f_to_path = os.path.join("tests", "fixtures", "tee_reader_close_to.txt")
+        tee = TeeReader(io.BytesIO(b"abcdef"), f_to_path)
+        self.assertEqual(tee.read(2), b"ab")
+        tee.close()
+
+        with open(f_to_path, "rb") as f: self.assertEqual(f.read(), b"abcdef")
+        os.remove(f_to_path)
+
+    def test_abort(self):
+        f_to_path = os.path.join("tests", "fixtures", "tee_reader_abort_to.txt")
+        tee = TeeReader(io.BytesIO(b"abcdef"), f_to_path)
+        self.assertEqual(tee.read(2), b"ab")
+        tee.abort()
+        self.assertFalse(os.path.exists(f_to_path))
+
+        tee = TeeReader(io.BytesIO(b"abcdef"), f_to_path)
+        tee.close()
+        tee.abort()
+        with open(f_to_path, "rb") as f: self.assertEqual(f.read(), b"abcdef")
+        os.remove(f_to_path)